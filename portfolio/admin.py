@@ -1,7 +1,9 @@
 from django.contrib import admin
+from django.db import models
 from django.utils.translation import gettext_lazy as _
 from modeltranslation.admin import TranslationAdmin
-from .models import Hero, About, TeamSection, TeamMember, Service, Technology, PortfolioItem, ContactInfo, ContactMessage, SiteSetting
+from .forms import PixelLimitedImageField
+from .models import Hero, About, TeamSection, TeamMember, Service, Technology, PortfolioItem, ContactInfo, ContactMessage, SiteSetting, ImageOptimizationJob
 
 
 @admin.register(Hero)
@@ -21,6 +23,7 @@ class AboutAdmin(TranslationAdmin):
 
 @admin.register(TeamMember)
 class TeamMemberAdmin(TranslationAdmin):
+    formfield_overrides = {models.ImageField: {'form_class': PixelLimitedImageField}}
     list_display = ['name', 'role', 'order', 'is_active']
     list_filter = ['is_active']
     search_fields = ['name', 'role', 'bio']
@@ -53,6 +56,7 @@ class TechnologyAdmin(admin.ModelAdmin):
 
 @admin.register(PortfolioItem)
 class PortfolioItemAdmin(TranslationAdmin):
+    formfield_overrides = {models.ImageField: {'form_class': PixelLimitedImageField}}
     list_display = ['title', 'portfolio_type', 'order', 'is_active']
     list_filter = ['portfolio_type', 'is_active']
     search_fields = ['title', 'description']
@@ -107,3 +111,11 @@ class ContactMessageAdmin(admin.ModelAdmin):
 class SiteSettingAdmin(TranslationAdmin):
     list_display = ['site_title', 'is_active', 'updated_at']
     list_filter = ['is_active']
+
+
+@admin.register(ImageOptimizationJob)
+class ImageOptimizationJobAdmin(admin.ModelAdmin):
+    list_display = ['model_label', 'object_id', 'field_name', 'status', 'attempts', 'created_at', 'finished_at']
+    list_filter = ['status', 'model_label']
+    readonly_fields = ['model_label', 'object_id', 'field_name', 'source_name', 'attempts', 'error',
+                       'created_at', 'started_at', 'finished_at']
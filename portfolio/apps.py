@@ -6,4 +6,6 @@ class PortfolioConfig(AppConfig):
     name = 'portfolio'
     
     def ready(self):
-        import portfolio.translation  # noqa
\ No newline at end of file
+        import portfolio.translation  # noqa
+        import portfolio.signals  # noqa
+        import portfolio.db  # noqa
\ No newline at end of file
@@ -0,0 +1,322 @@
+"""
+Static bundle building: self-hosted fonts and scripts, per-language CSS and
+critical CSS.
+
+``manage.py build_assets`` writes everything under static ``portfolio/build/`` (in
+STATICFILES_DIRS), then ``collectstatic`` fingerprints the files and
+WhiteNoise's storage writes their gzip and brotli variants. The
+``portfolio_assets`` template tags read the manifest written here and fall
+back to the individual stylesheets and Google Fonts while it is missing.
+"""
+import hashlib
+import json
+import os
+import re
+import urllib.request
+from html.parser import HTMLParser
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.test import override_settings
+
+BUILD_PREFIX = 'portfolio/build'
+MANIFEST_NAME = f'{BUILD_PREFIX}/manifest.json'
+
+GOOGLE_FONTS = {
+    'en': 'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700'
+          '&family=Poppins:wght@300;400;500;600;700&family=Sora:wght@300;400;500;600;700&display=swap',
+    'fa': 'https://fonts.googleapis.com/css2?family=Vazirmatn:wght@300;400;500;600;700'
+          '&family=Inter:wght@300;400;500;600;700&family=Poppins:wght@300;400;500;600;700&display=swap',
+}
+# Unicode-range subsets worth hosting per language; Google serves many more.
+FONT_SUBSETS = {
+    'en': {'latin', 'latin-ext'},
+    'fa': {'arabic', 'latin', 'latin-ext'},
+}
+# Body font files to preload, as (family, subset).
+PRELOAD_FONTS = {
+    'en': [('Inter', 'latin')],
+    'fa': [('Vazirmatn', 'arabic')],
+}
+STYLESHEETS = {
+    'en': ['portfolio/css/styles.css'],
+    'fa': ['portfolio/css/styles.css', 'portfolio/css/styles-fa.css'],
+}
+# Animation libraries script.js loads on demand, in load order per group.
+MOTION_SCRIPTS = {
+    'three': ['https://cdnjs.cloudflare.com/ajax/libs/three.js/r128/three.min.js'],
+    'gsap': [
+        'https://cdnjs.cloudflare.com/ajax/libs/gsap/3.12.2/gsap.min.js',
+        'https://cdnjs.cloudflare.com/ajax/libs/gsap/3.12.2/ScrollTrigger.min.js',
+        'https://cdnjs.cloudflare.com/ajax/libs/gsap/3.12.2/ScrollToPlugin.min.js',
+    ],
+}
+# Google only returns WOFF2 to browsers it knows support it.
+FONT_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/120.0 Safari/537.36'
+)
+# Classes script.js adds after load; their rules must be ready above the fold.
+SCRIPT_CLASSES = {'dark-mode', 'active', 'is-hidden', 'lazy-loaded', 'lazy-error', 'motion-off'}
+
+
+def plain_static_urls():
+    """
+    Settings override giving static files their unhashed URLs.
+
+    For pages rendered before or without ``collectstatic`` (the bundle
+    build, benchmarks, tests), where the manifest storage would raise.
+    """
+    return override_settings(STORAGES={
+        **settings.STORAGES,
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    })
+
+
+def build_dir():
+    return os.path.join(settings.STATICFILES_DIRS[0], *BUILD_PREFIX.split('/'))
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace; strings are left untouched."""
+    parts = re.split(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')', css)
+    for index in range(0, len(parts), 2):
+        code = re.sub(r'/\*.*?\*/', '', parts[index], flags=re.S)
+        code = re.sub(r'\s+', ' ', code)
+        code = re.sub(r'\s*([{};,>])\s*', r'\1', code)
+        # "a :hover" and "a:hover" differ, so only spaces after colons go.
+        code = re.sub(r':\s+', ':', code)
+        parts[index] = code.replace(';}', '}')
+    return ''.join(parts).strip()
+
+
+def split_rules(css):
+    """Yield ``(prelude, body)`` for each top-level block of minified CSS."""
+    depth = 0
+    start = 0
+    prelude = ''
+    quote = None
+    for index, char in enumerate(css):
+        if quote:
+            if char == quote and css[index - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '{':
+            if depth == 0:
+                prelude = css[start:index].strip()
+                start = index + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                yield prelude, css[start:index]
+                start = index + 1
+        elif char == ';' and depth == 0:
+            # Statements such as @charset or @import.
+            yield css[start:index].strip(), None
+            start = index + 1
+
+
+class FoldCollector(HTMLParser):
+    """Collect the tags, classes and ids used before ``stop_id``."""
+
+    def __init__(self, stop_id):
+        super().__init__()
+        self.stop_id = stop_id
+        self.done = False
+        self.tags = {'html', 'body'}
+        self.classes = set(SCRIPT_CLASSES)
+        self.ids = set()
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if self.done or attrs.get('id') == self.stop_id:
+            self.done = True
+            return
+        self.tags.add(tag)
+        self.classes.update((attrs.get('class') or '').split())
+        if attrs.get('id'):
+            self.ids.add(attrs['id'])
+
+
+def _selector_matches(selector, fold):
+    # Pseudo-classes and elements depend on state, not presence; drop them.
+    selector = re.sub(r'::?[\w-]+(\([^)]*\))?', '', selector)
+    selector = re.sub(r'\[[^\]]*\]', '', selector)
+    for compound in re.split(r'[\s>+~]+', selector.strip()):
+        if not compound or compound == '*':
+            continue
+        tag = re.match(r'^[a-zA-Z][\w-]*', compound)
+        if tag and tag.group().lower() not in fold.tags:
+            return False
+        if any(name not in fold.classes for name in re.findall(r'\.([\w-]+)', compound)):
+            return False
+        if any(name not in fold.ids for name in re.findall(r'#([\w-]+)', compound)):
+            return False
+    return True
+
+
+def _critical_rules(css, fold, animations):
+    kept = []
+    for prelude, body in split_rules(css):
+        if body is None:
+            continue
+        if prelude.startswith(('@media', '@supports')):
+            inner = ''.join(rule for rule in _critical_rules(body, fold, animations) if isinstance(rule, str))
+            if inner:
+                kept.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@keyframes'):
+            kept.append((prelude.split()[1], f'{prelude}{{{body}}}'))
+        elif prelude.startswith('@'):
+            # @font-face URLs are relative to the stylesheet and would break inline.
+            continue
+        elif ':root' in prelude or any(_selector_matches(s, fold) for s in prelude.split(',')):
+            kept.append(f'{prelude}{{{body}}}')
+            animations.update(re.findall(r'animation(?:-name)?:([^;}]+)', body))
+    return kept
+
+
+def extract_critical_css(css, html, stop_id='about'):
+    """
+    Return the rules of ``css`` needed to paint ``html`` up to ``stop_id``.
+
+    A selector is kept when every tag, class and id it names appears in the
+    above-the-fold markup (or is one of the classes script.js adds), so the
+    result is a superset of what the first screen needs. Keyframes are kept
+    only when a kept rule animates with them.
+    """
+    fold = FoldCollector(stop_id)
+    fold.feed(html)
+    animations = set()
+    rules = _critical_rules(minify_css(css), fold, animations)
+
+    def resolve(rules):
+        output = []
+        for rule in rules:
+            if isinstance(rule, tuple):
+                name, text = rule
+                if any(re.search(rf'(^|[\s,]){re.escape(name)}($|[\s,])', value) for value in animations):
+                    output.append(text)
+            else:
+                output.append(rule)
+        return output
+
+    return ''.join(resolve(rules))
+
+
+def parse_font_faces(css):
+    """Return ``[(subset, family, url, block)]`` for Google Fonts' @font-face blocks."""
+    faces = []
+    for match in re.finditer(r'/\*\s*([\w-]+)\s*\*/\s*(@font-face\s*{[^}]*})', css):
+        subset, block = match.groups()
+        family = re.search(r"font-family:\s*'([^']+)'", block).group(1)
+        url = re.search(r'url\(([^)]+)\)', block).group(1)
+        faces.append((subset, family, url, block))
+    return faces
+
+
+def _fetch(url, user_agent=FONT_USER_AGENT):
+    request = urllib.request.Request(url, headers={'User-Agent': user_agent})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def fetch_fonts(language, fetch=_fetch):
+    """
+    Download the language's fonts, keeping only the subsets it needs.
+
+    Writes the font files under ``fonts/`` in the build dir and returns
+    ``(css, preload)``: @font-face rules pointing at the local files, and the
+    static paths of the body font files to preload.
+    """
+    fonts_dir = os.path.join(build_dir(), 'fonts')
+    os.makedirs(fonts_dir, exist_ok=True)
+    rules = []
+    preload = []
+    for subset, family, url, block in parse_font_faces(fetch(GOOGLE_FONTS[language]).decode('utf-8')):
+        if subset not in FONT_SUBSETS[language]:
+            continue
+        # Variable fonts share one file across weights; name files by content URL.
+        name = f"{family.lower().replace(' ', '-')}-{subset}-{hashlib.sha256(url.encode()).hexdigest()[:10]}.woff2"
+        path = os.path.join(fonts_dir, name)
+        if not os.path.exists(path):
+            with open(path, 'wb') as file:
+                file.write(fetch(url))
+        rules.append(block.replace(url, f'fonts/{name}'))
+        static_path = f'{BUILD_PREFIX}/fonts/{name}'
+        if (family, subset) in PRELOAD_FONTS[language] and static_path not in preload:
+            preload.append(static_path)
+    return minify_css('\n'.join(rules)), preload
+
+
+def fetch_scripts(fetch=_fetch):
+    """
+    Download ``MOTION_SCRIPTS`` under ``vendor/`` in the build dir.
+
+    Returns the same mapping with static paths in place of the CDN URLs.
+    """
+    vendor_dir = os.path.join(build_dir(), 'vendor')
+    os.makedirs(vendor_dir, exist_ok=True)
+    vendored = {}
+    for group, urls in MOTION_SCRIPTS.items():
+        vendored[group] = []
+        for url in urls:
+            # Versioned CDN paths never change, so earlier downloads are kept.
+            version, name = url.split('/')[-2:]
+            name = name.replace('.min.js', f'-{version}.min.js')
+            path = os.path.join(vendor_dir, name)
+            if not os.path.exists(path):
+                with open(path, 'wb') as file:
+                    file.write(fetch(url))
+            vendored[group].append(f'{BUILD_PREFIX}/vendor/{name}')
+    return vendored
+
+
+def _read_static(path):
+    found = finders.find(path)
+    if not found:
+        raise FileNotFoundError(f'Static file {path} not found')
+    with open(found, encoding='utf-8') as file:
+        return file.read()
+
+
+def build_language(language, html, fonts_css=None, preload=()):
+    """Write the bundled stylesheet for ``language`` and return its manifest entry."""
+    css = '\n'.join(_read_static(path) for path in STYLESHEETS[language])
+    bundle = minify_css(css)
+    if fonts_css:
+        bundle = fonts_css + bundle
+
+    name = f'site-{language}.css'
+    with open(os.path.join(build_dir(), name), 'w', encoding='utf-8') as file:
+        file.write(bundle)
+
+    return {
+        'css': f'{BUILD_PREFIX}/{name}',
+        'critical': extract_critical_css(css, html),
+        'preload_fonts': list(preload),
+        # Until fonts are self-hosted the page keeps linking Google Fonts.
+        'remote_fonts': None if fonts_css else GOOGLE_FONTS[language],
+    }
+
+
+def write_manifest(entries):
+    with open(os.path.join(build_dir(), 'manifest.json'), 'w', encoding='utf-8') as file:
+        json.dump(entries, file, ensure_ascii=False, indent=2)
+
+
+_manifest = (None, None)
+
+
+def load_manifest():
+    """Return the build manifest, re-reading it only when the file changes."""
+    global _manifest
+    path = finders.find(MANIFEST_NAME)
+    if not path:
+        return None
+    mtime = os.path.getmtime(path)
+    if _manifest[0] != (path, mtime):
+        with open(path, encoding='utf-8') as file:
+            _manifest = ((path, mtime), json.load(file))
+    return _manifest[1]
@@ -0,0 +1,197 @@
+"""
+Latency, query and memory benchmarks for the public request paths.
+
+``run`` seeds a dataset of each requested size with ``portfolio.seeding``
+and drives every case in ``CASES`` through the test client: a few warmup
+requests, then timed rounds for the latency statistics, one round under
+``CaptureQueriesContext`` for the query count and one under ``tracemalloc``
+for the peak allocated memory. Results are plain dicts, so runs saved as
+JSON can be checked against each other with ``compare``.
+
+Seeding replaces content, so run this against a throwaway database; the
+``benchmark_suite`` command sets one up. Static URLs are left unhashed, so
+no collectstatic is needed.
+"""
+import itertools
+import statistics
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import translation
+
+from . import assets, seeding
+from .models import PortfolioItem
+from .snapshot import local_host
+
+
+def _index(language):
+    def request(client, context, n):
+        return client.get(context[f'index_{language}'])
+    return request
+
+
+def _contact(client, context, n):
+    # A new address, sender and text each time, in every run, so no round is
+    # rate limited or dropped as a duplicate: all take the accepting path.
+    run = context['run']
+    return client.post(context['contact'], {
+        'name': 'Benchmark',
+        'email': f'visitor{n}.{run}@example.com',
+        'subject': 'Project inquiry',
+        'message': f'Benchmark message number {n} of run {run}.',
+    }, REMOTE_ADDR=f'2001:db8:{run[:4]}:{run[4:]}::{n:x}')
+
+
+def _portfolio(kind):
+    def request(client, context, n):
+        return client.get(context[f'portfolio_{kind}'])
+    return request
+
+
+def _sitemap(client, context, n):
+    return client.get(context['sitemap'], HTTP_ACCEPT_ENCODING='gzip')
+
+
+# name: (request, expected status)
+CASES = {
+    'index_en': (_index('en'), 200),
+    'index_fa': (_index('fa'), 200),
+    'contact_post': (_contact, 302),
+    'portfolio_online': (_portfolio('online'), 302),
+    'portfolio_offline': (_portfolio('offline'), 200),
+    'sitemap': (_sitemap, 200),
+}
+
+
+def prepare():
+    """Return the URLs the cases request, picked from the seeded dataset, and a run id."""
+    items = PortfolioItem.objects.filter(is_active=True).order_by('order', 'id')
+    online = items.filter(portfolio_type='online').first()
+    # The archive without an index.html is downloaded rather than browsed.
+    offline = items.filter(portfolio_type='offline', offline_file__endswith='download.zip').first()
+    context = {'run': uuid.uuid4().hex[:8], 'sitemap': reverse('sitemap')}
+    for language in ('en', 'fa'):
+        with translation.override(language):
+            context[f'index_{language}'] = reverse('portfolio:index')
+    with translation.override('en'):
+        context['contact'] = reverse('portfolio:contact')
+        context['portfolio_online'] = online and reverse('portfolio:view', args=[online.pk])
+        context['portfolio_offline'] = offline and reverse('portfolio:view', args=[offline.pk])
+    return context
+
+
+def _send(request, client, context, n):
+    response = request(client, context, n)
+    if response.streaming:
+        b''.join(response.streaming_content)
+    response.close()
+    return response.status_code
+
+
+def summarize(latencies):
+    """pytest-benchmark style statistics, in milliseconds."""
+    ms = sorted(latency * 1000 for latency in latencies)
+    quantiles = statistics.quantiles(ms, n=100, method='inclusive') if len(ms) > 1 else ms * 99
+    return {
+        'rounds': len(ms),
+        'min_ms': round(ms[0], 3),
+        'max_ms': round(ms[-1], 3),
+        'mean_ms': round(statistics.fmean(ms), 3),
+        'stddev_ms': round(statistics.stdev(ms), 3) if len(ms) > 1 else 0.0,
+        'p50_ms': round(quantiles[49], 3),
+        'p90_ms': round(quantiles[89], 3),
+        'p99_ms': round(quantiles[98], 3),
+        'ops': round(len(ms) / (sum(ms) / 1000), 1),
+    }
+
+
+def measure(name, client, context, rounds, warmup, counter):
+    """Benchmark case ``name``; ``counter`` numbers requests across cases."""
+    request, expected = CASES[name]
+    statuses = []
+
+    def send():
+        statuses.append(_send(request, client, context, next(counter)))
+
+    for _ in range(warmup):
+        send()
+    latencies = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        send()
+        latencies.append(time.perf_counter() - start)
+
+    with CaptureQueriesContext(connection) as queries:
+        send()
+    # Read now: the next request resets the query log these are sliced from.
+    query_count = len(queries)
+
+    tracemalloc.start()
+    try:
+        send()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = {'case': name, **summarize(latencies), 'queries': query_count, 'peak_memory_kib': round(peak / 1024, 1)}
+    result['unexpected_statuses'] = sum(status != expected for status in statuses)
+    return result
+
+
+def run(sizes, rounds=30, warmup=3, seed=0, cases=None, log=None):
+    """Benchmark ``cases`` (all by default) on a seeded dataset of each size in ``sizes``."""
+    cases = cases or list(CASES)
+    counter = itertools.count(1)
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as media_root, override_settings(
+            MEDIA_ROOT=media_root,
+            PORTFOLIO_SITEMAP_DIR=f'{media_root}/sitemaps',
+            PORTFOLIO_CONTACT_SPOOL_DIR=f'{media_root}/spool',
+            # Submissions stay spooled; a flusher thread would write during other cases.
+            PORTFOLIO_CONTACT_FLUSH_INTERVAL=0,
+        ), assets.plain_static_urls():
+            seeding.generate(size, seed=seed, media=True)
+            context = prepare()
+            client = Client(headers={'Host': local_host()})
+            for name in cases:
+                if name.startswith('portfolio_') and not context[name]:
+                    # Tiny datasets may lack an item of this kind.
+                    continue
+                result = {'size': size, **measure(name, client, context, rounds, warmup, counter)}
+                results.append(result)
+                if log:
+                    log(result)
+    return results
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    Return the regressions of ``current`` against ``baseline`` results.
+
+    A case regresses when its median latency grows by more than
+    ``threshold`` (a fraction) or it runs more queries.
+    """
+    previous = {(result['size'], result['case']): result for result in baseline}
+    regressions = []
+    for result in current:
+        before = previous.get((result['size'], result['case']))
+        if before is None:
+            continue
+        if before['p50_ms'] and result['p50_ms'] > before['p50_ms'] * (1 + threshold):
+            regressions.append({
+                'size': result['size'], 'case': result['case'], 'metric': 'p50_ms',
+                'before': before['p50_ms'], 'after': result['p50_ms'],
+            })
+        if result['queries'] > before['queries']:
+            regressions.append({
+                'size': result['size'], 'case': result['case'], 'metric': 'queries',
+                'before': before['queries'], 'after': result['queries'],
+            })
+    return regressions
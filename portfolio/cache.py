@@ -0,0 +1,206 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.middleware.csrf import get_token
+from django.utils import timezone, translation
+
+from .models import ContentVersion, SiteSetting
+
+CONTENT_VERSION_KEY = 'portfolio:content-version'
+HOMEPAGE_PAGE_KEY = 'portfolio:homepage:{version}:{uri}'
+SITE_SETTINGS_KEY = 'portfolio:site-settings:{version}'
+
+# Rendered into cached pages instead of a real token and swapped per request,
+# so a cached page never hands one visitor's CSRF token to another.
+CSRF_PLACEHOLDER = 'portfolioCsrfTokenPlaceholder'
+
+
+def content_version_ttl():
+    # bump_content_version only clears the stamp in the cache it can reach.
+    # With a per-process cache such as the default LocMemCache, other workers
+    # notice a change when their copy expires, so it must stay short.
+    return getattr(settings, 'PORTFOLIO_CONTENT_VERSION_TTL', 5)
+
+
+def get_content_version():
+    """Return ``(version, updated_at)`` for the public content."""
+    stamp = cache.get(CONTENT_VERSION_KEY)
+    if stamp is None:
+        obj, _ = ContentVersion.objects.get_or_create(pk=1)
+        stamp = (obj.version, obj.updated_at)
+        cache.set(CONTENT_VERSION_KEY, stamp, content_version_ttl())
+    return stamp
+
+
+async def aget_content_version():
+    stamp = await cache.aget(CONTENT_VERSION_KEY)
+    if stamp is None:
+        obj, _ = await ContentVersion.objects.aget_or_create(pk=1)
+        stamp = (obj.version, obj.updated_at)
+        await cache.aset(CONTENT_VERSION_KEY, stamp, content_version_ttl())
+    return stamp
+
+
+def bump_content_version():
+    now = timezone.now()
+    updated = ContentVersion.objects.filter(pk=1).update(version=F('version') + 1, updated_at=now)
+    if not updated:
+        ContentVersion.objects.create(pk=1, version=1, updated_at=now)
+    cache.delete(CONTENT_VERSION_KEY)
+    # A request racing the surrounding transaction may have cached the old
+    # stamp again, so drop it once more when the new one is visible.
+    transaction.on_commit(lambda: cache.delete(CONTENT_VERSION_KEY))
+
+
+def homepage_cache_key(request, version=None):
+    # Scheme, host and path are what the canonical and og:url tags show. The
+    # query string is left out: the page does not use it, and keying on it
+    # would let anyone fill the cache with /?x=1, /?x=2, ...
+    page = f'{request.scheme}://{request.get_host()}{request.path}|{translation.get_language()}'
+    uri = hashlib.md5(page.encode('utf-8')).hexdigest()
+    if version is None:
+        version, _ = get_content_version()
+    return HOMEPAGE_PAGE_KEY.format(version=version, uri=uri)
+
+
+def is_cacheable(request):
+    """Only GET requests without pending flash messages share a cached page."""
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    # len() loads the stored messages without marking them as used, so they
+    # are still shown by the full render below.
+    return not len(messages.get_messages(request))
+
+
+def may_have_messages(request):
+    """
+    False when no cookie could hold flash messages.
+
+    Lets async views skip loading message storage, which may need the
+    session database, for the common anonymous visitor.
+    """
+    names = (settings.SESSION_COOKIE_NAME, CookieStorage.cookie_name)
+    return any(name in request.COOKIES for name in names)
+
+
+def get_cached_homepage(request):
+    return cache.get(homepage_cache_key(request))
+
+
+def set_cached_homepage(request, content):
+    timeout = getattr(settings, 'PORTFOLIO_PAGE_CACHE_TIMEOUT', 60 * 60 * 24)
+    cache.set(homepage_cache_key(request), content, timeout)
+
+
+async def aget_cached_homepage(request, version):
+    return await cache.aget(homepage_cache_key(request, version))
+
+
+async def aset_cached_homepage(request, version, content):
+    timeout = getattr(settings, 'PORTFOLIO_PAGE_CACHE_TIMEOUT', 60 * 60 * 24)
+    await cache.aset(homepage_cache_key(request, version), content, timeout)
+
+
+def personalize(request, content):
+    """Insert this visitor's CSRF token into a cached page."""
+    return content.replace(CSRF_PLACEHOLDER, get_token(request))
+
+
+def content_etag(request, *args, **kwargs):
+    version, _ = get_content_version()
+    return f'"{version}"'
+
+
+def content_last_modified(request, *args, **kwargs):
+    _, updated_at = get_content_version()
+    return updated_at
+
+
+def homepage_etag_for(version):
+    # Pages differ only by the masked CSRF token, which stays valid for the
+    # visitor's cookie, so the version and language identify the content.
+    return f'"{version}-{translation.get_language()}"'
+
+
+def homepage_etag(request, *args, **kwargs):
+    # Returning None skips conditional handling, so pending flash messages
+    # are never hidden behind a 304.
+    if not is_cacheable(request):
+        return None
+    version, _ = get_content_version()
+    return homepage_etag_for(version)
+
+
+def homepage_last_modified(request, *args, **kwargs):
+    if not is_cacheable(request):
+        return None
+    return content_last_modified(request)
+
+
+# Process-local copy of the active SiteSetting: (content version, (instance,)).
+# Every SiteSetting change bumps the content version, so a copy made under an
+# older version is never used again, even by workers the save did not reach;
+# a page cached under a version always carries that version's settings.
+_site_settings = (None, None)
+
+
+def _active_site_settings():
+    return SiteSetting.objects.filter(is_active=True).order_by('-updated_at', '-id')
+
+
+def _remember_site_settings(version, entry):
+    global _site_settings
+    _site_settings = (version, entry)
+    return entry[0]
+
+
+def _local_site_settings(version):
+    local_version, entry = _site_settings
+    return entry if local_version == version else None
+
+
+def _site_settings_timeout():
+    # Entries are per version, so old ones only need to age out.
+    return getattr(settings, 'PORTFOLIO_PAGE_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def get_site_settings():
+    """Return the active SiteSetting (or None) from the local copy, the cache or the database."""
+    version, _ = get_content_version()
+    entry = _local_site_settings(version)
+    if entry is None:
+        key = SITE_SETTINGS_KEY.format(version=version)
+        # Wrapped in a tuple so "no active setting" is cached too.
+        entry = cache.get(key)
+        if entry is None:
+            entry = (_active_site_settings().first(),)
+            cache.set(key, entry, _site_settings_timeout())
+        return _remember_site_settings(version, entry)
+    return entry[0]
+
+
+async def aget_site_settings():
+    version, _ = await aget_content_version()
+    entry = _local_site_settings(version)
+    if entry is None:
+        key = SITE_SETTINGS_KEY.format(version=version)
+        entry = await cache.aget(key)
+        if entry is None:
+            entry = (await _active_site_settings().afirst(),)
+            await cache.aset(key, entry, _site_settings_timeout())
+        return _remember_site_settings(version, entry)
+    return entry[0]
+
+
+def invalidate_site_settings():
+    """Drop this process's copy; the content version bump retires the shared one."""
+    global _site_settings
+    _site_settings = (None, None)
+    key = SITE_SETTINGS_KEY.format(version=get_content_version()[0])
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
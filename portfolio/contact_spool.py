@@ -0,0 +1,164 @@
+"""
+Append-only spool for contact form submissions.
+
+Requests append one JSON line to ``pending.jsonl`` and fsync it, which is
+far cheaper than taking SQLite's write lock. A flusher rotates the pending
+file into a batch file and ``bulk_create``\\ s it; batch files are only
+deleted once their rows are committed, so a worker killed mid-flush leaves
+them for the next flush or ``manage.py drain_contact_spool``. Every entry
+carries a unique ``submission_id``, so replaying a batch never duplicates
+messages.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .locks import file_lock
+from .models import ContactMessage
+
+logger = logging.getLogger(__name__)
+
+PENDING_NAME = 'pending.jsonl'
+BATCH_PREFIX = 'batch-'
+FIELDS = ('name', 'email', 'subject', 'message')
+
+
+def spool_dir():
+    return str(getattr(settings, 'PORTFOLIO_CONTACT_SPOOL_DIR', os.path.join(settings.BASE_DIR, 'spool', 'contact')))
+
+
+def batch_size():
+    return getattr(settings, 'PORTFOLIO_CONTACT_BATCH_SIZE', 500)
+
+
+def _locked(name, blocking=True):
+    return file_lock(os.path.join(spool_dir(), name), blocking)
+
+
+def append(name, email, subject, message, content_hash=''):
+    """Durably record one submission and return its id."""
+    submission_id = uuid.uuid4()
+    line = json.dumps({
+        'submission_id': str(submission_id),
+        'content_hash': content_hash,
+        'name': name,
+        'email': email,
+        'subject': subject,
+        'message': message,
+        'created_at': timezone.now().isoformat(),
+    }, ensure_ascii=False) + '\n'
+
+    # Rotation renames pending.jsonl under the same lock, so no line is
+    # ever written to a file the flusher has already read.
+    with _locked('append.lock'):
+        fd = os.open(os.path.join(spool_dir(), PENDING_NAME), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, line.encode('utf-8'))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    flusher.notify()
+    return submission_id
+
+
+def _rotate():
+    """Move the pending file aside so appends continue into a fresh one."""
+    pending = os.path.join(spool_dir(), PENDING_NAME)
+    with _locked('append.lock'):
+        if os.path.exists(pending) and os.path.getsize(pending):
+            batch = os.path.join(spool_dir(), f'{BATCH_PREFIX}{time.time_ns()}-{os.getpid()}.jsonl')
+            os.rename(pending, batch)
+
+
+def _read_batch(path):
+    objects = []
+    with open(path, encoding='utf-8') as file:
+        for number, line in enumerate(file, 1):
+            try:
+                entry = json.loads(line)
+                objects.append(ContactMessage(
+                    submission_id=uuid.UUID(entry['submission_id']),
+                    created_at=parse_datetime(entry['created_at']),
+                    content_hash=entry.get('content_hash', ''),
+                    **{field: entry[field] for field in FIELDS},
+                ))
+            except (ValueError, KeyError, TypeError):
+                # Only a line torn by a crash mid-write can be malformed.
+                logger.warning('Skipping malformed contact spool line %s:%s', path, number)
+    return objects
+
+
+def flush(wait=False):
+    """
+    Write every spooled submission to the database and return how many.
+
+    Only one process flushes at a time; unless ``wait`` is set, others
+    return 0 immediately and leave the work to the current holder.
+    """
+    with _locked('flush.lock', blocking=wait) as acquired:
+        if not acquired:
+            return 0
+        _rotate()
+        batches = sorted(
+            name for name in os.listdir(spool_dir())
+            if name.startswith(BATCH_PREFIX) and name.endswith('.jsonl')
+        )
+        written = 0
+        for name in batches:
+            path = os.path.join(spool_dir(), name)
+            objects = _read_batch(path)
+            ContactMessage.objects.bulk_create(objects, batch_size=batch_size(), ignore_conflicts=True)
+            os.remove(path)
+            written += len(objects)
+        return written
+
+
+class Flusher:
+    """Background thread that flushes the spool every few seconds."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+        self.pending = 0
+
+    def notify(self):
+        interval = getattr(settings, 'PORTFOLIO_CONTACT_FLUSH_INTERVAL', 2.0)
+        if not interval:
+            return
+        with self.lock:
+            self.pending += 1
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, args=(interval,), name='contact-spool-flusher', daemon=True
+                )
+                self.thread.start()
+            if self.pending >= batch_size():
+                self.wake.set()
+
+    def run(self, interval):
+        while True:
+            self.wake.wait(interval)
+            self.wake.clear()
+            with self.lock:
+                self.pending = 0
+            close_old_connections()
+            try:
+                flush()
+            except Exception:
+                # Entries stay spooled and are retried on the next tick.
+                logger.exception('Flushing the contact spool failed')
+            finally:
+                close_old_connections()
+
+
+flusher = Flusher()
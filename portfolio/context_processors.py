@@ -1,22 +1,31 @@
+from django.utils.functional import SimpleLazyObject
 from django.utils.translation import gettext_lazy as _
 
-from .models import SiteSetting
+from .cache import aget_site_settings, get_site_settings
+
+
+async def apreload_site_settings(request):
+    """
+    Warm the SiteSetting cache with the async ORM before rendering.
+
+    Django runs context processors synchronously, so async views call this
+    first and ``site_settings`` then finds the instance in the local cache.
+    """
+    await aget_site_settings()
 
 
 def site_settings(request):
     """
     Provide site-wide settings such as the translated site title.
-    """
-    settings_obj = (
-        SiteSetting.objects.filter(is_active=True)
-        .order_by('-updated_at', '-id')
-        .first()
-    )
 
-    site_title = settings_obj.site_title if settings_obj else _("SkyPardaz - Creative Studio")
+    Both values are lazy, so templates that never use them (the admin,
+    error pages) skip the lookup entirely.
+    """
+    def site_title():
+        settings_obj = get_site_settings()
+        return settings_obj.site_title if settings_obj else _("SkyPardaz - Creative Studio")
 
     return {
-        'site_settings': settings_obj,
-        'site_title': site_title,
+        'site_settings': SimpleLazyObject(get_site_settings),
+        'site_title': SimpleLazyObject(site_title),
     }
-
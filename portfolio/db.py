@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def apply_sqlite_pragmas(cursor, pragmas):
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created, dispatch_uid='portfolio_sqlite_pragmas')
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Apply PORTFOLIO_SQLITE_PRAGMAS to every new SQLite connection.
+
+    WAL lets readers carry on while the admin or the contact flusher writes,
+    and busy_timeout makes writers queue instead of failing with
+    "database is locked".
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        apply_sqlite_pragmas(cursor, getattr(settings, 'PORTFOLIO_SQLITE_PRAGMAS', {}))
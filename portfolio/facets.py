@@ -0,0 +1,70 @@
+"""
+Technology filtering and facet counts for the portfolio grid.
+
+``TechnologyFacet`` keeps, per technology, the active items using it as
+``[order, id]`` pairs in grid order. The signals in ``portfolio.signals``
+rebuild the rows a change touches, so a filter request reads that small
+table once and intersects lists in memory instead of grouping the m2m
+table for every visitor.
+"""
+from bisect import bisect_right
+
+from .models import PortfolioItem, Technology, TechnologyFacet
+from .pagination import decode_cursor, items_queryset, page_size, split_page
+
+MATCH_MODES = ('all', 'any')
+
+
+def rebuild(technology_ids=None):
+    """Recompute the facets of ``technology_ids``, or of every technology."""
+    technologies = Technology.objects.all()
+    if technology_ids is not None:
+        technologies = technologies.filter(pk__in=technology_ids)
+    items = {pk: [] for pk in technologies.values_list('pk', flat=True)}
+    if not items:
+        return
+    links = PortfolioItem.technologies.through.objects.filter(
+        technology_id__in=list(items), portfolioitem__is_active=True
+    ).order_by('portfolioitem__order', 'portfolioitem_id')
+    for technology_id, order, item_id in links.values_list('technology_id', 'portfolioitem__order', 'portfolioitem_id'):
+        items[technology_id].append([order, item_id])
+    TechnologyFacet.objects.bulk_create(
+        [TechnologyFacet(technology_id=pk, items=pairs, item_count=len(pairs)) for pk, pairs in items.items()],
+        update_conflicts=True, unique_fields=['technology'], update_fields=['items', 'item_count'],
+    )
+
+
+def active_facets():
+    return TechnologyFacet.objects.filter(technology__is_active=True, item_count__gt=0).select_related(
+        'technology'
+    ).order_by('technology__order', 'technology__name')
+
+
+def select(facets, technology_ids, match='all'):
+    """
+    Return the ``(order, id)`` pairs of items matching ``technology_ids``.
+
+    ``match='all'`` keeps items using every selected technology, ``'any'``
+    items using at least one. Pairs come back in grid order.
+    """
+    chosen = [{tuple(pair) for pair in facet.items} for facet in facets if facet.technology_id in technology_ids]
+    if not chosen or (match == 'all' and len(chosen) < len(set(technology_ids))):
+        return []
+    matched = set.intersection(*chosen) if match == 'all' else set.union(*chosen)
+    return sorted(matched)
+
+
+def counts(facets, pairs=None):
+    """Map each facet's technology id to its number of items among ``pairs`` (all items when None)."""
+    if pairs is None:
+        return {facet.technology_id: facet.item_count for facet in facets}
+    ids = {item_id for _, item_id in pairs}
+    return {facet.technology_id: sum(item_id in ids for _, item_id in facet.items) for facet in facets}
+
+
+def filtered_page(pairs, cursor=None, size=None):
+    """Return ``(items, next_cursor)`` for the page of ``pairs`` after ``cursor``."""
+    size = size or page_size()
+    start = bisect_right(pairs, decode_cursor(cursor)) if cursor else 0
+    ids = [item_id for _, item_id in pairs[start:start + size + 1]]
+    return split_page(list(items_queryset().filter(pk__in=ids)), size)
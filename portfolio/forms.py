@@ -6,9 +6,24 @@ from modeltranslation.forms import TranslationModelForm
 # Ensure modeltranslation registers translation fields before the form is evaluated
 import portfolio.translation  # noqa: F401
 
+from .images import validate_image_pixels
 from .models import PortfolioItem
 
 
+class PixelLimitedImageField(forms.ImageField):
+    """
+    Image form field that checks the pixel limit before Pillow verifies the file.
+
+    Pillow rejects decompression bombs with a generic "invalid image" error;
+    checking the header first gives editors an actionable message instead.
+    """
+
+    def to_python(self, data):
+        if data is not None:
+            validate_image_pixels(data)
+        return super().to_python(data)
+
+
 class PortfolioItemForm(TranslationModelForm):
     class Meta:
         model = PortfolioItem
@@ -0,0 +1,252 @@
+import os
+import tempfile
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import File
+from django.utils.translation import gettext_lazy as _
+from PIL import Image, ImageOps, features
+
+try:
+    RESAMPLE_FILTER = Image.Resampling.LANCZOS  # Pillow ≥ 9
+except AttributeError:  # pragma: no cover - fallback for older Pillow
+    RESAMPLE_FILTER = Image.LANCZOS
+
+JPEG_QUALITY = 85
+WEBP_QUALITY = 80
+
+# EXIF orientations that rotate the image by 90 degrees.
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+VARIANT_WIDTHS = (320, 640, 960, 1440)
+VARIANT_QUALITY = {'avif': 55, 'webp': 78}
+VARIANT_MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+
+class ImageSpec:
+    """Size limits applied when an uploaded image is optimized."""
+
+    def __init__(self, max_width, max_height, crop=False):
+        self.max_width = max_width
+        self.max_height = max_height
+        # Center-crop to the max_width:max_height aspect ratio before resizing.
+        self.crop = crop
+
+    def __repr__(self):
+        return f"ImageSpec({self.max_width}, {self.max_height}, crop={self.crop})"
+
+
+DEFAULT_SPEC = ImageSpec(1920, 1920)
+# Team cards show avatars at up to 320 CSS pixels, so 640 covers 2x screens.
+AVATAR_SPEC = ImageSpec(640, 640, crop=True)
+
+
+def get_image_spec(model, field_name):
+    return getattr(model, 'image_specs', {}).get(field_name, DEFAULT_SPEC)
+
+
+def max_image_pixels():
+    return getattr(settings, 'PORTFOLIO_MAX_IMAGE_PIXELS', 50_000_000)
+
+
+def spooled_file():
+    """A buffer that moves from memory to a temp file once it grows large."""
+    return tempfile.SpooledTemporaryFile(max_size=getattr(settings, 'PORTFOLIO_IMAGE_SPOOL_SIZE', 2 * 1024 * 1024))
+
+
+def validate_image_pixels(value):
+    """
+    Reject uploads whose header declares more pixels than the configured limit.
+
+    Only the header is read, so this is cheap even for decompression bombs.
+    Files already in storage are not re-checked.
+    """
+    if not value or getattr(value, '_committed', False):
+        return
+    image_file = getattr(value, 'file', value)
+    limit = max_image_pixels()
+    try:
+        image_file.seek(0)
+        with Image.open(image_file) as img:
+            width, height = img.size
+    except Image.DecompressionBombError:
+        width = height = None
+    except OSError:
+        # Not an image at all; ImageField validation reports that.
+        return
+    finally:
+        image_file.seek(0)
+
+    if width is None or width * height > limit:
+        raise ValidationError(
+            _('This image is too large to process. Please upload an image of at most %(megapixels)s megapixels.'),
+            code='image_too_large',
+            params={'megapixels': round(limit / 1_000_000)},
+        )
+
+
+def _draft_size(img, spec):
+    """Smallest decode size that still covers what the spec keeps of ``img``."""
+    max_width, max_height = spec.max_width, spec.max_height
+    if img.getexif().get(0x0112) in TRANSPOSED_ORIENTATIONS:
+        max_width, max_height = max_height, max_width
+    scales = (max_width / img.width, max_height / img.height)
+    # Cropping keeps the short side, so it must cover the larger scale.
+    scale = min(1, max(scales) if spec.crop else min(scales))
+    return max(1, int(img.width * scale + 0.5)), max(1, int(img.height * scale + 0.5))
+
+
+def _save_jpeg(img, buffer):
+    if img.mode in ('RGBA', 'P', 'LA'):
+        img = img.convert('RGB')
+    img.save(buffer, format='JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+
+
+def optimize_image(storage, name, spec=DEFAULT_SPEC):
+    """
+    Write an optimized copy of the stored image ``name`` next to the original.
+
+    Returns the storage name of the copy, or None when the image cannot be
+    decoded or exceeds the pixel limit; FileNotFoundError propagates. The original is left untouched so it
+    keeps being served until the caller swaps the field over.
+
+    JPEG sources are decoded at a reduced DCT scale, and the encoded output
+    spills to a temp file, so peak memory stays close to the output size.
+    """
+    buffer = spooled_file()
+    try:
+        with storage.open(name, 'rb') as image_file, Image.open(image_file) as img:
+            if img.width * img.height > max_image_pixels():
+                buffer.close()
+                return None
+
+            img_format = (img.format or '').upper()
+            has_transparency = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+
+            if img_format == 'JPEG':
+                # Must run before load(): libjpeg then decodes at 1/2, 1/4 or 1/8 scale.
+                img.draft('RGB', _draft_size(img, spec))
+
+            # Re-encoding drops EXIF, so apply the camera orientation first.
+            ImageOps.exif_transpose(img, in_place=True)
+
+            if spec.crop:
+                ratio = spec.max_width / spec.max_height
+                crop_size = (min(img.width, round(img.height * ratio)), min(img.height, round(img.width / ratio)))
+                img = ImageOps.fit(img, crop_size, RESAMPLE_FILTER)
+
+            # Resize if bigger than the limits while preserving aspect ratio
+            if img.width > spec.max_width or img.height > spec.max_height:
+                img.thumbnail((spec.max_width, spec.max_height), RESAMPLE_FILTER)
+
+            base, _ = os.path.splitext(name)
+
+            if img_format in ('JPEG', 'JPG'):
+                _save_jpeg(img, buffer)
+            elif img_format == 'PNG':
+                if not has_transparency:
+                    # For PNG without transparency we can safely leverage JPEG to shrink further
+                    _save_jpeg(img, buffer)
+                    name = f"{base}.jpg"
+                else:
+                    img.save(buffer, format='PNG', optimize=True, compress_level=6)
+            elif img_format == 'WEBP':
+                img.save(buffer, format='WEBP', quality=WEBP_QUALITY, method=6)
+            else:
+                _save_jpeg(img, buffer)
+                name = f"{base}.jpg"
+    except FileNotFoundError:
+        # A missing file is the caller's problem, not an undecodable image.
+        buffer.close()
+        raise
+    except (OSError, Image.DecompressionBombError):
+        buffer.close()
+        return None
+
+    buffer.seek(0)
+    # The storage picks a free name, so the original is never overwritten.
+    with buffer:
+        return storage.save(name, File(buffer))
+
+
+def process_image(model_label, field_name, source_name):
+    """
+    Optimize one stored image and build its variants.
+
+    Only files are touched, never the database, so this can run in a worker
+    process; it returns ``(new_name, manifest)`` or None for undecodable files.
+    """
+    model = apps.get_model(model_label)
+    storage = model._meta.get_field(field_name).storage
+    new_name = optimize_image(storage, source_name, get_image_spec(model, field_name))
+    if new_name is None:
+        return None
+    return new_name, generate_variants(storage, new_name)
+
+
+def _feature_available(name):
+    try:
+        return features.check(name)
+    except (ValueError, KeyError):  # pragma: no cover - unknown to older Pillow
+        return False
+
+
+def variant_formats():
+    """Modern formats this Pillow build can encode, best first."""
+    return tuple(fmt for fmt in ('avif', 'webp') if _feature_available(fmt))
+
+
+def generate_variants(storage, name):
+    """
+    Write downscaled AVIF/WEBP copies of the stored image ``name``.
+
+    Returns the manifest recorded on the model: the source name and size plus,
+    per format, the variant widths and storage names in ascending order. Only
+    widths smaller than the source are produced.
+    """
+    base, _ = os.path.splitext(name)
+    directory, filename = os.path.split(base)
+    manifest = {'source': name, 'formats': {}}
+
+    with storage.open(name, 'rb') as image_file, Image.open(image_file) as img:
+        img.load()
+        manifest['width'], manifest['height'] = img.size
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'transparency' in img.info or img.mode in ('LA', 'PA') else 'RGB')
+
+        widths = [width for width in VARIANT_WIDTHS if width < img.width]
+        resized = {}
+        # Scale down from the previous (larger) step to keep each resize cheap.
+        current = img
+        for width in sorted(widths, reverse=True):
+            height = max(1, round(img.height * width / img.width))
+            current = current.resize((width, height), RESAMPLE_FILTER)
+            resized[width] = current
+
+        for fmt in variant_formats():
+            entries = []
+            for width in widths:
+                with spooled_file() as buffer:
+                    resized[width].save(buffer, format=fmt.upper(), quality=VARIANT_QUALITY[fmt])
+                    buffer.seek(0)
+                    variant_name = storage.save(
+                        os.path.join(directory, 'variants', f"{filename}-{width}w.{fmt}"), File(buffer)
+                    )
+                entries.append({'width': width, 'name': variant_name})
+            manifest['formats'][fmt] = entries
+
+    return manifest
+
+
+def delete_variants(storage, manifest):
+    for entries in (manifest or {}).get('formats', {}).values():
+        for entry in entries:
+            storage.delete(entry['name'])
+
+
+def current_variants(field_file, manifest):
+    """Return the manifest formats if they were built from the current file."""
+    if not field_file or not manifest or manifest.get('source') != field_file.name:
+        return {}
+    return manifest.get('formats', {})
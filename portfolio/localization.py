@@ -0,0 +1,82 @@
+"""
+Resolve modeltranslation fields once per object instead of on every access.
+
+``hero.title`` goes through modeltranslation's descriptor, which rebuilds
+the language resolution order and the localized field names each time it
+is read. ``localize`` works out that order once per model for the active
+language, reads the ``<field>_<lang>`` values straight from each object,
+and wraps it in a ``Localized`` whose translated attributes are plain
+instance attributes. Everything else is read from the wrapped object.
+"""
+from modeltranslation.fields import NONE
+from modeltranslation.translator import NotRegistered, translator
+from modeltranslation.utils import build_localized_fieldname, get_language, resolution_order
+
+
+class Localized:
+    """A model instance with its translated fields resolved for one language."""
+
+    def __init__(self, obj, values):
+        self.__dict__.update(values)
+        self._object = obj
+
+    def __getattr__(self, name):
+        return getattr(self._object, name)
+
+    def __str__(self):
+        return str(self._object)
+
+    def __repr__(self):
+        return f'<Localized {self._object!r}>'
+
+
+def _resolvers(model, language):
+    """Return ``[(field, localized names, undefined value, descriptor)]`` for ``model``."""
+    try:
+        fields = translator.get_options_for_model(model).fields
+    except NotRegistered:
+        return []
+    resolvers = []
+    for field in fields:
+        descriptor = getattr(model, field)
+        undefined = descriptor.fallback_undefined
+        if undefined is NONE:
+            undefined = descriptor.field.get_default()
+        names = [build_localized_fieldname(field, lang) for lang in resolution_order(language, descriptor.fallback_languages)]
+        resolvers.append((field, names, undefined, descriptor))
+    return resolvers
+
+
+def _resolve(obj, names, undefined, descriptor):
+    values = obj.__dict__
+    for name in names:
+        if name not in values:
+            # Deferred field: let the descriptor load it.
+            break
+        value = values[name]
+        if value is not None and value != undefined:
+            return value
+    # Nothing usable; the descriptor applies fallback values and defaults.
+    return descriptor.__get__(obj, type(obj))
+
+
+def localize(objects, language=None):
+    """
+    Wrap ``objects`` in ``Localized`` views for ``language`` (the active one by default).
+
+    Objects of models without translated fields are returned unchanged.
+    """
+    language = language or get_language()
+    resolvers = {}
+    localized = []
+    for obj in objects:
+        model = type(obj)
+        if model not in resolvers:
+            resolvers[model] = _resolvers(model, language)
+        if not resolvers[model]:
+            localized.append(obj)
+            continue
+        localized.append(Localized(obj, {
+            field: _resolve(obj, names, undefined, descriptor) for field, names, undefined, descriptor in resolvers[model]
+        }))
+    return localized
@@ -0,0 +1,107 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from portfolio.db import apply_sqlite_pragmas
+
+
+class Command(BaseCommand):
+    help = 'Measure SQLite read throughput while a writer is busy, per pragma profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=5.0, help='Duration of each run')
+        parser.add_argument('--readers', type=int, default=8, help='Concurrent reader threads')
+        parser.add_argument('--rows', type=int, default=5000, help='Rows to seed before measuring')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        results = [self.run(name, pragmas, options) for name, pragmas in settings.SQLITE_PROFILES.items()]
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for result in results:
+            self.stdout.write(
+                f"{result['profile']:>10}: {result['reads_per_second']:>9} reads/s  "
+                f"{result['writes_per_second']:>7} writes/s  {result['busy_errors']} busy errors"
+            )
+
+    def connect(self, path, pragmas):
+        # Mirrors Django's connection: autocommit plus the profile's pragmas.
+        conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        apply_sqlite_pragmas(conn, pragmas)
+        return conn
+
+    def run(self, profile, pragmas, options):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bench.sqlite3')
+            setup = self.connect(path, pragmas)
+            setup.execute('CREATE TABLE message (id INTEGER PRIMARY KEY, email TEXT, body TEXT, created REAL)')
+            setup.executemany(
+                'INSERT INTO message (email, body, created) VALUES (?, ?, ?)',
+                ((f'user{i}@example.com', 'x' * 200, time.time()) for i in range(options['rows'])),
+            )
+            setup.close()
+
+            stop = threading.Event()
+            counts = {'reads': 0, 'writes': 0, 'busy': 0}
+            lock = threading.Lock()
+
+            def count(key):
+                with lock:
+                    counts[key] += 1
+
+            def writer():
+                conn = self.connect(path, pragmas)
+                while not stop.is_set():
+                    try:
+                        conn.execute('BEGIN IMMEDIATE')
+                        for _ in range(20):
+                            conn.execute(
+                                'INSERT INTO message (email, body, created) VALUES (?, ?, ?)',
+                                ('writer@example.com', 'y' * 200, time.time()),
+                            )
+                        conn.execute('COMMIT')
+                        count('writes')
+                    except sqlite3.OperationalError:
+                        if conn.in_transaction:
+                            conn.execute('ROLLBACK')
+                        count('busy')
+                conn.close()
+
+            def reader():
+                conn = self.connect(path, pragmas)
+                while not stop.is_set():
+                    try:
+                        conn.execute(
+                            'SELECT id, email FROM message ORDER BY id DESC LIMIT 20'
+                        ).fetchall()
+                        count('reads')
+                    except sqlite3.OperationalError:
+                        count('busy')
+                conn.close()
+
+            threads = [threading.Thread(target=writer)] + [
+                threading.Thread(target=reader) for _ in range(options['readers'])
+            ]
+            for thread in threads:
+                thread.start()
+            time.sleep(options['seconds'])
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        return {
+            'profile': profile,
+            'pragmas': pragmas,
+            'readers': options['readers'],
+            'seconds': options['seconds'],
+            'reads_per_second': round(counts['reads'] / options['seconds'], 1),
+            'writes_per_second': round(counts['writes'] / options['seconds'], 1),
+            'busy_errors': counts['busy'],
+        }
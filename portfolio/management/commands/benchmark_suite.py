@@ -0,0 +1,95 @@
+import json
+import os
+import platform
+import subprocess
+import tempfile
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_databases, teardown_databases
+from django.utils import timezone
+
+from portfolio import benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the public request paths on seeded datasets, in a throwaway database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,1000', help='Comma-separated portfolio item counts to seed')
+        parser.add_argument('--rounds', type=int, default=30, help='Timed requests per case')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per case first')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for the generated datasets')
+        parser.add_argument('--case', action='append', dest='cases', choices=list(benchmarks.CASES),
+                            help='Case to run (repeatable); all by default')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--compare', help='Earlier --output file to check for regressions')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Median latency growth counted as a regression, as a fraction')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError('--sizes takes comma-separated integers, e.g. 10,1000,5000')
+        if options['rounds'] < 1 or any(size < 1 for size in sizes):
+            raise CommandError('--rounds and every size must be at least 1')
+        baseline = None
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as file:
+                baseline = json.load(file)['results']
+
+        with tempfile.TemporaryDirectory() as directory:
+            if connection.vendor == 'sqlite':
+                # On disk like production, not the test runner's in-memory database.
+                connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'benchmark.sqlite3')
+            databases = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+            try:
+                results = benchmarks.run(
+                    sizes, options['rounds'], options['warmup'], options['seed'], options['cases'], log=self.report
+                )
+            finally:
+                teardown_databases(databases, verbosity=0)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump({'meta': self.meta(options), 'results': results}, file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"✓ Wrote {options['output']}"))
+
+        if baseline is not None:
+            regressions = benchmarks.compare(baseline, results, options['threshold'])
+            for regression in regressions:
+                self.stderr.write(
+                    f"{regression['case']} @ {regression['size']}: {regression['metric']} "
+                    f"{regression['before']} -> {regression['after']}"
+                )
+            if regressions:
+                raise CommandError(f'{len(regressions)} regression(s) against {options["compare"]}')
+            self.stdout.write(self.style.SUCCESS(f"✓ No regressions against {options['compare']}"))
+
+    def report(self, result):
+        flag = self.style.WARNING(f"  {result['unexpected_statuses']} unexpected status(es)") if result['unexpected_statuses'] else ''
+        self.stdout.write(
+            f"{result['size']:>6} {result['case']:>17}: p50 {result['p50_ms']:>8} ms  p90 {result['p90_ms']:>8} ms  "
+            f"p99 {result['p99_ms']:>8} ms  {result['queries']:>3} queries  {result['peak_memory_kib']:>8} KiB{flag}"
+        )
+
+    def meta(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'commit': commit,
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'sizes': options['sizes'],
+            'rounds': options['rounds'],
+            'seed': options['seed'],
+        }
@@ -0,0 +1,82 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import translation
+from modeltranslation.translator import translator
+
+from portfolio.localization import localize
+from portfolio.models import PortfolioItem, TeamMember
+
+
+class Command(BaseCommand):
+    help = 'Compare translated attribute reads through modeltranslation with localize()d objects'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--objects', type=int, default=300, help='Objects per model')
+        parser.add_argument('--reads', type=int, default=2,
+                            help='Reads of each translated field per object, as templates often test then print')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per case; the fastest is reported')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        results = []
+        for language in ('en', 'fa'):
+            with translation.override(language):
+                for model in (PortfolioItem, TeamMember):
+                    results.append(self.run(model, language, options))
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for result in results:
+            self.stdout.write(
+                f"{result['model']:>13} [{result['language']}]: descriptor {result['descriptor_ms']:>7} ms  "
+                f"localized {result['localized_ms']:>7} ms (resolving alone {result['localize_ms']} ms)  "
+                f"x{result['speedup']}"
+            )
+
+    def instances(self, model, count):
+        """Unsaved objects; every third lacks the first language so fallbacks are exercised."""
+        fields = translator.get_options_for_model(model).fields
+        objects = []
+        for i in range(count):
+            values = {}
+            for field in fields:
+                values[f'{field}_fa'] = f'{field} {i} fa'
+                values[f'{field}_en'] = None if i % 3 == 0 else f'{field} {i} en'
+            objects.append(model(**values))
+        return fields, objects
+
+    def time(self, function, repeat):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+        return best * 1000
+
+    def run(self, model, language, options):
+        fields, objects = self.instances(model, options['objects'])
+        reads = range(options['reads'])
+
+        def read_all(items):
+            for obj in items:
+                for field in fields:
+                    for _ in reads:
+                        getattr(obj, field)
+
+        def localized():
+            read_all(localize(objects))
+
+        descriptor_ms = self.time(lambda: read_all(objects), options['repeat'])
+        localized_ms = self.time(localized, options['repeat'])
+        return {
+            'model': model.__name__,
+            'language': language,
+            'objects': len(objects),
+            'reads': len(objects) * len(fields) * options['reads'],
+            'descriptor_ms': round(descriptor_ms, 3),
+            'localized_ms': round(localized_ms, 3),
+            'localize_ms': round(self.time(lambda: localize(objects), options['repeat']), 3),
+            'speedup': round(descriptor_ms / localized_ms, 2),
+        }
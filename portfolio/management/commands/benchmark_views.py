@@ -0,0 +1,117 @@
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import AsyncClient, Client
+
+from portfolio.snapshot import local_host
+
+MODES = ('sync', 'async')
+
+
+def summarize(mode, latencies, statuses, elapsed, concurrency):
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        'mode': mode,
+        'requests': len(latencies),
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(quantiles[49] * 1000, 2),
+        'p95_ms': round(quantiles[94] * 1000, 2),
+        'errors': sum(status >= 500 for status in statuses),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare sync views under threads with native async views under asyncio'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/en/', help='URL to request')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per mode')
+        parser.add_argument('--concurrency', type=int, default=32, help='Requests in flight at once')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+        parser.add_argument('--worker', choices=MODES, help='Internal: run one mode in this process')
+
+    def handle(self, *args, **options):
+        if options['worker']:
+            runner = self.run_sync if options['worker'] == 'sync' else self.run_async
+            self.stdout.write(json.dumps(runner(options)))
+            return
+
+        # Each mode runs in a fresh process because the URLconf picks the
+        # view flavour from PORTFOLIO_ASYNC_VIEWS when it is imported.
+        results = [self.spawn(mode, options) for mode in MODES]
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for result in results:
+            self.stdout.write(
+                f"{result['mode']:>5}: {result['requests_per_second']:>8} req/s  "
+                f"p50 {result['p50_ms']} ms  p95 {result['p95_ms']} ms  errors {result['errors']}"
+            )
+
+    def spawn(self, mode, options):
+        env = dict(os.environ, PORTFOLIO_ASYNC_VIEWS='True' if mode == 'async' else 'False')
+        command = [
+            sys.executable, '-m', 'django', 'benchmark_views', '--worker', mode, '--path', options['path'],
+            '--requests', str(options['requests']), '--concurrency', str(options['concurrency']),
+            '--settings', os.environ.get('DJANGO_SETTINGS_MODULE', 'skypardaz.settings'),
+        ]
+        completed = subprocess.run(command, env=env, cwd=settings.BASE_DIR, capture_output=True, text=True)
+        if completed.returncode:
+            raise CommandError(f'{mode} benchmark failed:\n{completed.stderr}')
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def run_sync(self, options):
+        """Sync views through the WSGI-style handler, one thread per in-flight request."""
+        headers = {'Host': local_host()}
+
+        def request(_):
+            client = Client(headers=headers)
+            start = time.perf_counter()
+            response = client.get(options['path'])
+            if response.streaming:
+                b''.join(response.streaming_content)
+            latency = time.perf_counter() - start
+            connection.close()
+            return latency, response.status_code
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            results = list(pool.map(request, range(options['requests'])))
+        elapsed = time.perf_counter() - start
+        latencies, statuses = zip(*results)
+        return summarize('sync', list(latencies), statuses, elapsed, options['concurrency'])
+
+    def run_async(self, options):
+        """Async views through the ASGI handler, all requests on one event loop."""
+        headers = {'Host': local_host()}
+
+        async def main():
+            client = AsyncClient(headers=headers)
+            semaphore = asyncio.Semaphore(options['concurrency'])
+
+            async def request():
+                async with semaphore:
+                    start = time.perf_counter()
+                    response = await client.get(options['path'])
+                    if response.streaming:
+                        [chunk async for chunk in response.streaming_content]
+                    return time.perf_counter() - start, response.status_code
+
+            start = time.perf_counter()
+            results = await asyncio.gather(*(request() for _ in range(options['requests'])))
+            return results, time.perf_counter() - start
+
+        results, elapsed = asyncio.run(main())
+        latencies, statuses = zip(*results)
+        return summarize('async', list(latencies), statuses, elapsed, options['concurrency'])
@@ -0,0 +1,74 @@
+import json
+import os
+from urllib.error import URLError
+
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio import assets
+from portfolio.snapshot import render_homepage
+
+
+class Command(BaseCommand):
+    help = ('Bundle and minify CSS per language, extract critical CSS and self-host fonts and scripts; '
+            'run before collectstatic')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fetch-fonts', action='store_true',
+                            help='Download the Google Fonts files to host them ourselves')
+        parser.add_argument('--fetch-scripts', action='store_true',
+                            help='Download three.js and GSAP to host them ourselves')
+        parser.add_argument('--languages', nargs='+', default=list(assets.STYLESHEETS),
+                            help='Languages to build')
+
+    def handle(self, *args, **options):
+        os.makedirs(assets.build_dir(), exist_ok=True)
+        manifest = {}
+        for language in options['languages']:
+            if language not in assets.STYLESHEETS:
+                raise CommandError(f'No stylesheets configured for {language!r}')
+            fonts_css, preload = self.fonts(language, options['fetch_fonts'])
+            entry = assets.build_language(language, render_homepage(language), fonts_css, preload)
+            manifest[language] = entry
+            self.stdout.write(self.style.SUCCESS(
+                f"✓ {language}: {entry['css']} ({len(entry['critical'])} bytes critical CSS, "
+                f"{'self-hosted' if fonts_css else 'Google'} fonts)"
+            ))
+        vendor = self.scripts(options['fetch_scripts'])
+        if vendor:
+            manifest['vendor'] = vendor
+            self.stdout.write(self.style.SUCCESS('✓ three.js and GSAP self-hosted'))
+        assets.write_manifest(manifest)
+        self.stdout.write('Run collectstatic to fingerprint and precompress the bundle.')
+
+    def fonts(self, language, fetch):
+        """Return ``(css, preload)``, downloading fonts if asked and reusing earlier downloads."""
+        saved = os.path.join(assets.build_dir(), f'fonts-{language}.json')
+        if fetch:
+            try:
+                css, preload = assets.fetch_fonts(language)
+            except URLError as exc:
+                raise CommandError(f'Could not download fonts for {language}: {exc}')
+            with open(saved, 'w', encoding='utf-8') as file:
+                json.dump({'css': css, 'preload': preload}, file)
+            return css, preload
+        if os.path.exists(saved):
+            with open(saved, encoding='utf-8') as file:
+                data = json.load(file)
+            return data['css'], data['preload']
+        return None, []
+
+    def scripts(self, fetch):
+        """Return the vendored script paths, downloading them if asked."""
+        saved = os.path.join(assets.build_dir(), 'vendor.json')
+        if fetch:
+            try:
+                vendor = assets.fetch_scripts()
+            except URLError as exc:
+                raise CommandError(f'Could not download scripts: {exc}')
+            with open(saved, 'w', encoding='utf-8') as file:
+                json.dump(vendor, file)
+            return vendor
+        if os.path.exists(saved):
+            with open(saved, encoding='utf-8') as file:
+                return json.load(file)
+        return None
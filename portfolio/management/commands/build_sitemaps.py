@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from portfolio import sitemaps
+
+
+class Command(BaseCommand):
+    help = 'Write the sitemap files; only stale sections unless --all is given'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Rewrite every section')
+
+    def handle(self, *args, **options):
+        rebuilt = sitemaps.ensure_current(force=options['all'])
+        if rebuilt:
+            self.stdout.write(self.style.SUCCESS(f"✓ Rebuilt {', '.join(rebuilt)} in {sitemaps.sitemap_dir()}"))
+        else:
+            self.stdout.write('Sitemaps are up to date.')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from portfolio import contact_spool
+
+
+class Command(BaseCommand):
+    help = 'Write spooled contact form submissions to the database'
+
+    def handle(self, *args, **options):
+        written = contact_spool.flush(wait=True)
+        self.stdout.write(self.style.SUCCESS(f'✓ Stored {written} contact message(s)'))
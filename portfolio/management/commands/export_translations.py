@@ -0,0 +1,28 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio import translation_io
+
+
+class Command(BaseCommand):
+    help = 'Stream every translated field to JSONL, CSV or a PO-style file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=translation_io.FORMATS, default='jsonl')
+        parser.add_argument('--output', help='File to write; standard output by default')
+        parser.add_argument('--language', default='fa',
+                            help='Target language of a po export; the other language becomes msgid')
+
+    def handle(self, *args, **options):
+        if options['format'] == 'po' and options['language'] not in translation_io.languages():
+            raise CommandError(f"Unknown language {options['language']!r}")
+        # newline='' keeps the csv module's own line endings.
+        file = open(options['output'], 'w', encoding='utf-8', newline='') if options['output'] else sys.stdout
+        try:
+            translation_io.write_rows(translation_io.export_rows(), file, options['format'], options['language'])
+        finally:
+            if options['output']:
+                file.close()
+        if options['output']:
+            self.stderr.write(self.style.SUCCESS(f"✓ Wrote {options['output']}"))
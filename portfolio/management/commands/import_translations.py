@@ -0,0 +1,54 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio import translation_io
+
+
+class Command(BaseCommand):
+    help = 'Load translated fields from a JSONL, CSV or PO-style file in chunked bulk updates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=translation_io.FORMATS,
+                            help='Defaults to the file extension')
+        parser.add_argument('--language', action='append', dest='languages',
+                            help='Language to import (repeatable); all of them by default, the target of a po file')
+        parser.add_argument('--allow-missing', action='store_true',
+                            help='Skip absent languages and untranslated po entries instead of rejecting the file')
+        parser.add_argument('--batch-size', type=int, default=translation_io.CHUNK_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Validate only')
+
+    def handle(self, *args, **options):
+        format = options['format'] or os.path.splitext(options['path'])[1].lstrip('.').lower()
+        if format not in translation_io.FORMATS:
+            raise CommandError(f'Cannot tell the format of {options["path"]}; pass --format')
+        languages = options['languages'] or translation_io.languages()
+        unknown = set(languages) - set(translation_io.languages())
+        if unknown:
+            raise CommandError(f'Unknown language(s): {", ".join(sorted(unknown))}')
+        if format == 'po' and len(languages) != 1:
+            raise CommandError('A po file holds one language; pass --language')
+
+        start = time.perf_counter()
+        with open(options['path'], encoding='utf-8', newline='') as file:
+            try:
+                updates = translation_io.validate(
+                    translation_io.read_rows(file, format, languages[0]), languages, options['allow_missing']
+                )
+            except translation_io.TranslationImportError as exc:
+                for error in exc.errors[:50]:
+                    self.stderr.write(error)
+                if len(exc.errors) > 50:
+                    self.stderr.write(f'... and {len(exc.errors) - 50} more')
+                raise CommandError(f'{exc}; nothing was imported')
+
+        objects = sum(len(objects) for objects in updates.values())
+        if options['dry_run']:
+            self.stdout.write(f'{objects} object(s) would be updated.')
+            return
+        changed = translation_io.apply(updates, options['batch_size']) if objects else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Updated {changed} object(s) in {time.perf_counter() - start:.2f}s'
+        ))
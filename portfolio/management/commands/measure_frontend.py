@@ -0,0 +1,126 @@
+import json
+import mimetypes
+import os
+import statistics
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from portfolio.assets import load_manifest
+from portfolio.snapshot import local_host, render_homepage
+
+MODES = ('eager', 'deferred')
+MOTION = ('no-preference', 'reduce')
+
+# Long tasks are only reported to observers registered before they run.
+LONG_TASK_OBSERVER = """
+window.__longTasks = [];
+new PerformanceObserver((list) => {
+    for (const entry of list.getEntries()) window.__longTasks.push(entry.duration);
+}).observe({type: 'longtask', buffered: true});
+"""
+
+
+class Command(BaseCommand):
+    help = ('Load the homepage in headless Chromium with eager and deferred three.js/GSAP and '
+            'compare main-thread time; needs Playwright and `build_assets --fetch-scripts`')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--language', default='en', help='Homepage language to render')
+        parser.add_argument('--runs', type=int, default=5, help='Page loads per scenario')
+        parser.add_argument('--cpu-throttle', type=float, default=4.0,
+                            help='CPU slowdown factor, as Lighthouse uses for mobile')
+        parser.add_argument('--settle', type=int, default=3000,
+                            help='Milliseconds to keep measuring after the load event')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        try:
+            from playwright.sync_api import sync_playwright
+        except ImportError:
+            raise CommandError('Playwright is required: pip install playwright && playwright install chromium')
+        if not (load_manifest() or {}).get('vendor'):
+            # The page must not reach the CDN, or network time would swamp the comparison.
+            raise CommandError('Run `manage.py build_assets --fetch-scripts` first to vendor three.js and GSAP')
+
+        pages = {mode: self.homepage(options['language'], mode) for mode in MODES}
+        results = []
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.launch(args=['--enable-unsafe-swiftshader'])
+            try:
+                for motion in MOTION:
+                    for mode in MODES:
+                        samples = [self.measure(browser, pages[mode], motion, options) for _ in range(options['runs'])]
+                        results.append(self.summarize(mode, motion, samples))
+            finally:
+                browser.close()
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for result in results:
+            self.stdout.write(
+                f"{result['mode']:>8} / motion {result['reduced_motion']:<13}: "
+                f"main thread {result['task_ms']:>7} ms  script {result['script_ms']:>7} ms  "
+                f"TBT {result['total_blocking_ms']:>6} ms  {result['script_kb']:>6} KB JS"
+            )
+
+    def homepage(self, language, mode):
+        with override_settings(PORTFOLIO_MOTION_LOADING=mode):
+            return render_homepage(language)
+
+    def local_file(self, path):
+        """Map a request path to a static or media file on disk, or None."""
+        if path.startswith(settings.STATIC_URL):
+            return finders.find(path[len(settings.STATIC_URL):])
+        if path.startswith(settings.MEDIA_URL):
+            candidate = os.path.join(settings.MEDIA_ROOT, path[len(settings.MEDIA_URL):])
+            return candidate if os.path.isfile(candidate) else None
+        return None
+
+    def measure(self, browser, html, motion, options):
+        context = browser.new_context(reduced_motion=motion)
+        page = context.new_page()
+        script_bytes = []
+
+        def route(request_route):
+            path = urlsplit(request_route.request.url).path
+            if path == '/':
+                return request_route.fulfill(body=html, content_type='text/html; charset=utf-8')
+            found = self.local_file(path)
+            if not found:
+                # Offline: fonts and anything else remote are dropped in every scenario alike.
+                return request_route.abort()
+            with open(found, 'rb') as file:
+                body = file.read()
+            if path.endswith('.js'):
+                script_bytes.append(len(body))
+            request_route.fulfill(body=body, content_type=mimetypes.guess_type(found)[0] or 'application/octet-stream')
+
+        page.route('**/*', route)
+        page.add_init_script(LONG_TASK_OBSERVER)
+        cdp = context.new_cdp_session(page)
+        cdp.send('Emulation.setCPUThrottlingRate', {'rate': options['cpu_throttle']})
+        cdp.send('Performance.enable')
+        try:
+            page.goto(f'http://{local_host()}/', wait_until='load')
+            page.wait_for_timeout(options['settle'])
+            metrics = {item['name']: item['value'] for item in cdp.send('Performance.getMetrics')['metrics']}
+            long_tasks = page.evaluate('window.__longTasks')
+        finally:
+            context.close()
+        return {
+            'task_ms': metrics['TaskDuration'] * 1000,
+            'script_ms': metrics['ScriptDuration'] * 1000,
+            'total_blocking_ms': sum(max(0, duration - 50) for duration in long_tasks),
+            'script_kb': sum(script_bytes) / 1024,
+        }
+
+    def summarize(self, mode, motion, samples):
+        result = {'mode': mode, 'reduced_motion': motion, 'runs': len(samples)}
+        for key in ('task_ms', 'script_ms', 'total_blocking_ms', 'script_kb'):
+            result[key] = round(statistics.median(sample[key] for sample in samples), 1)
+        return result
@@ -0,0 +1,71 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections, models
+
+from portfolio.images import process_image
+from portfolio.tasks import swap_image
+
+
+class Command(BaseCommand):
+    help = 'Optimize existing images and build their responsive variants across CPU cores'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Number of worker processes (defaults to the CPU count)')
+        parser.add_argument('--force', action='store_true',
+                            help='Also reprocess images whose variants are already up to date')
+
+    def image_fields(self):
+        for model in apps.get_app_config('portfolio').get_models():
+            for field in model._meta.concrete_fields:
+                if isinstance(field, models.ImageField):
+                    yield model, field.name
+
+    def pending_images(self, force):
+        for model, field_name in self.image_fields():
+            variants_field = f'{field_name}_variants'
+            rows = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+            for instance in rows.only('pk', field_name, variants_field):
+                name = getattr(instance, field_name).name
+                if force or getattr(instance, variants_field).get('source') != name:
+                    yield instance, field_name, name
+
+    def handle(self, *args, **options):
+        pending = list(self.pending_images(options['force']))
+        if not pending:
+            self.stdout.write(self.style.SUCCESS('All images are already optimized'))
+            return
+
+        self.stdout.write(f'Optimizing {len(pending)} image(s) with {options["workers"]} worker(s)...')
+        # Worker processes only touch files; close connections so forked
+        # children never share a database handle with the parent.
+        connections.close_all()
+        swapped = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=django.setup) as executor:
+            futures = {
+                executor.submit(process_image, instance._meta.label, field_name, name): (instance, field_name, name)
+                for instance, field_name, name in pending
+            }
+            for future in as_completed(futures):
+                instance, field_name, name = futures[future]
+                try:
+                    result = future.result()
+                except FileNotFoundError:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f'✗ Missing file {name}'))
+                    continue
+                except Exception as exc:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f'✗ {name}: {exc}'))
+                    continue
+                if result is None:
+                    failed += 1
+                    self.stdout.write(self.style.WARNING(f'Skipped undecodable image {name}'))
+                elif swap_image(instance, field_name, name, *result):
+                    swapped += 1
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Optimized {swapped} image(s), {failed} failed or skipped'))
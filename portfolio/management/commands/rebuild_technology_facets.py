@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from portfolio import facets
+from portfolio.models import TechnologyFacet
+
+
+class Command(BaseCommand):
+    help = 'Recompute the technology facets, e.g. after bulk imports that bypass signals'
+
+    def handle(self, *args, **options):
+        facets.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'✓ Rebuilt {TechnologyFacet.objects.count()} technology facet(s)'))
@@ -1,11 +1,41 @@
-from django.core.management.base import BaseCommand
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from portfolio import seeding
 from portfolio.models import Hero, About, Service, PortfolioItem, ContactInfo
+from portfolio.signals import suspended
 
 
 class Command(BaseCommand):
-    help = 'Populate database with sample data'
+    help = 'Populate database with sample data, or with a generated dataset of any size with --scale'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int,
+                            help='Generate this many portfolio items plus proportional technologies, '
+                                 'team members and contact messages, replacing the existing ones '
+                                 '(real contact messages are kept)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same seed gives the same dataset')
+        parser.add_argument('--images', action='store_true',
+                            help='Attach generated placeholder images and offline archives')
+        parser.add_argument('--batch-size', type=int, default=seeding.BATCH_SIZE)
 
     def handle(self, *args, **options):
+        if options['scale'] is None:
+            self.create_sample_data()
+            return
+        if options['scale'] < 1:
+            raise CommandError('--scale must be at least 1')
+        # Hero, about, services and contact info come from the sample data.
+        with suspended():
+            self.create_sample_data()
+        start = time.perf_counter()
+        counts = seeding.generate(
+            options['scale'], seed=options['seed'], media=options['images'], batch_size=options['batch_size']
+        )
+        summary = ', '.join(f'{count} {name.replace("_", " ")}' for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'\n✓ Generated {summary} in {time.perf_counter() - start:.2f}s'))
+
+    def create_sample_data(self):
         self.stdout.write(self.style.SUCCESS('Creating sample data...'))
         
         # Clear existing data (optional - comment out if you want to keep existing data)
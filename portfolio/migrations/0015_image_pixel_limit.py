@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:37
+
+import portfolio.images
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0014_image_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='portfolioitem',
+            name='image',
+            field=models.ImageField(blank=True, null=True, upload_to='portfolio/', validators=[portfolio.images.validate_image_pixels], verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='teammember',
+            name='photo',
+            field=models.ImageField(blank=True, null=True, upload_to='team/', validators=[portfolio.images.validate_image_pixels], verbose_name='Photo'),
+        ),
+    ]
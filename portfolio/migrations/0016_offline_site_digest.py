@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0015_image_pixel_limit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='portfolioitem',
+            name='offline_site_digest',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Offline Site Digest'),
+        ),
+    ]
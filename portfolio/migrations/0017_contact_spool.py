@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:44
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0016_offline_site_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactmessage',
+            name='submission_id',
+            field=models.UUIDField(blank=True, editable=False, null=True, unique=True, verbose_name='Submission ID'),
+        ),
+        migrations.AlterField(
+            model_name='contactmessage',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Created At'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0018_contact_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='about',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='portfolio_about_active'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['-created_at'], name='portfolio_message_created'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['-created_at'], name='portfolio_message_unread'),
+        ),
+        migrations.AddIndex(
+            model_name='portfolioitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='portfolio_item_active'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='portfolio_service_active'),
+        ),
+        migrations.AddIndex(
+            model_name='sitesetting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-updated_at', '-id'], name='portfolio_setting_active'),
+        ),
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='portfolio_team_active'),
+        ),
+        migrations.AddIndex(
+            model_name='technology',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'name'], name='portfolio_tech_active'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_facets(apps, schema_editor):
+    Technology = apps.get_model('portfolio', 'Technology')
+    TechnologyFacet = apps.get_model('portfolio', 'TechnologyFacet')
+    Link = apps.get_model('portfolio', 'PortfolioItem').technologies.through
+    items = {pk: [] for pk in Technology.objects.values_list('pk', flat=True)}
+    links = Link.objects.filter(portfolioitem__is_active=True).order_by('portfolioitem__order', 'portfolioitem_id')
+    for technology_id, order, item_id in links.values_list('technology_id', 'portfolioitem__order', 'portfolioitem_id'):
+        items[technology_id].append([order, item_id])
+    TechnologyFacet.objects.bulk_create(
+        TechnologyFacet(technology_id=pk, items=pairs, item_count=len(pairs)) for pk, pairs in items.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0019_active_order_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TechnologyFacet',
+            fields=[
+                ('technology', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='facet', serialize=False, to='portfolio.technology', verbose_name='Technology')),
+                ('items', models.JSONField(default=list, verbose_name='Items')),
+                ('item_count', models.PositiveIntegerField(default=0, verbose_name='Item Count')),
+            ],
+            options={
+                'verbose_name': 'Technology Facet',
+                'verbose_name_plural': 'Technology Facets',
+            },
+        ),
+        migrations.RunPython(build_facets, migrations.RunPython.noop),
+    ]
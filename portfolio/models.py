@@ -1,20 +1,50 @@
-import os
-from io import BytesIO
-
-from django.core.files.base import ContentFile
+from django.conf import settings
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from PIL import Image
+from modeltranslation.utils import build_localized_fieldname
+
+from .images import AVATAR_SPEC, DEFAULT_SPEC, validate_image_pixels
+
+
+def first_translation(obj, field):
+    """
+    Return the first non-empty translation of ``field`` in fallback order.
+
+    Admin labels use this so they never come out blank whatever language
+    the admin runs in. Values are read from the instance dict, skipping
+    modeltranslation's descriptor and never loading deferred fields.
+    """
+    for language in settings.MODELTRANSLATION_FALLBACK_LANGUAGES:
+        value = obj.__dict__.get(build_localized_fieldname(field, language))
+        if value:
+            return value
+    return None
 
-try:
-    RESAMPLE_FILTER = Image.Resampling.LANCZOS  # Pillow ≥ 9
-except AttributeError:  # pragma: no cover - fallback for older Pillow
-    RESAMPLE_FILTER = Image.LANCZOS
 
-MAX_IMAGE_WIDTH = 1920
-MAX_IMAGE_HEIGHT = 1920
-JPEG_QUALITY = 85
-WEBP_QUALITY = 80
+class OptimizedImagesMixin:
+    """
+    Queue background optimization for every newly uploaded ImageField.
+
+    Per-field size limits come from ``image_specs``; fields not listed there
+    use ``DEFAULT_SPEC``. Each image field needs a ``<field>_variants`` JSON
+    field to hold its responsive variant manifest.
+    """
+    image_specs = {}
+
+    def save(self, *args, **kwargs):
+        new_uploads = [
+            field.name for field in self._meta.concrete_fields
+            if isinstance(field, models.ImageField)
+            and getattr(self, field.attname)
+            and not getattr(self, field.attname)._committed
+        ]
+        super().save(*args, **kwargs)
+        # Optimizing and building responsive variants inline would block the
+        # admin request, so the ``manage.py process_image_jobs`` worker does it.
+        for field_name in new_uploads:
+            ImageOptimizationJob.enqueue(self, field_name)
 
 
 class Hero(models.Model):
@@ -29,12 +59,7 @@ class Hero(models.Model):
         verbose_name_plural = _("Heroes")
     
     def __str__(self):
-        # Try to get title in current language, fallback to any language
-        if hasattr(self, 'title_en') and self.title_en:
-            return self.title_en
-        elif hasattr(self, 'title_fa') and self.title_fa:
-            return self.title_fa
-        return str(self.id) if self.id else "New"
+        return first_translation(self, 'title') or (str(self.id) if self.id else "New")
 
 
 class About(models.Model):
@@ -48,14 +73,10 @@ class About(models.Model):
         verbose_name = _("About")
         verbose_name_plural = _("About")
         ordering = ['order', 'id']
+        indexes = [models.Index(fields=['order', 'id'], condition=Q(is_active=True), name='portfolio_about_active')]
     
     def __str__(self):
-        # Try to get title in current language, fallback to any language
-        if hasattr(self, 'title_en') and self.title_en:
-            return self.title_en
-        elif hasattr(self, 'title_fa') and self.title_fa:
-            return self.title_fa
-        return str(self.id) if self.id else "New"
+        return first_translation(self, 'title') or (str(self.id) if self.id else "New")
 
 
 class TeamSection(models.Model):
@@ -69,19 +90,20 @@ class TeamSection(models.Model):
         verbose_name_plural = _("Team Sections")
 
     def __str__(self):
-        if hasattr(self, 'title_en') and self.title_en:
-            return self.title_en
-        if hasattr(self, 'title_fa') and self.title_fa:
-            return self.title_fa
-        return self.title or _("Team Section")
+        return first_translation(self, 'title') or self.title or _("Team Section")
 
 
-class TeamMember(models.Model):
+class TeamMember(OptimizedImagesMixin, models.Model):
     """Team member information"""
+    image_specs = {'photo': AVATAR_SPEC}
+
     name = models.CharField(max_length=120, verbose_name=_("Name"))
     role = models.CharField(max_length=200, blank=True, null=True, verbose_name=_("Role"))
     bio = models.TextField(blank=True, null=True, verbose_name=_("Bio"))
-    photo = models.ImageField(upload_to='team/', blank=True, null=True, verbose_name=_("Photo"))
+    photo = models.ImageField(
+        upload_to='team/', blank=True, null=True, validators=[validate_image_pixels], verbose_name=_("Photo")
+    )
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Photo Variants"))
     linkedin_url = models.URLField(blank=True, null=True, verbose_name=_("LinkedIn URL"))
     instagram_url = models.URLField(blank=True, null=True, verbose_name=_("Instagram URL"))
     github_url = models.URLField(blank=True, null=True, verbose_name=_("GitHub URL"))
@@ -92,13 +114,10 @@ class TeamMember(models.Model):
         verbose_name = _("Team Member")
         verbose_name_plural = _("Team Members")
         ordering = ['order', 'id']
+        indexes = [models.Index(fields=['order', 'id'], condition=Q(is_active=True), name='portfolio_team_active')]
 
     def __str__(self):
-        if hasattr(self, 'name_en') and self.name_en:
-            return self.name_en
-        if hasattr(self, 'name_fa') and self.name_fa:
-            return self.name_fa
-        return self.name or _("Team Member")
+        return first_translation(self, 'name') or self.name or _("Team Member")
 
 
 class Service(models.Model):
@@ -113,14 +132,10 @@ class Service(models.Model):
         verbose_name = _("Service")
         verbose_name_plural = _("Services")
         ordering = ['order', 'id']
+        indexes = [models.Index(fields=['order', 'id'], condition=Q(is_active=True), name='portfolio_service_active')]
     
     def __str__(self):
-        # Try to get title in current language, fallback to any language
-        if hasattr(self, 'title_en') and self.title_en:
-            return self.title_en
-        elif hasattr(self, 'title_fa') and self.title_fa:
-            return self.title_fa
-        return str(self.id) if self.id else "New"
+        return first_translation(self, 'title') or (str(self.id) if self.id else "New")
 
 
 class Technology(models.Model):
@@ -133,13 +148,16 @@ class Technology(models.Model):
         verbose_name = _("Technology")
         verbose_name_plural = _("Technologies")
         ordering = ['order', 'name']
+        indexes = [models.Index(fields=['order', 'name'], condition=Q(is_active=True), name='portfolio_tech_active')]
     
     def __str__(self):
         return self.name
 
 
-class PortfolioItem(models.Model):
+class PortfolioItem(OptimizedImagesMixin, models.Model):
     """Portfolio items"""
+    image_specs = {'image': DEFAULT_SPEC}
+
     PORTFOLIO_TYPE_CHOICES = [
         ('online', _('Online')),
         ('offline', _('Offline')),
@@ -147,7 +165,10 @@ class PortfolioItem(models.Model):
     
     title = models.CharField(max_length=200, blank=True, null=True, verbose_name=_("Title"))
     description = models.TextField(blank=True, null=True, verbose_name=_("Description"))
-    image = models.ImageField(upload_to='portfolio/', blank=True, null=True, verbose_name=_("Image"))
+    image = models.ImageField(
+        upload_to='portfolio/', blank=True, null=True, validators=[validate_image_pixels], verbose_name=_("Image")
+    )
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Image Variants"))
     portfolio_type = models.CharField(
         max_length=10, 
         choices=PORTFOLIO_TYPE_CHOICES, 
@@ -164,23 +185,22 @@ class PortfolioItem(models.Model):
         verbose_name=_("Offline File"), 
         help_text=_("Upload ZIP file containing the complete website (only for offline portfolios)")
     )
+    # SHA-256 of the extracted offline archive, or offline.NOT_A_SITE, see portfolio.offline
+    offline_site_digest = models.CharField(max_length=64, blank=True, editable=False, verbose_name=_("Offline Site Digest"))
     technologies = models.ManyToManyField(Technology, blank=True, verbose_name=_("Technologies"))
     order = models.IntegerField(default=0, verbose_name=_("Order"))
     is_active = models.BooleanField(default=True, verbose_name=_("Is Active"))
+    # Sitemap lastmod
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
     
     class Meta:
         verbose_name = _("Portfolio Item")
         verbose_name_plural = _("Portfolio Items")
         ordering = ['order', 'id']
+        indexes = [models.Index(fields=['order', 'id'], condition=Q(is_active=True), name='portfolio_item_active')]
     
     def __str__(self):
-        # Try to get title in current language, fallback to any language
-        title = None
-        if hasattr(self, 'title_en') and self.title_en:
-            title = self.title_en
-        elif hasattr(self, 'title_fa') and self.title_fa:
-            title = self.title_fa
-        
+        title = first_translation(self, 'title')
         if title:
             return f"{title} - {self.get_portfolio_type_display()}"
         return f"Portfolio Item {self.id if self.id else '(New)'} - {self.get_portfolio_type_display()}"
@@ -193,84 +213,27 @@ class PortfolioItem(models.Model):
             raise ValidationError({'offline_file': _('Offline file is required for offline portfolios.')})
 
     def save(self, *args, **kwargs):
-        if self.image and getattr(self.image, '_file', None):
-            self._optimize_image()
+        if self.offline_file and not self.offline_file._committed:
+            # A new archive is extracted again on first access.
+            self.offline_site_digest = ''
         super().save(*args, **kwargs)
 
-    def _optimize_image(self):
-        image_field = self.image
-        if not image_field:
-            return
-
-        image_file = getattr(image_field, 'file', None)
-        if not image_file:
-            return
-
-        image_file.seek(0)
-
-        try:
-            with Image.open(image_file) as img:
-                img_format = (img.format or '').upper()
-                has_transparency = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
-
-                # Resize if bigger than the limits while preserving aspect ratio
-                if img.width > MAX_IMAGE_WIDTH or img.height > MAX_IMAGE_HEIGHT:
-                    img.thumbnail((MAX_IMAGE_WIDTH, MAX_IMAGE_HEIGHT), RESAMPLE_FILTER)
-
-                buffer = BytesIO()
-
-                if img_format in ('JPEG', 'JPG'):
-                    if img.mode in ('RGBA', 'P', 'LA'):
-                        img = img.convert('RGB')
-                    img.save(
-                        buffer,
-                        format='JPEG',
-                        quality=JPEG_QUALITY,
-                        optimize=True,
-                        progressive=True,
-                    )
-                elif img_format == 'PNG':
-                    save_kwargs = {'optimize': True, 'compress_level': 6}
-                    if not has_transparency:
-                        # For PNG without transparency we can safely leverage JPEG to shrink further
-                        img = img.convert('RGB')
-                        img.save(
-                            buffer,
-                            format='JPEG',
-                            quality=JPEG_QUALITY,
-                            optimize=True,
-                            progressive=True,
-                        )
-                        base, _ = os.path.splitext(image_field.name)
-                        image_field.name = f"{base}.jpg"
-                    else:
-                        img.save(buffer, format='PNG', **save_kwargs)
-                elif img_format == 'WEBP':
-                    img.save(
-                        buffer,
-                        format='WEBP',
-                        quality=WEBP_QUALITY,
-                        method=6,
-                    )
-                else:
-                    if img.mode in ('RGBA', 'P', 'LA'):
-                        img = img.convert('RGB')
-                    img.save(
-                        buffer,
-                        format='JPEG',
-                        quality=JPEG_QUALITY,
-                        optimize=True,
-                        progressive=True,
-                    )
-                    base, _ = os.path.splitext(image_field.name)
-                    image_field.name = f"{base}.jpg"
-        except OSError:
-            image_file.seek(0)
-            return
-
-        buffer.seek(0)
-        image_field.save(image_field.name, ContentFile(buffer.read()), save=False)
-        buffer.close()
+
+class TechnologyFacet(models.Model):
+    """Precomputed active portfolio items per technology, see portfolio.facets"""
+    technology = models.OneToOneField(
+        Technology, on_delete=models.CASCADE, primary_key=True, related_name='facet', verbose_name=_("Technology")
+    )
+    # [order, id] pairs in grid order
+    items = models.JSONField(default=list, verbose_name=_("Items"))
+    item_count = models.PositiveIntegerField(default=0, verbose_name=_("Item Count"))
+
+    class Meta:
+        verbose_name = _("Technology Facet")
+        verbose_name_plural = _("Technology Facets")
+
+    def __str__(self):
+        return f"{self.technology} ({self.item_count})"
 
 
 class SiteSetting(models.Model):
@@ -283,6 +246,7 @@ class SiteSetting(models.Model):
         verbose_name = _("Site Setting")
         verbose_name_plural = _("Site Settings")
         ordering = ['-updated_at', '-id']
+        indexes = [models.Index(fields=['-updated_at', '-id'], condition=Q(is_active=True), name='portfolio_setting_active')]
 
     def __str__(self):
         return self.site_title or _("Site Setting")
@@ -310,13 +274,79 @@ class ContactMessage(models.Model):
     email = models.EmailField(verbose_name=_("Email"))
     subject = models.CharField(max_length=200, verbose_name=_("Subject"))
     message = models.TextField(verbose_name=_("Message"))
-    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created At"))
+    # Set when the visitor submits, which may be before a spooled row is written
+    created_at = models.DateTimeField(default=timezone.now, verbose_name=_("Created At"))
     is_read = models.BooleanField(default=False, verbose_name=_("Is Read"))
+    # Makes replaying a contact spool batch idempotent
+    submission_id = models.UUIDField(unique=True, null=True, blank=True, editable=False, verbose_name=_("Submission ID"))
+    # Normalized digest used to drop resent messages with an index lookup
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True, editable=False, verbose_name=_("Content Hash"))
     
     class Meta:
         verbose_name = _("Contact Message")
         verbose_name_plural = _("Contact Messages")
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='portfolio_message_created'),
+            # The admin's unread inbox
+            models.Index(fields=['-created_at'], condition=Q(is_read=False), name='portfolio_message_unread'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.subject}"
+
+
+class ContentVersion(models.Model):
+    """Global stamp bumped whenever public content changes"""
+    version = models.PositiveBigIntegerField(default=0, verbose_name=_("Version"))
+    updated_at = models.DateTimeField(default=timezone.now, verbose_name=_("Updated At"))
+
+    class Meta:
+        verbose_name = _("Content Version")
+        verbose_name_plural = _("Content Versions")
+
+    def __str__(self):
+        return f"v{self.version}"
+
+
+class ImageOptimizationJob(models.Model):
+    """Queued optimization and variant generation for an uploaded image"""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _('Pending')),
+        (STATUS_RUNNING, _('Running')),
+        (STATUS_DONE, _('Done')),
+        (STATUS_FAILED, _('Failed')),
+    ]
+
+    model_label = models.CharField(max_length=100, verbose_name=_("Model"))
+    object_id = models.PositiveBigIntegerField(verbose_name=_("Object ID"))
+    field_name = models.CharField(max_length=50, verbose_name=_("Field Name"))
+    source_name = models.CharField(max_length=255, verbose_name=_("Source File"))
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name=_("Status"))
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name=_("Attempts"))
+    error = models.TextField(blank=True, verbose_name=_("Error"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created At"))
+    started_at = models.DateTimeField(blank=True, null=True, verbose_name=_("Started At"))
+    finished_at = models.DateTimeField(blank=True, null=True, verbose_name=_("Finished At"))
+
+    class Meta:
+        verbose_name = _("Image Optimization Job")
+        verbose_name_plural = _("Image Optimization Jobs")
+        ordering = ['created_at', 'id']
+        indexes = [models.Index(fields=['status', 'created_at'], name='portfolio_imagejob_status')]
+
+    def __str__(self):
+        return f"{self.model_label}#{self.object_id}.{self.field_name} ({self.status})"
+
+    @classmethod
+    def enqueue(cls, instance, field_name):
+        return cls.objects.create(
+            model_label=instance._meta.label,
+            object_id=instance.pk,
+            field_name=field_name,
+            source_name=getattr(instance, field_name).name,
+        )
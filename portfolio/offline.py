@@ -0,0 +1,167 @@
+import hashlib
+import os
+import posixpath
+import shutil
+import stat
+import tempfile
+import zipfile
+
+from django.conf import settings
+
+SITES_DIR = os.path.join('portfolio', 'sites')
+COPY_CHUNK_SIZE = 64 * 1024
+# Stored as the item's digest when its archive is only offered as a download.
+NOT_A_SITE = '-'
+
+
+class ArchiveError(Exception):
+    """Raised for offline portfolio archives that are unsafe to extract."""
+
+
+def _limit(name, default):
+    return getattr(settings, name, default)
+
+
+def archive_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as archive:
+        for chunk in iter(lambda: archive.read(COPY_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def site_root(digest):
+    return os.path.join(settings.MEDIA_ROOT, SITES_DIR, digest)
+
+
+def _safe_member_path(name):
+    """Normalize a member name, rejecting anything that escapes the site root."""
+    normalized = posixpath.normpath(name.replace('\\', '/'))
+    if normalized.startswith(('/', '../')) or normalized in ('.', '..') or ':' in normalized.split('/')[0]:
+        raise ArchiveError(f'Unsafe path in archive: {name}')
+    return normalized
+
+
+def _plan(archive):
+    """
+    Validate every member and return ``(info, relative_path)`` pairs to extract.
+
+    Nothing is written before the whole archive has passed, so a rejected
+    archive costs one read of its central directory.
+    """
+    max_files = _limit('PORTFOLIO_SITE_MAX_FILES', 5000)
+    max_bytes = _limit('PORTFOLIO_SITE_MAX_BYTES', 500 * 1024 * 1024)
+    max_ratio = _limit('PORTFOLIO_SITE_MAX_RATIO', 100)
+
+    members = [info for info in archive.infolist() if not info.is_dir()]
+    if len(members) > max_files:
+        raise ArchiveError(f'Archive has {len(members)} files; the limit is {max_files}')
+
+    total = sum(info.file_size for info in members)
+    if total > max_bytes:
+        raise ArchiveError(f'Archive expands to {total} bytes; the limit is {max_bytes}')
+
+    planned = []
+    for info in members:
+        if stat.S_ISLNK(info.external_attr >> 16):
+            raise ArchiveError(f'Symlinks are not allowed: {info.filename}')
+        if info.compress_size and info.file_size / info.compress_size > max_ratio:
+            raise ArchiveError(f'Suspicious compression ratio for {info.filename}')
+        planned.append((info, _safe_member_path(info.filename)))
+
+    # Archives usually wrap the site in one folder; serve its contents at the root.
+    top_levels = {path.split('/', 1)[0] for _, path in planned}
+    if len(top_levels) == 1 and all('/' in path for _, path in planned):
+        planned = [(info, path.split('/', 1)[1]) for info, path in planned]
+
+    # A file named like a directory of another member ("a" and "a/b") cannot be written.
+    files = {path for _, path in planned}
+    for path in files:
+        parent = posixpath.dirname(path)
+        while parent:
+            if parent in files:
+                raise ArchiveError(f'{parent} is both a file and a directory in the archive')
+            parent = posixpath.dirname(parent)
+    return planned
+
+
+def _extract(zip_path, target):
+    """Extract the site in ``zip_path`` to ``target``; return False if it has no ``index.html``."""
+    max_bytes = _limit('PORTFOLIO_SITE_MAX_BYTES', 500 * 1024 * 1024)
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            plan = _plan(archive)
+    except (zipfile.BadZipFile, zipfile.LargeZipFile) as exc:
+        raise ArchiveError(str(exc)) from exc
+    if not any(path == 'index.html' for _, path in plan):
+        return False
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    staging = tempfile.mkdtemp(prefix='.extract-', dir=os.path.dirname(target))
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            written = 0
+            for info, path in plan:
+                destination = os.path.join(staging, *path.split('/'))
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                with archive.open(info) as source, open(destination, 'wb') as output:
+                    # Declared sizes can lie, so count what is actually inflated.
+                    for chunk in iter(lambda: source.read(COPY_CHUNK_SIZE), b''):
+                        written += len(chunk)
+                        if written > max_bytes:
+                            raise ArchiveError(f'Archive expands beyond {max_bytes} bytes')
+                        output.write(chunk)
+        try:
+            os.rename(staging, target)
+        except OSError:
+            # Another request finished extracting the same archive first.
+            if not os.path.isdir(target):
+                raise
+            shutil.rmtree(staging, ignore_errors=True)
+        return True
+    except (zipfile.BadZipFile, zipfile.LargeZipFile) as exc:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise ArchiveError(str(exc)) from exc
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def _remember(item, digest):
+    if item.offline_site_digest != digest:
+        type(item).objects.filter(pk=item.pk).update(offline_site_digest=digest)
+        item.offline_site_digest = digest
+
+
+def ensure_site(item):
+    """
+    Return the digest of the extracted site for an offline portfolio item,
+    or None when its archive holds no site to browse.
+
+    The archive is unpacked once into a directory named after its SHA-256,
+    and the digest is stored on the item so later requests only check that
+    the directory exists. Archives without an ``index.html`` and ones that
+    raise ``ArchiveError`` are marked ``NOT_A_SITE`` instead, so they are
+    not read again until a new file is uploaded.
+    """
+    digest = item.offline_site_digest
+    if digest == NOT_A_SITE:
+        return None
+    if digest and os.path.isdir(site_root(digest)):
+        return digest
+
+    zip_path = item.offline_file.path
+    digest = archive_digest(zip_path)
+    target = site_root(digest)
+    if not os.path.isdir(target):
+        try:
+            extracted = _extract(zip_path, target)
+        except ArchiveError:
+            _remember(item, NOT_A_SITE)
+            raise
+        if not extracted:
+            _remember(item, NOT_A_SITE)
+            return None
+
+    _remember(item, digest)
+    return digest
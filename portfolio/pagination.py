@@ -0,0 +1,69 @@
+"""
+Keyset pagination for the homepage portfolio grid.
+
+A cursor is the ``(order, id)`` of the last item shown. The next page reads
+forward from it on the ``portfolio_item_active`` index, so a deep page costs
+the same as the first; OFFSET would walk every skipped row.
+"""
+import re
+
+from django.conf import settings
+from django.db.models import Prefetch, Q
+
+from .models import PortfolioItem, Technology
+
+CURSOR_RE = re.compile(r'^(-?\d+)\.(\d+)$')
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def page_size():
+    return getattr(settings, 'PORTFOLIO_GRID_PAGE_SIZE', 12)
+
+
+def encode_cursor(item):
+    return f'{item.order}.{item.pk}'
+
+
+def decode_cursor(cursor):
+    match = CURSOR_RE.match(cursor or '')
+    if not match:
+        raise InvalidCursor(f'Invalid cursor {cursor!r}')
+    return int(match.group(1)), int(match.group(2))
+
+
+def items_queryset():
+    """Active items in grid order with technologies prefetched into ``technology_list``."""
+    return PortfolioItem.objects.filter(is_active=True).prefetch_related(
+        Prefetch('technologies', queryset=Technology.objects.all(), to_attr='technology_list')
+    ).order_by('order', 'id')
+
+
+def page_queryset(cursor=None, size=None):
+    """
+    Return a queryset for the page after ``cursor`` plus one lookahead row.
+
+    Pass the evaluated rows to ``split_page`` to drop the lookahead and get
+    the next cursor.
+    """
+    queryset = items_queryset()
+    if cursor:
+        order, pk = decode_cursor(cursor)
+        # The order__gte bound gives SQLite an index range to start from;
+        # the OR only filters rows that share the cursor's order.
+        queryset = queryset.filter(Q(order__gte=order), Q(order__gt=order) | Q(pk__gt=pk))
+    return queryset[:(size or page_size()) + 1]
+
+
+def split_page(rows, size=None):
+    """Return ``(items, next_cursor)``; the cursor is None on the last page."""
+    size = size or page_size()
+    items = list(rows[:size])
+    return items, encode_cursor(items[-1]) if len(rows) > size else None
+
+
+def portfolio_page(cursor=None, size=None):
+    return split_page(list(page_queryset(cursor, size)), size)
+
@@ -0,0 +1,144 @@
+"""
+Token bucket rate limiting and duplicate suppression for the contact form.
+
+Buckets live in the cache named by ``PORTFOLIO_RATE_LIMIT_CACHE``, so they
+follow whatever backend CACHES configures (locmem, file, database or a shared
+server). Each check is one cache read and one write; no table is scanned.
+"""
+import hashlib
+import re
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from .models import ContactMessage
+
+BUCKET_KEY = 'portfolio:ratelimit:{scope}:{ident}'
+DUPLICATE_KEY = 'portfolio:contact-duplicate:{digest}'
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+RATE_RE = re.compile(r'^(\d+)/(\d*)([smhd])$')
+
+
+def get_cache():
+    return caches[getattr(settings, 'PORTFOLIO_RATE_LIMIT_CACHE', 'default')]
+
+
+def parse_rate(rate):
+    """Turn ``'5/10m'`` into ``(5, 600)``: five requests per ten minutes."""
+    match = RATE_RE.match(rate)
+    if not match:
+        raise ValueError(f'Invalid rate {rate!r}; expected something like "5/m" or "20/12h"')
+    count, multiplier, unit = match.groups()
+    return int(count), int(multiplier or 1) * PERIODS[unit]
+
+
+def client_ip(request):
+    if getattr(settings, 'PORTFOLIO_TRUST_X_FORWARDED_FOR', False):
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _bucket_key(scope, ident):
+    return BUCKET_KEY.format(scope=scope, ident=hashlib.sha256(ident.encode()).hexdigest())
+
+
+def _spend(state, capacity, period, now):
+    """Refill a ``(tokens, updated)`` bucket and try to spend one token."""
+    tokens, updated = state or (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * capacity / period)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    return allowed, (tokens, now)
+
+
+def take_token(scope, ident, rate):
+    """
+    Spend one token from the ``scope`` bucket for ``ident``; False when empty.
+
+    Buckets hold up to ``count`` tokens and refill at ``count`` per
+    ``period``. The read and write are not atomic, so concurrent requests may
+    occasionally both spend the last token; that is acceptable for spam
+    control and avoids a lock per request.
+    """
+    capacity, period = parse_rate(rate)
+    key = _bucket_key(scope, ident)
+    allowed, state = _spend(get_cache().get(key), capacity, period, time.time())
+    # An idle bucket refills completely within one period, so it can expire then.
+    get_cache().set(key, state, period)
+    return allowed
+
+
+async def atake_token(scope, ident, rate):
+    capacity, period = parse_rate(rate)
+    key = _bucket_key(scope, ident)
+    allowed, state = _spend(await get_cache().aget(key), capacity, period, time.time())
+    await get_cache().aset(key, state, period)
+    return allowed
+
+
+def _contact_buckets(request, email):
+    limits = getattr(settings, 'PORTFOLIO_CONTACT_RATE_LIMITS', {})
+    idents = {'ip': client_ip(request), 'email': email.lower()}
+    return [(f'contact-{scope}', idents[scope], rate) for scope, rate in limits.items()]
+
+
+def allow_contact(request, email):
+    """Check every bucket in ``PORTFOLIO_CONTACT_RATE_LIMITS`` for this submission."""
+    # Spend from every bucket so a blocked sender cannot retry for free.
+    results = [take_token(*bucket) for bucket in _contact_buckets(request, email)]
+    return all(results)
+
+
+async def aallow_contact(request, email):
+    results = [await atake_token(*bucket) for bucket in _contact_buckets(request, email)]
+    return all(results)
+
+
+def content_hash(email, subject, message):
+    """Hash a submission so resends differing only in case or spacing match."""
+    normalized = '\0'.join(' '.join(part.split()).casefold() for part in (email, subject, message))
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def _recent(digest):
+    window = getattr(settings, 'PORTFOLIO_CONTACT_DUPLICATE_WINDOW', 60 * 60 * 24)
+    cutoff = timezone.now() - timedelta(seconds=window)
+    return window, ContactMessage.objects.filter(content_hash=digest, created_at__gte=cutoff)
+
+
+def is_duplicate(digest):
+    """
+    Return True if the same submission was seen within the duplicate window.
+
+    The cache catches resends that are still spooled; the indexed
+    ``content_hash`` lookup covers submissions whose cache entry was evicted.
+    A False result claims the submission; call ``forget_submission`` if it
+    then cannot be stored, so the visitor's retry is accepted.
+    """
+    window, recent = _recent(digest)
+    if not get_cache().add(DUPLICATE_KEY.format(digest=digest), 1, window):
+        return True
+    return recent.exists()
+
+
+async def ais_duplicate(digest):
+    window, recent = _recent(digest)
+    if not await get_cache().aadd(DUPLICATE_KEY.format(digest=digest), 1, window):
+        return True
+    return await recent.aexists()
+
+
+def forget_submission(digest):
+    """Release the duplicate claim ``is_duplicate`` made, when storing the submission failed."""
+    get_cache().delete(DUPLICATE_KEY.format(digest=digest))
+
+
+async def aforget_submission(digest):
+    await get_cache().adelete(DUPLICATE_KEY.format(digest=digest))
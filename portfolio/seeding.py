@@ -0,0 +1,227 @@
+"""
+Deterministic synthetic content for load testing and benchmarks.
+
+``generate(scale)`` replaces the portfolio items, technologies and team
+members with ``scale`` items and proportional amounts of the rest, and its
+own earlier contact messages with new ones (real messages are kept), built from bilingual word lists with a seeded ``Random``: the
+same scale and seed give the same content. Rows go in with ``bulk_create``
+and the item/technology links straight into the m2m through table, with the
+content signals suspended; the facets, content version and sitemaps are
+refreshed once at the end.
+"""
+import io
+import random
+import zipfile
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image
+
+from . import facets, sitemaps
+from .cache import bump_content_version
+from .models import ContactMessage, PortfolioItem, TeamMember, Technology
+from .ratelimit import content_hash
+from .signals import suspended
+
+BATCH_SIZE = 500
+
+ADJECTIVES = [
+    ('Modern', 'مدرن'), ('Secure', 'امن'), ('Fast', 'سریع'), ('Minimal', 'مینیمال'), ('Smart', 'هوشمند'),
+    ('Creative', 'خلاقانه'), ('Responsive', 'واکنش‌گرا'), ('Bilingual', 'دوزبانه'), ('Scalable', 'مقیاس‌پذیر'),
+    ('Interactive', 'تعاملی'),
+]
+SUBJECTS = [
+    ('Online Shop', 'فروشگاه اینترنتی'), ('Clinic Website', 'وب‌سایت کلینیک'), ('News Portal', 'پورتال خبری'),
+    ('Booking System', 'سامانه رزرو'), ('Admin Dashboard', 'داشبورد مدیریتی'), ('Restaurant Menu', 'منوی رستوران'),
+    ('Learning Platform', 'پلتفرم آموزشی'), ('Travel Agency', 'آژانس مسافرتی'), ('Real Estate Listing', 'فهرست املاک'),
+    ('Photography Portfolio', 'نمونه‌کار عکاسی'), ('Fitness App', 'اپلیکیشن ورزشی'), ('Corporate Website', 'وب‌سایت شرکتی'),
+]
+FEATURES = [
+    ('a payment gateway', 'درگاه پرداخت'), ('a content management panel', 'پنل مدیریت محتوا'),
+    ('search and filtering', 'جستجو و فیلتر'), ('online reservations', 'رزرو آنلاین'),
+    ('user accounts', 'حساب کاربری'), ('analytics reports', 'گزارش‌های آماری'),
+    ('an image gallery', 'گالری تصاویر'), ('SMS notifications', 'اطلاع‌رسانی پیامکی'),
+]
+TECHNOLOGIES = [
+    'Django', 'Python', 'PostgreSQL', 'SQLite', 'Redis', 'Celery', 'JavaScript', 'TypeScript', 'React', 'Vue.js',
+    'Tailwind CSS', 'Bootstrap', 'GSAP', 'three.js', 'Docker', 'Nginx', 'Flutter', 'Figma', 'REST API', 'GraphQL',
+]
+FIRST_NAMES = [
+    ('Sara', 'سارا'), ('Ali', 'علی'), ('Maryam', 'مریم'), ('Reza', 'رضا'), ('Niloofar', 'نیلوفر'),
+    ('Hamed', 'حامد'), ('Zahra', 'زهرا'), ('Amir', 'امیر'), ('Parisa', 'پریسا'), ('Mohammad', 'محمد'),
+]
+LAST_NAMES = [
+    ('Ahmadi', 'احمدی'), ('Karimi', 'کریمی'), ('Hosseini', 'حسینی'), ('Rahimi', 'رحیمی'), ('Moradi', 'مرادی'),
+    ('Sepehrnia', 'سپهرنیا'), ('Jafari', 'جعفری'), ('Ghasemi', 'قاسمی'),
+]
+ROLES = [
+    ('Backend Developer', 'توسعه‌دهنده بک‌اند'), ('Frontend Developer', 'توسعه‌دهنده فرانت‌اند'),
+    ('UI/UX Designer', 'طراح رابط کاربری'), ('Project Manager', 'مدیر پروژه'), ('DevOps Engineer', 'مهندس دواپس'),
+]
+MESSAGE_SUBJECTS = ['Project inquiry', 'Price request', 'Collaboration', 'درخواست همکاری', 'سفارش طراحی سایت']
+# Generated contact messages are sent from this domain, so a new run can
+# replace them without touching the real inbox.
+SEED_EMAIL_DOMAIN = 'seed.example.com'
+PLACEHOLDER_COLORS = ['#1e3a8a', '#0f766e', '#b45309', '#7c3aed', '#be123c', '#15803d', '#334155', '#0369a1']
+
+
+def sizes(scale):
+    """How many rows of each kind ``generate(scale)`` creates."""
+    return {
+        'portfolio_items': scale,
+        'technologies': min(max(8, scale // 25), 500),
+        'team_members': max(4, scale // 50),
+        'contact_messages': scale * 2,
+    }
+
+
+def _placeholder_image(name, color, size):
+    """Save a flat-colour JPEG at ``name`` unless it exists; return the name."""
+    if not default_storage.exists(name):
+        buffer = io.BytesIO()
+        Image.new('RGB', size, color).save(buffer, format='JPEG', quality=80)
+        name = default_storage.save(name, ContentFile(buffer.getvalue()))
+    return name
+
+
+def _placeholder_archive(name, files):
+    if not default_storage.exists(name):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for path, content in files.items():
+                archive.writestr(path, content)
+        name = default_storage.save(name, ContentFile(buffer.getvalue()))
+    return name
+
+
+def placeholder_media():
+    """
+    Write the shared placeholder files once and return their storage names.
+
+    Items cycle through a few images rather than each getting its own, so a
+    large dataset stays small on disk. Offline items alternate between an
+    archive holding a browsable site and one that is only downloaded.
+    """
+    return {
+        'images': [
+            _placeholder_image(f'portfolio/seed/placeholder-{i}.jpg', color, (800, 600))
+            for i, color in enumerate(PLACEHOLDER_COLORS)
+        ],
+        'photos': [
+            _placeholder_image(f'team/seed/avatar-{i}.jpg', color, (256, 256))
+            for i, color in enumerate(PLACEHOLDER_COLORS)
+        ],
+        'archives': [
+            _placeholder_archive('portfolio/offline/seed/site.zip', {
+                'index.html': '<!doctype html><title>Offline portfolio</title><h1>Offline portfolio</h1>',
+                'style.css': 'h1 { font-family: sans-serif; }',
+            }),
+            _placeholder_archive('portfolio/offline/seed/download.zip', {
+                'README.txt': 'Offline portfolio deliverables\n' * 64,
+                'design/brief.txt': 'Project brief\n' * 256,
+            }),
+        ],
+    }
+
+
+def _items(rng, count, media):
+    items = []
+    for i in range(count):
+        adjective, subject, feature = rng.choice(ADJECTIVES), rng.choice(SUBJECTS), rng.choice(FEATURES)
+        # Roughly one in five portfolios is delivered offline.
+        offline = rng.random() < 0.2
+        items.append(PortfolioItem(
+            title_en=f'{adjective[0]} {subject[0]}',
+            title_fa=f'{subject[1]} {adjective[1]}',
+            description_en=f'A {adjective[0].lower()} {subject[0].lower()} with {feature[0]}, built for project #{i + 1}.',
+            description_fa=f'یک {subject[1]} {adjective[1]} با {feature[1]}، برای پروژه شماره {i + 1}.',
+            image=media['images'][i % len(media['images'])] if media else None,
+            portfolio_type='offline' if offline else 'online',
+            url=None if offline else f'https://example.com/projects/{i + 1}',
+            offline_file=media['archives'][i % 2] if offline and media else None,
+            order=i,
+            # A few hidden items keep the active-only queries honest.
+            is_active=rng.random() >= 0.05,
+        ))
+    return items
+
+
+def _team_members(rng, count, media):
+    members = []
+    for i in range(count):
+        first, last, role = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(ROLES)
+        members.append(TeamMember(
+            name_en=f'{first[0]} {last[0]}',
+            name_fa=f'{first[1]} {last[1]}',
+            role_en=role[0],
+            role_fa=role[1],
+            bio_en=f'{first[0]} works as a {role[0].lower()} on our projects.',
+            bio_fa=f'{first[1]} به عنوان {role[1]} در پروژه‌های ما فعالیت می‌کند.',
+            photo=media['photos'][i % len(media['photos'])] if media else None,
+            github_url=f'https://github.com/member{i + 1}',
+            order=i,
+        ))
+    return members
+
+
+def _messages(rng, count):
+    now = timezone.now()
+    messages = []
+    for i in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        email = f'{first[0].lower()}.{last[0].lower()}{i}@{SEED_EMAIL_DOMAIN}'
+        subject = rng.choice(MESSAGE_SUBJECTS)
+        message = f'Hello, I would like to discuss a {rng.choice(SUBJECTS)[0].lower()} with {rng.choice(FEATURES)[0]}.'
+        messages.append(ContactMessage(
+            name=f'{first[0]} {last[0]}',
+            email=email,
+            subject=subject,
+            message=message,
+            created_at=now - timedelta(minutes=rng.randrange(60 * 24 * 365)),
+            is_read=rng.random() < 0.7,
+            content_hash=content_hash(email, subject, message),
+        ))
+    return messages
+
+
+def generate(scale, seed=0, media=False, batch_size=BATCH_SIZE):
+    """Replace the generated rows with a ``scale``-sized dataset; return the row counts."""
+    rng = random.Random(seed)
+    counts = sizes(scale)
+    files = placeholder_media() if media else None
+    Through = PortfolioItem.technologies.through
+
+    with transaction.atomic(), suspended():
+        Through.objects.all().delete()
+        for model in (PortfolioItem, Technology, TeamMember):
+            model.objects.all().delete()
+        ContactMessage.objects.filter(email__endswith=f'@{SEED_EMAIL_DOMAIN}').delete()
+
+        # Past the named list, technologies repeat with a number: "Django 2".
+        Technology.objects.bulk_create([
+            Technology(name=TECHNOLOGIES[i % len(TECHNOLOGIES)] + (f' {i // len(TECHNOLOGIES) + 1}' if i >= len(TECHNOLOGIES) else ''), order=i)
+            for i in range(counts['technologies'])
+        ], batch_size=batch_size)
+        PortfolioItem.objects.bulk_create(_items(rng, scale, files), batch_size=batch_size)
+
+        # Reloaded rather than read off bulk_create, which not every backend fills in.
+        technology_ids = list(Technology.objects.order_by('pk').values_list('pk', flat=True))
+        item_ids = PortfolioItem.objects.order_by('pk').values_list('pk', flat=True)
+        links = [
+            Through(portfolioitem_id=item_id, technology_id=technology_id)
+            for item_id in item_ids.iterator()
+            for technology_id in rng.sample(technology_ids, rng.randint(1, min(5, len(technology_ids))))
+        ]
+        Through.objects.bulk_create(links, batch_size=batch_size)
+        counts['technology_links'] = len(links)
+
+        TeamMember.objects.bulk_create(_team_members(rng, counts['team_members'], files), batch_size=batch_size)
+        ContactMessage.objects.bulk_create(_messages(rng, counts['contact_messages']), batch_size=batch_size)
+
+        facets.rebuild()
+        bump_content_version()
+        transaction.on_commit(lambda: sitemaps.mark_stale('static', 'portfolio'))
+    return counts
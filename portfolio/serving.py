@@ -0,0 +1,278 @@
+import mimetypes
+import os
+import secrets
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+DJANGO = 'django'
+X_ACCEL_REDIRECT = 'x-accel-redirect'
+X_SENDFILE = 'x-sendfile'
+BACKENDS = (DJANGO, X_ACCEL_REDIRECT, X_SENDFILE)
+
+# Like FileResponse, describe compressed files by type rather than
+# Content-Encoding so browsers do not silently decompress downloads.
+ENCODED_CONTENT_TYPES = {
+    'br': 'application/x-brotli',
+    'bzip2': 'application/x-bzip',
+    'compress': 'application/x-compress',
+    'gzip': 'application/gzip',
+    'xz': 'application/x-xz',
+}
+
+# Requests asking for more ranges than this get the whole file instead.
+MAX_RANGES = 16
+CHUNK_SIZE = 64 * 1024
+
+
+def get_backend():
+    backend = getattr(settings, 'PORTFOLIO_FILE_SERVING', DJANGO)
+    if backend not in BACKENDS:
+        raise ImproperlyConfigured(f'PORTFOLIO_FILE_SERVING must be one of {", ".join(BACKENDS)}, not {backend!r}')
+    return backend
+
+
+def stat_etag(stat_result):
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def parse_range_header(header, size):
+    """
+    Parse a ``Range: bytes=...`` header against a file of ``size`` bytes.
+
+    Returns merged, sorted ``(first, last)`` pairs (inclusive), an empty list
+    when no range is satisfiable, or None when the header should be ignored
+    because it is missing, malformed or asks for too many ranges.
+    """
+    if not header:
+        return None
+    units, _, spec = header.partition('=')
+    if units.strip().lower() != 'bytes':
+        return None
+
+    ranges = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        start, dash, end = part.partition('-')
+        if not dash:
+            return None
+        start, end = start.strip(), end.strip()
+        try:
+            if start:
+                first = int(start)
+                last = int(end) if end else size - 1
+                if last < first:
+                    return None
+                if first >= size:
+                    continue
+                last = min(last, size - 1)
+            else:
+                suffix = int(end)
+                if suffix <= 0:
+                    continue
+                first, last = max(0, size - suffix), size - 1
+        except ValueError:
+            return None
+        ranges.append((first, last))
+
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        # If-Range uses strong comparison, so weak validators never match.
+        return not if_range.startswith('W/') and if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+class RangeFile:
+    """
+    File wrapper that reads ``length`` bytes from the current position.
+
+    ``fileno()`` stays available so a WSGI server's ``wsgi.file_wrapper`` can
+    still use ``os.sendfile``; servers such as gunicorn bound it by the
+    response's Content-Length.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def _multipart_ranges(path, ranges, size, content_type, boundary):
+    with open(path, 'rb') as file:
+        for first, last in ranges:
+            yield (
+                f'--{boundary}\r\nContent-Type: {content_type}\r\n'
+                f'Content-Range: bytes {first}-{last}/{size}\r\n\r\n'
+            ).encode('ascii')
+            file.seek(first)
+            remaining = last - first + 1
+            while remaining > 0:
+                chunk = file.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+            yield b'\r\n'
+        yield f'--{boundary}--\r\n'.encode('ascii')
+
+
+def _multipart_length(ranges, size, content_type, boundary):
+    length = len(f'--{boundary}--\r\n')
+    for first, last in ranges:
+        length += len(
+            f'--{boundary}\r\nContent-Type: {content_type}\r\n'
+            f'Content-Range: bytes {first}-{last}/{size}\r\n\r\n'
+        ) + (last - first + 1) + 2
+    return length
+
+
+def _django_response(request, path, stat_result, content_type, as_attachment, filename, etag, last_modified):
+    size = stat_result.st_size
+    ranges = None
+    if request.method == 'GET' and _if_range_matches(request, etag, last_modified):
+        ranges = parse_range_header(request.headers.get('Range'), size)
+
+    if ranges == []:
+        response = HttpResponse(status=416)
+        response.headers['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if ranges is None:
+        return FileResponse(open(path, 'rb'), as_attachment=as_attachment, filename=filename or '',
+                            content_type=content_type)
+
+    if len(ranges) == 1:
+        first, last = ranges[0]
+        file = open(path, 'rb')
+        file.seek(first)
+        response = FileResponse(RangeFile(file, last - first + 1), status=206, as_attachment=as_attachment,
+                                filename=filename or os.path.basename(path), content_type=content_type)
+        response.headers['Content-Range'] = f'bytes {first}-{last}/{size}'
+        response.headers['Content-Length'] = str(last - first + 1)
+        return response
+
+    boundary = secrets.token_hex(16)
+    response = StreamingHttpResponse(
+        _multipart_ranges(path, ranges, size, content_type, boundary),
+        status=206, content_type=f'multipart/byteranges; boundary={boundary}',
+    )
+    response.headers['Content-Length'] = str(_multipart_length(ranges, size, content_type, boundary))
+    disposition = content_disposition_header(as_attachment, filename) if filename else None
+    if disposition:
+        response.headers['Content-Disposition'] = disposition
+    return response
+
+
+def _offload_response(content_type, as_attachment, filename):
+    response = HttpResponse(content_type=content_type)
+    disposition = content_disposition_header(as_attachment, filename) if filename else None
+    if disposition:
+        response.headers['Content-Disposition'] = disposition
+    return response
+
+
+def x_accel_uri(path):
+    """Map a file under MEDIA_ROOT to nginx's internal location for it."""
+    media_root = os.path.realpath(settings.MEDIA_ROOT)
+    relative = os.path.relpath(os.path.realpath(path), media_root)
+    if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+        raise ImproperlyConfigured(f'{path} is outside MEDIA_ROOT and cannot be served through X-Accel-Redirect')
+    prefix = getattr(settings, 'PORTFOLIO_X_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+    return prefix.rstrip('/') + '/' + quote(relative.replace(os.sep, '/'))
+
+
+def serve_file(request, path, content_type=None, as_attachment=False, filename=None, etag=None):
+    """
+    Return a response that sends the file at ``path``.
+
+    With the 'django' backend the worker streams the file itself, honouring
+    Range and If-Range with 206 responses. The offload backends answer with
+    headers only and let the front proxy send the bytes (and handle ranges):
+    nginx via X-Accel-Redirect, Apache/lighttpd via X-Sendfile.
+
+    ETag (``etag`` or one derived from the file's size and mtime) and
+    Last-Modified are always set, and matching conditional requests get a 304.
+    """
+    stat_result = os.stat(path)
+    etag = etag or stat_etag(stat_result)
+    last_modified = int(stat_result.st_mtime)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        guessed_type, encoding = mimetypes.guess_type(path)
+        content_type = content_type or ENCODED_CONTENT_TYPES.get(encoding, guessed_type) or 'application/octet-stream'
+        backend = get_backend()
+
+        if backend == DJANGO:
+            response = _django_response(
+                request, path, stat_result, content_type, as_attachment, filename, etag, last_modified
+            )
+        else:
+            response = _offload_response(content_type, as_attachment, filename)
+            if backend == X_ACCEL_REDIRECT:
+                response.headers['X-Accel-Redirect'] = x_accel_uri(path)
+            else:
+                response.headers['X-Sendfile'] = os.path.realpath(path)
+
+    response.headers['ETag'] = etag
+    response.headers['Last-Modified'] = http_date(last_modified)
+    response.headers['Accept-Ranges'] = 'bytes'
+    return response
+
+
+async def astream(iterator):
+    """Yield from a blocking iterator, reading each chunk in a worker thread."""
+    iterator = iter(iterator)
+    read = sync_to_async(next, thread_sensitive=False)
+    while (chunk := await read(iterator, None)) is not None:
+        yield chunk
+
+
+async def aserve_file(request, path, **kwargs):
+    """
+    ``serve_file`` for async views.
+
+    The stat and open run in a worker thread and the body is re-wrapped as
+    an async iterator, so ASGI servers stream it without Django's warning
+    about consuming a synchronous iterator on the event loop.
+    """
+    response = await sync_to_async(serve_file, thread_sensitive=False)(request, path, **kwargs)
+    if response.streaming and not response.is_async:
+        response.streaming_content = astream(response.streaming_content)
+    return response
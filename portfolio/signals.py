@@ -0,0 +1,94 @@
+import contextlib
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import facets, sitemaps
+from .cache import bump_content_version, invalidate_site_settings
+from .models import Hero, About, TeamSection, TeamMember, Service, Technology, PortfolioItem, ContactInfo, SiteSetting
+
+HOMEPAGE_MODELS = (Hero, About, TeamSection, TeamMember, Service, Technology, PortfolioItem, ContactInfo, SiteSetting)
+
+_suspended = ContextVar('portfolio_signals_suspended', default=False)
+
+
+@contextlib.contextmanager
+def suspended():
+    """
+    Skip the receivers below, e.g. while bulk-deleting thousands of rows.
+
+    The caller then has to do their work itself: rebuild the facets, bump
+    the content version, mark the sitemaps stale and, if site settings
+    changed, invalidate them.
+    """
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+def content_changed(sender, **kwargs):
+    if _suspended.get():
+        return
+    bump_content_version()
+    # The homepage's lastmod follows every change; item pages only their own.
+    sections = ('static', 'portfolio') if sender is PortfolioItem else ('static',)
+    transaction.on_commit(lambda: sitemaps.mark_stale(*sections))
+
+
+for model in HOMEPAGE_MODELS:
+    post_save.connect(content_changed, sender=model, dispatch_uid=f'portfolio_save_{model.__name__}')
+    post_delete.connect(content_changed, sender=model, dispatch_uid=f'portfolio_delete_{model.__name__}')
+
+
+@receiver(m2m_changed, sender=PortfolioItem.technologies.through, dispatch_uid='portfolio_technologies_changed')
+def technologies_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if _suspended.get():
+        return
+    if action == 'pre_clear' and not reverse:
+        # Once cleared the item no longer knows which facets listed it.
+        instance._cleared_technology_ids = list(instance.technologies.values_list('pk', flat=True))
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        facets.rebuild([instance.pk])
+    elif action == 'post_clear':
+        facets.rebuild(getattr(instance, '_cleared_technology_ids', []))
+    else:
+        facets.rebuild(pk_set)
+    bump_content_version()
+    transaction.on_commit(lambda: sitemaps.mark_stale('static'))
+
+
+@receiver(post_save, sender=PortfolioItem, dispatch_uid='portfolio_item_facets_saved')
+def portfolio_item_saved(sender, instance, created, raw=False, **kwargs):
+    if _suspended.get():
+        return
+    # A new item has no technologies yet; m2m_changed covers adding them.
+    if not created and not raw:
+        facets.rebuild(instance.technologies.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=PortfolioItem, dispatch_uid='portfolio_item_facets_deleting')
+def portfolio_item_deleting(sender, instance, **kwargs):
+    if _suspended.get():
+        return
+    instance._deleted_technology_ids = list(instance.technologies.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=PortfolioItem, dispatch_uid='portfolio_item_facets_deleted')
+def portfolio_item_deleted(sender, instance, **kwargs):
+    if _suspended.get():
+        return
+    facets.rebuild(getattr(instance, '_deleted_technology_ids', []))
+
+
+@receiver(post_save, sender=SiteSetting, dispatch_uid='portfolio_site_settings_saved')
+@receiver(post_delete, sender=SiteSetting, dispatch_uid='portfolio_site_settings_deleted')
+def site_settings_changed(sender, **kwargs):
+    if _suspended.get():
+        return
+    invalidate_site_settings()
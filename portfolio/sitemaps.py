@@ -1,39 +1,213 @@
-from django.contrib.sitemaps import Sitemap
+"""
+Sitemaps written to static files instead of built on every request.
+
+Each section goes to its own ``sitemap-<section>.xml`` (split every
+``LIMIT`` URLs) in PORTFOLIO_SITEMAP_DIR, next to gzip and, with the Brotli
+package installed, brotli copies. ``sitemap.xml`` indexes them with each
+section's lastmod. Content signals mark the affected sections stale after
+commit; the next sitemap request, or ``manage.py build_sitemaps``, rewrites
+only those sections and the index.
+"""
+import contextlib
+import gzip
+import json
+import os
+from datetime import datetime
+
+from django.conf import settings
+from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils import translation
 
+from .cache import get_content_version
+from .locks import file_lock
 from .models import PortfolioItem
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+INDEX_NAME = 'sitemap.xml'
+STATE_NAME = 'sections.json'
+# The most URLs a single sitemap file may list.
+LIMIT = 50000
+# Reversed once per language, then replaced with each object's id.
+SENTINEL = '9876543210'
+# Precompressed copies, by Content-Encoding, in order of preference.
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+
+
+def sitemap_dir():
+    return str(getattr(settings, 'PORTFOLIO_SITEMAP_DIR', os.path.join(settings.BASE_DIR, 'sitemaps')))
 
-class StaticViewSitemap(Sitemap):
-    """Sitemap entries for static pages."""
 
-    changefreq = "weekly"
-    priority = 1.0
-    i18n = True
+def base_url():
+    return getattr(settings, 'PORTFOLIO_SITE_URL', 'https://skypardaz.ir').rstrip('/')
 
-    def items(self):
-        return ["portfolio:index"]
 
-    def location(self, item):
-        return reverse(item)
+def _locations(url_name, kwarg=None):
+    """Reverse ``url_name`` once per language, with SENTINEL standing in for ``kwarg``."""
+    patterns = {}
+    for code, _name in settings.LANGUAGES:
+        with translation.override(code):
+            patterns[code] = base_url() + reverse(url_name, kwargs={kwarg: SENTINEL} if kwarg else None)
+    return patterns
 
 
-class PortfolioItemSitemap(Sitemap):
-    """Sitemap entries for individual portfolio items."""
+def _urlset(rows, patterns, changefreq, priority):
+    """Yield one URL per ``(value, lastmod)`` row and language, linking the translations."""
+    for value, lastmod in rows:
+        alternates = [
+            {'lang_code': code, 'location': pattern.replace(SENTINEL, str(value))}
+            for code, pattern in patterns.items()
+        ]
+        for alternate in alternates:
+            yield {
+                'location': alternate['location'],
+                'lastmod': lastmod,
+                'changefreq': changefreq,
+                'priority': priority,
+                'alternates': alternates,
+            }
 
-    changefreq = "monthly"
-    priority = 0.8
-    i18n = True
 
-    def items(self):
-        return PortfolioItem.objects.filter(is_active=True)
+def static_section():
+    # The homepage shows all public content, so it changes with the content version.
+    _, updated_at = get_content_version()
+    return _urlset([(None, updated_at)], _locations('portfolio:index'), 'weekly', '1.0')
 
-    def location(self, obj):
-        return reverse("portfolio:view", kwargs={"portfolio_id": obj.pk})
 
+def portfolio_section():
+    rows = PortfolioItem.objects.filter(is_active=True).order_by('order', 'id').values_list('pk', 'updated_at')
+    return _urlset(rows.iterator(), _locations('portfolio:view', 'portfolio_id'), 'monthly', '0.8')
 
-sitemaps = {
-    "static": StaticViewSitemap,
-    "portfolio": PortfolioItemSitemap,
+
+SECTIONS = {
+    'static': static_section,
+    'portfolio': portfolio_section,
 }
 
+
+def _path(name):
+    return os.path.join(sitemap_dir(), name)
+
+
+def _stale_marker(section):
+    return _path(f'.stale-{section}')
+
+
+def _write_atomic(name, data):
+    temp = _path(f'.{name}.tmp')
+    with open(temp, 'wb') as file:
+        file.write(data)
+    os.replace(temp, _path(name))
+
+
+def _write_sitemap(name, content):
+    data = content.encode('utf-8')
+    # Compressed copies first, so a served .xml never lacks its variants.
+    _write_atomic(name + ENCODINGS['gzip'], gzip.compress(data, mtime=0))
+    if brotli is not None:
+        _write_atomic(name + ENCODINGS['br'], brotli.compress(data))
+    _write_atomic(name, data)
+
+
+def _remove_sitemap(name):
+    for suffix in ('', *ENCODINGS.values()):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(_path(name + suffix))
+
+
+def _read_state():
+    try:
+        with open(_path(STATE_NAME), encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def _stale_sections(state):
+    return [name for name in SECTIONS if name not in state or os.path.exists(_stale_marker(name))]
+
+
+def build_section(section, state):
+    """Write ``section``'s sitemap files and record them and their lastmod in ``state``."""
+    # Cleared before reading, so changes committed meanwhile mark it again.
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(_stale_marker(section))
+
+    files = []
+    lastmod = None
+    urls = []
+
+    def flush():
+        name = f'sitemap-{section}.xml' if not files else f'sitemap-{section}-{len(files) + 1}.xml'
+        _write_sitemap(name, render_to_string('sitemap.xml', {'urlset': urls}))
+        files.append(name)
+
+    for url in SECTIONS[section]():
+        urls.append(url)
+        if url['lastmod'] and (lastmod is None or url['lastmod'] > lastmod):
+            lastmod = url['lastmod']
+        if len(urls) == LIMIT:
+            flush()
+            urls = []
+    if urls or not files:
+        flush()
+
+    for name in set(state.get(section, {}).get('files', [])) - set(files):
+        _remove_sitemap(name)
+    state[section] = {'files': files, 'lastmod': lastmod.isoformat() if lastmod else None}
+
+
+def build_index(state):
+    entries = [
+        {
+            'location': f'{base_url()}/{name}',
+            'last_mod': datetime.fromisoformat(info['lastmod']) if info['lastmod'] else None,
+        }
+        for section, info in state.items() if section in SECTIONS
+        for name in info['files']
+    ]
+    _write_sitemap(INDEX_NAME, render_to_string('sitemap_index.xml', {'sitemaps': entries}))
+
+
+def ensure_current(force=False):
+    """Rewrite missing or stale sections (every section with ``force``); return their names."""
+    if not force and not _stale_sections(_read_state()) and os.path.exists(_path(INDEX_NAME)):
+        return []
+    with file_lock(_path('.lock')):
+        # Another process may have rebuilt them while this one waited.
+        state = _read_state()
+        stale = list(SECTIONS) if force else _stale_sections(state)
+        for section in stale:
+            build_section(section, state)
+        if stale or not os.path.exists(_path(INDEX_NAME)):
+            build_index(state)
+            _write_atomic(STATE_NAME, json.dumps(state).encode('utf-8'))
+    return stale
+
+
+def mark_stale(*sections):
+    """Have the next request rebuild ``sections``; nothing to do before the first build."""
+    if not os.path.isdir(sitemap_dir()):
+        return
+    for section in sections:
+        with open(_stale_marker(section), 'a'):
+            pass
+
+
+def find(name, accept_encoding=''):
+    """
+    Return ``(path, encoding)`` of the best copy of sitemap ``name`` for a
+    client sending ``accept_encoding``, or ``(None, None)``.
+    """
+    if name != INDEX_NAME and not any(name in info['files'] for info in _read_state().values()):
+        return None, None
+    accepted = {part.split(';')[0].strip() for part in accept_encoding.split(',')}
+    for encoding, suffix in ENCODINGS.items():
+        if encoding in accepted and os.path.exists(_path(name + suffix)):
+            return _path(name + suffix), encoding
+    path = _path(name)
+    return (path, None) if os.path.exists(path) else (None, None)
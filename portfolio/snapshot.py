@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.utils import translation
+
+from .models import Hero, About, TeamSection, TeamMember, Service, ContactInfo
+from .assets import plain_static_urls
+from .facets import active_facets
+from .localization import localize
+from .pagination import page_queryset, split_page
+
+
+def _homepage_querysets():
+    return {
+        'heroes': Hero.objects.filter(is_active=True),
+        'about_items': About.objects.filter(is_active=True),
+        'team_members': TeamMember.objects.filter(is_active=True),
+        'services': Service.objects.filter(is_active=True),
+        # Only the first page; script.js fetches the rest from portfolio:items.
+        'portfolio_items': page_queryset(),
+        'technology_facets': active_facets(),
+        'contact_info': ContactInfo.objects.filter(is_active=True),
+    }
+
+
+def _finish(snapshot, team_section):
+    # Resolve translated fields once; templates read some of them twice.
+    snapshot = {name: localize(objects) for name, objects in snapshot.items()}
+    snapshot['portfolio_items'], snapshot['portfolio_next_cursor'] = split_page(snapshot['portfolio_items'])
+    snapshot['team_section'] = localize([team_section])[0] if team_section else None
+    return snapshot
+
+
+def build_homepage_snapshot():
+    """
+    Load everything the homepage renders in a fixed number of queries.
+
+    Every queryset is evaluated here so the template only iterates over lists,
+    and portfolio technologies are prefetched into ``item.technology_list`` so
+    the grid costs one extra query in total instead of two per item.
+    Translated fields are resolved for the active language, see
+    ``portfolio.localization``.
+    """
+    snapshot = {name: list(queryset) for name, queryset in _homepage_querysets().items()}
+    return _finish(snapshot, TeamSection.objects.filter(is_active=True).first())
+
+
+async def abuild_homepage_snapshot():
+    """``build_homepage_snapshot`` using the async ORM."""
+    snapshot = {name: [obj async for obj in queryset] for name, queryset in _homepage_querysets().items()}
+    return _finish(snapshot, await TeamSection.objects.filter(is_active=True).afirst())
+
+
+def local_host():
+    """A host ALLOWED_HOSTS accepts, for requests built outside a server."""
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')]
+    return hosts[0] if hosts else 'localhost'
+
+
+def render_homepage(language):
+    """Render the homepage markup in ``language`` without a server or collectstatic."""
+    request = RequestFactory().get('/', headers={'Host': local_host()})
+    with translation.override(language), plain_static_urls():
+        return render_to_string('portfolio/index.html', build_homepage_snapshot(), request=request)
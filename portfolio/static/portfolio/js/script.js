@@ -3,10 +3,42 @@ let scene, camera, renderer, starfield;
 let starsGeometry, starsMaterial, stars;
 let velocities = null;
 
-// Lazy Loading for Backgrounds and Images
-function initLazyLoading() {
-    const lazyBackgrounds = document.querySelectorAll('.lazy-bg[data-bg]');
-    const lazyImages = document.querySelectorAll('img[data-src], img[data-srcset]');
+// Formats the browser can decode, probed once with tiny inline images
+const imageFormatSupport = {};
+['avif', 'webp'].forEach((format) => {
+    const probes = {
+        avif: 'data:image/avif;base64,AAAAIGZ0eXBhdmlmAAAAAGF2aWZtaWYxbWlhZk1BMUIAAADybWV0YQAAAAAAAAAoaGRscgAAAAAAAAAAcGljdAAAAAAAAAAAAAAAAGxpYmF2aWYAAAAADnBpdG0AAAAAAAEAAAAeaWxvYwAAAABEAAABAAEAAAABAAABGgAAAB0AAAAoaWluZgAAAAAAAQAAABppbmZlAgAAAAABAABhdjAxQ29sb3IAAAAAamlwcnAAAABLaXBjbwAAABRpc3BlAAAAAAAAAAIAAAACAAAAEHBpeGkAAAAAAwgICAAAAAxhdjFDgQ0MAAAAABNjb2xybmNseAACAAIAAYAAAAAXaXBtYQAAAAAAAAABAAEEAQKDBAAAACVtZGF0EgAKCBgANogQEAwgMg8f8D///8WfhwB8+ErK42A=',
+        webp: 'data:image/webp;base64,UklGRiIAAABXRUJQVlA4IBYAAAAwAQCdASoBAAEADsD+JaQAA3AAAAAA'
+    };
+    const probe = new Image();
+    probe.onload = () => { imageFormatSupport[format] = probe.width > 0; };
+    probe.onerror = () => { imageFormatSupport[format] = false; };
+    probe.src = probes[format];
+});
+
+// Choose the smallest responsive variant that still covers the element
+function pickBackgroundVariant(element) {
+    const wanted = element.clientWidth * (window.devicePixelRatio || 1);
+    for (const format of ['avif', 'webp']) {
+        const srcset = element.dataset[`bgSrcset${format.charAt(0).toUpperCase()}${format.slice(1)}`];
+        if (!srcset || !imageFormatSupport[format]) {
+            continue;
+        }
+        const candidates = srcset.split(',').map((candidate) => {
+            const [url, width] = candidate.trim().split(/\s+/);
+            return { url, width: parseInt(width, 10) };
+        });
+        const match = candidates.find((candidate) => candidate.width >= wanted);
+        // Past the largest variant the full-size original is the better fit.
+        return match ? match.url : null;
+    }
+    return null;
+}
+
+// Lazy Loading for Backgrounds and Images (within root, for added markup)
+function initLazyLoading(root = document) {
+    const lazyBackgrounds = root.querySelectorAll('.lazy-bg[data-bg]');
+    const lazyImages = root.querySelectorAll('img[data-src], img[data-srcset]');
     if (!lazyBackgrounds.length && !lazyImages.length) {
         return;
     }
@@ -17,7 +49,7 @@ function initLazyLoading() {
     };
 
     const loadBackground = (element) => {
-        const bgUrl = element.dataset.bg;
+        const bgUrl = pickBackgroundVariant(element) || element.dataset.bg;
         if (!bgUrl) {
             return;
         }
@@ -112,6 +144,7 @@ function initThreeJS() {
     
     // Create Starfield
     createStarfield();
+    updateStarfieldForDarkMode(document.body.classList.contains('dark-mode'));
     
     // Lighting (for any future 3D objects)
     const ambientLight = new THREE.AmbientLight(0xEAF2FF, 0.5);
@@ -656,7 +689,7 @@ function initNavigationScroll() {
                 const targetTop = target.getBoundingClientRect().top + window.pageYOffset - offset;
                 window.scrollTo({
                     top: Math.max(0, targetTop),
-                    behavior: 'smooth'
+                    behavior: window.matchMedia('(prefers-reduced-motion: reduce)').matches ? 'auto' : 'smooth'
                 });
             }
         });
@@ -745,16 +778,8 @@ function initDarkMode() {
         body.classList.add('dark-mode');
     }
     
-    // Update starfield for initial dark mode state (with delay to ensure Three.js is ready)
-    const updateStarfield = () => {
-        if (stars && starsMaterial && starsGeometry) {
-            updateStarfieldForDarkMode(body.classList.contains('dark-mode'));
-        } else {
-            // Retry after a short delay if Three.js isn't ready yet
-            setTimeout(updateStarfield, 50);
-        }
-    };
-    updateStarfield();
+    // The starfield may load later (or never); initThreeJS applies the theme itself
+    updateStarfieldForDarkMode(body.classList.contains('dark-mode'));
     
     if (darkModeToggle) {
         darkModeToggle.addEventListener('click', () => {
@@ -802,31 +827,109 @@ function initMobileMenu() {
     }
 }
 
-// Initialize Everything
-window.addEventListener('load', () => {
-    // Initialize Three.js first
-    if (typeof THREE !== 'undefined') {
-        initThreeJS();
-    } else {
-        console.error('Three.js not loaded');
+// Deferred animation libraries. base.html lists their URLs in #motion-config
+// instead of loading them up front: GSAP loads after the page, three.js only
+// once the hero is on screen, and neither for reduced motion or Save-Data.
+function readMotionConfig() {
+    const config = document.getElementById('motion-config');
+    return config ? JSON.parse(config.textContent) : null;
+}
+
+function motionAllowed() {
+    if (window.matchMedia('(prefers-reduced-motion: reduce)').matches) {
+        return false;
     }
-    
-    // Initialize GSAP animations
-    if (typeof gsap !== 'undefined') {
-        // Small delay to ensure ScrollTrigger and ScrollToPlugin are loaded
-        setTimeout(() => {
+    const connection = navigator.connection;
+    return !(connection && connection.saveData);
+}
+
+function supportsWebGL() {
+    try {
+        const canvas = document.createElement('canvas');
+        return !!(window.WebGLRenderingContext &&
+            (canvas.getContext('webgl') || canvas.getContext('experimental-webgl')));
+    } catch (e) {
+        return false;
+    }
+}
+
+function loadScript(src) {
+    return new Promise((resolve, reject) => {
+        const script = document.createElement('script');
+        script.src = src;
+        script.onload = resolve;
+        script.onerror = () => reject(new Error('Failed to load ' + src));
+        document.head.appendChild(script);
+    });
+}
+
+// GSAP plugins need the core loaded first
+function loadScriptsInOrder(sources) {
+    return sources.reduce((chain, src) => chain.then(() => loadScript(src)), Promise.resolve());
+}
+
+function whenInView(element, callback) {
+    if (!element || !('IntersectionObserver' in window)) {
+        callback();
+        return;
+    }
+    const observer = new IntersectionObserver((entries) => {
+        if (entries.some(entry => entry.isIntersecting)) {
+            observer.disconnect();
+            callback();
+        }
+    });
+    observer.observe(element);
+}
+
+// Without GSAP nothing reveals the content hidden for its entrance animations
+function disableMotion() {
+    document.documentElement.classList.add('motion-off');
+}
+
+function initMotion() {
+    const config = readMotionConfig();
+    if (!config) {
+        // PORTFOLIO_MOTION_LOADING = 'eager': the libraries are already loaded
+        if (typeof THREE !== 'undefined') {
+            initThreeJS();
+        }
+        if (typeof gsap !== 'undefined') {
             initGSAPAnimations();
-            initNavigationScroll();
-        }, 150);
-    } else {
-        console.error('GSAP not loaded');
+        } else {
+            disableMotion();
+        }
+        return;
+    }
+    if (!motionAllowed()) {
+        disableMotion();
+        return;
+    }
+    loadScriptsInOrder(config.gsap)
+        .then(initGSAPAnimations)
+        .catch((error) => {
+            console.warn(error.message);
+            disableMotion();
+        });
+    if (supportsWebGL()) {
+        whenInView(document.getElementById('home'), () => {
+            loadScriptsInOrder(config.three)
+                .then(initThreeJS)
+                .catch(error => console.warn(error.message));
+        });
     }
+}
+
+// Initialize Everything
+window.addEventListener('load', () => {
+    // Dark mode first so a starfield created later picks up the theme
+    initDarkMode();
+    
+    // Three.js and GSAP load on demand; see initMotion
+    initMotion();
     
-    // Initialize dark mode (should be called after Three.js to update starfield)
-    // But we need to check if Three.js is ready
-    setTimeout(() => {
-        initDarkMode();
-    }, 100);
+    // Anchor links fall back to native smooth scrolling until GSAP is ready
+    initNavigationScroll();
     
     // Initialize mobile menu
     initMobileMenu();
@@ -839,9 +942,102 @@ window.addEventListener('load', () => {
     
     initNextSectionButton();
     
+    initPortfolioGrid();
+    
     // monitorPerformance(); // Uncomment for performance monitoring
 });
 
+// Portfolio Grid: the homepage renders the first page; further pages and
+// technology filters are fetched from the items endpoint
+function initPortfolioGrid() {
+    const grid = document.querySelector('.portfolio-grid');
+    const button = document.querySelector('.portfolio-more');
+    if (!grid || !button) return;
+    const wrapper = button.parentElement;
+    const filters = document.querySelector('.portfolio-filters');
+    
+    let request = 0;
+    let loading = false;
+    const observer = 'IntersectionObserver' in window
+        ? new IntersectionObserver((entries) => {
+            if (entries.some(entry => entry.isIntersecting)) loadNextPage();
+        }, { rootMargin: '0px 0px 400px 0px' })
+        : null;
+    
+    const setNextPage = (url) => {
+        button.dataset.nextPage = url || '';
+        wrapper.hidden = !url;
+        // Re-observing reports the button again if it is still in view
+        if (observer) {
+            observer.unobserve(button);
+            if (url) observer.observe(button);
+        }
+    };
+    
+    const updateFacets = (facets) => {
+        if (!filters || !facets) return;
+        facets.forEach((facet) => {
+            const filter = filters.querySelector(`[data-technology="${facet.id}"]`);
+            if (!filter) return;
+            filter.querySelector('.portfolio-filter-count').textContent = facet.count;
+            filter.disabled = !facet.count && filter.getAttribute('aria-pressed') !== 'true';
+        });
+    };
+    
+    // replace: show a new filter result instead of appending the next page
+    const load = (url, replace) => {
+        const current = ++request;
+        loading = true;
+        button.disabled = true;
+        fetch(url, { headers: { 'Accept': 'application/json' } })
+            .then((response) => {
+                if (!response.ok) throw new Error('Failed to load ' + url);
+                return response.json();
+            })
+            .then((page) => {
+                // A newer filter choice supersedes this response
+                if (current !== request) return;
+                const template = document.createElement('template');
+                template.innerHTML = page.html;
+                const items = Array.from(template.content.querySelectorAll('.portfolio-item'));
+                if (replace) grid.replaceChildren();
+                grid.append(template.content);
+                initLazyLoading(grid);
+                if (typeof gsap !== 'undefined') {
+                    gsap.to(items, { opacity: 1, y: 0, duration: 0.8, ease: 'power3.out', stagger: 0.1 });
+                }
+                updateFacets(page.facets);
+                setNextPage(page.next);
+            })
+            .catch((error) => console.warn(error.message))
+            .finally(() => {
+                if (current !== request) return;
+                loading = false;
+                button.disabled = false;
+            });
+    };
+    
+    function loadNextPage() {
+        if (!loading && button.dataset.nextPage) load(button.dataset.nextPage, false);
+    }
+    
+    button.addEventListener('click', loadNextPage);
+    setNextPage(button.dataset.nextPage);
+    
+    if (filters) {
+        filters.addEventListener('click', (e) => {
+            const filter = e.target.closest('.portfolio-filter');
+            if (!filter) return;
+            filter.setAttribute('aria-pressed', filter.getAttribute('aria-pressed') === 'true' ? 'false' : 'true');
+            const url = new URL(filters.dataset.filterUrl, window.location.href);
+            filters.querySelectorAll('.portfolio-filter[aria-pressed="true"]').forEach((selected) => {
+                url.searchParams.append('technology', selected.dataset.technology);
+            });
+            load(url.toString(), true);
+        });
+    }
+}
+
 // Contact Form Handler
 function initContactForm() {
     const contactForm = document.getElementById('contactForm');
@@ -0,0 +1,126 @@
+import logging
+
+from django.apps import apps
+from django.db import models
+from django.utils import timezone
+
+from .cache import bump_content_version
+from .images import delete_variants, process_image
+from .models import ImageOptimizationJob
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+
+
+def claim_next_job():
+    """Atomically move the oldest pending job to running and return it."""
+    while True:
+        job = ImageOptimizationJob.objects.filter(status=ImageOptimizationJob.STATUS_PENDING).first()
+        if job is None:
+            return None
+        # Another worker may have claimed it between the read and the update.
+        claimed = ImageOptimizationJob.objects.filter(
+            pk=job.pk, status=ImageOptimizationJob.STATUS_PENDING
+        ).update(status=ImageOptimizationJob.STATUS_RUNNING, started_at=timezone.now(), attempts=job.attempts + 1)
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def requeue_stale_jobs(older_than):
+    """Return jobs left running by a crashed worker to the queue."""
+    cutoff = timezone.now() - older_than
+    return ImageOptimizationJob.objects.filter(
+        status=ImageOptimizationJob.STATUS_RUNNING, started_at__lt=cutoff
+    ).update(status=ImageOptimizationJob.STATUS_PENDING)
+
+
+def _finish(job, status, error=''):
+    job.status = status
+    job.error = error
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at'])
+
+
+def is_referenced(name):
+    """Whether any image field of any portfolio row still holds the file ``name``."""
+    for model in apps.get_app_config('portfolio').get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.ImageField) and model.objects.filter(**{field.name: name}).exists():
+                return True
+    return False
+
+
+def swap_image(instance, field_name, source_name, new_name, manifest):
+    """
+    Point the field at the optimized file if it still holds ``source_name``.
+
+    The guarded UPDATE means an upload that raced the optimization is never
+    overwritten; whichever files lose out are deleted. The original is kept
+    while other rows still use it, as seeded items share their images.
+    Returns True on swap.
+    """
+    model = type(instance)
+    storage = model._meta.get_field(field_name).storage
+    variants_field = f'{field_name}_variants'
+
+    swapped = model.objects.filter(pk=instance.pk, **{field_name: source_name}).update(
+        **{field_name: new_name, variants_field: manifest}
+    )
+    if swapped:
+        if new_name != source_name and not is_referenced(source_name):
+            storage.delete(source_name)
+        delete_variants(storage, getattr(instance, variants_field))
+        bump_content_version()
+    else:
+        if new_name != source_name:
+            storage.delete(new_name)
+        delete_variants(storage, manifest)
+    return bool(swapped)
+
+
+def run_job(job):
+    model = apps.get_model(job.model_label)
+    instance = model.objects.filter(pk=job.object_id).first()
+    if instance is None or getattr(instance, job.field_name).name != job.source_name:
+        # Deleted or re-uploaded since the job was queued; a newer job covers it.
+        _finish(job, ImageOptimizationJob.STATUS_DONE, 'Superseded')
+        return
+
+    try:
+        result = process_image(job.model_label, job.field_name, job.source_name)
+    except FileNotFoundError:
+        # Retrying cannot bring the file back.
+        _finish(job, ImageOptimizationJob.STATUS_FAILED, 'Source file is missing')
+        return
+    if result is None:
+        _finish(job, ImageOptimizationJob.STATUS_DONE, 'Not a decodable image or over the pixel limit')
+        return
+
+    if swap_image(instance, job.field_name, job.source_name, *result):
+        _finish(job, ImageOptimizationJob.STATUS_DONE)
+    else:
+        _finish(job, ImageOptimizationJob.STATUS_DONE, 'Superseded')
+
+
+def run_pending_jobs(limit=None):
+    """Drain the queue, returning the number of jobs processed."""
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        try:
+            run_job(job)
+        except Exception as exc:
+            logger.exception('Image optimization job %s failed', job.pk)
+            if job.attempts < MAX_ATTEMPTS:
+                job.status = ImageOptimizationJob.STATUS_PENDING
+                job.error = str(exc)
+                job.save(update_fields=['status', 'error'])
+            else:
+                _finish(job, ImageOptimizationJob.STATUS_FAILED, str(exc))
+        processed += 1
+    return processed
+
@@ -0,0 +1,43 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+
+from portfolio.assets import MOTION_SCRIPTS, load_manifest
+
+register = template.Library()
+
+
+@register.inclusion_tag('portfolio/_stylesheets.html', takes_context=True)
+def stylesheets(context):
+    """
+    Render the page's fonts and stylesheets.
+
+    Uses the bundle from ``manage.py build_assets`` when one exists, inlining
+    its critical CSS and loading the rest without blocking render. DEBUG
+    always uses the source files so style edits show up without a rebuild.
+    """
+    language = context.get('LANGUAGE_CODE')
+    manifest = None if settings.DEBUG else load_manifest()
+    return {
+        'bundle': (manifest or {}).get(language),
+        'LANGUAGE_CODE': language,
+    }
+
+
+@register.inclusion_tag('portfolio/_motion_scripts.html')
+def motion_scripts():
+    """
+    Render three.js and GSAP, self-hosted when ``build_assets --fetch-scripts`` ran.
+
+    With ``PORTFOLIO_MOTION_LOADING = 'deferred'`` only their URLs are
+    written out and script.js decides whether and when to load them.
+    """
+    vendor = (load_manifest() or {}).get('vendor')
+    if vendor:
+        scripts = {group: [static(path) for path in paths] for group, paths in vendor.items()}
+    else:
+        scripts = MOTION_SCRIPTS
+    return {
+        'deferred': getattr(settings, 'PORTFOLIO_MOTION_LOADING', 'deferred') == 'deferred',
+        'scripts': scripts,
+    }
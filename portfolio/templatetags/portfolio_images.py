@@ -0,0 +1,44 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from portfolio.images import VARIANT_MIME_TYPES, current_variants
+
+register = template.Library()
+
+
+def _srcset(storage, entries):
+    return ', '.join(f"{storage.url(entry['name'])} {entry['width']}w" for entry in entries)
+
+
+@register.simple_tag
+def lazy_bg_attrs(image, manifest):
+    """
+    Render the ``data-bg`` attributes read by script.js for a lazy background.
+
+    ``data-bg`` keeps the full image as the fallback and every modern format
+    gets a ``data-bg-srcset-<format>`` candidate list to pick from by width.
+    """
+    if not image:
+        return ''
+    variants = current_variants(image, manifest)
+    return format_html(
+        ' data-bg="{}"{}',
+        image.url,
+        format_html_join('', ' data-bg-srcset-{}="{}"', (
+            (fmt, _srcset(image.storage, entries)) for fmt, entries in variants.items() if entries
+        )),
+    )
+
+
+@register.simple_tag
+def responsive_picture(image, manifest, sizes, alt='', loading='lazy'):
+    """Render a ``<picture>`` with one ``<source>`` per available variant format."""
+    variants = current_variants(image, manifest)
+    sources = format_html_join('', '<source type="{}" srcset="{}" sizes="{}">', (
+        (VARIANT_MIME_TYPES[fmt], _srcset(image.storage, entries), sizes)
+        for fmt, entries in variants.items() if entries
+    ))
+    return format_html(
+        '<picture>{}<img src="{}" loading="{}" alt="{}"></picture>',
+        sources, image.url, loading, alt,
+    )
@@ -1,3 +1,1411 @@
-from django.test import TestCase
+import csv
+import gzip
+import importlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+import zipfile
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError, connection
+from django.db.models import F
+from django.template import RequestContext, Template
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches, resolve, reverse
+from django.utils.translation import override as translation_override
+from modeltranslation.translator import translator
+from PIL import Image
+
+from .cache import CSRF_PLACEHOLDER
+from .localization import localize
+from .images import process_image, variant_formats
+from .tasks import swap_image
+from . import assets
+from . import cache as page_cache
+from . import benchmarks, contact_spool, offline, pagination, ratelimit, seeding, sitemaps, views
+from .models import (
+    About, ContactMessage, ContentVersion, Hero, ImageOptimizationJob, PortfolioItem, Service, SiteSetting, TeamMember, Technology,
+    TechnologyFacet,
+)
+
+# Tests run without collectstatic, so there is no manifest to hash URLs with.
+static_override = assets.plain_static_urls()
+
+
+def setUpModule():
+    static_override.enable()
+
+
+def tearDownModule():
+    static_override.disable()
+
+
+def make_image(size=(64, 64), fmt='JPEG', mode='RGB', name='photo.jpg'):
+    buffer = BytesIO()
+    Image.new(mode, size, color='red').save(buffer, format=fmt)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=f'image/{fmt.lower()}')
+
+
+class MediaRootMixin:
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+
+class HomepageSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Hero.objects.create(title_en='Welcome', title_fa='خوش آمدید')
+        cls.technologies = [Technology.objects.create(name=f'Tech {i}', order=i) for i in range(3)]
+
+    def setUp(self):
+        cache.clear()
+
+    def add_items(self, count):
+        for i in range(count):
+            item = PortfolioItem.objects.create(title_en=f'Item {i}', url='https://example.com', order=i)
+            item.technologies.set(self.technologies)
+
+    def count_index_queries(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('portfolio:index'))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    @override_settings(PORTFOLIO_GRID_PAGE_SIZE=100)
+    def test_query_count_is_constant(self):
+        self.add_items(2)
+        baseline, _ = self.count_index_queries()
+
+        self.add_items(58)
+        queries, response = self.count_index_queries()
+
+        self.assertEqual(queries, baseline)
+        self.assertEqual(len(response.context['portfolio_items']), 60)
+        self.assertContains(response, 'portfolio-tech-tag">Tech 2<', count=60)
+
+    @override_settings(PORTFOLIO_GRID_PAGE_SIZE=5)
+    def test_homepage_renders_first_page(self):
+        self.add_items(7)
+        _, response = self.count_index_queries()
+        self.assertEqual(len(response.context['portfolio_items']), 5)
+        self.assertContains(response, 'data-next-page="/en/portfolio/items/?cursor=4.')
+
+
+
+
+class LocalizationTests(TestCase):
+    def test_localized_values_match_modeltranslation(self):
+        objects = [
+            PortfolioItem(title_en='Shop', title_fa='فروشگاه', description_en='', description_fa='توضیح'),
+            PortfolioItem(title_en=None, title_fa='فقط فارسی', description_en=None, description_fa=None),
+            TeamMember(name_en='Sara', name_fa='سارا', role_en='Designer', bio_fa='بیو'),
+        ]
+        for language in ('en', 'fa'):
+            with translation_override(language):
+                for obj, localized in zip(objects, localize(objects)):
+                    for field in translator.get_options_for_model(type(obj)).fields:
+                        self.assertEqual(localized.__dict__[field], getattr(obj, field), (language, field))
+                    self.assertEqual(str(localized), str(obj))
+
+    def test_unregistered_models_pass_through(self):
+        technology = Technology(name='Django')
+        self.assertIs(localize([technology])[0], technology)
+
+    def test_deferred_fields_are_loaded(self):
+        PortfolioItem.objects.create(title_en='Shop', title_fa='فروشگاه', url='https://example.com')
+        item = PortfolioItem.objects.defer('title_fa').get()
+        with translation_override('fa'):
+            self.assertEqual(localize([item])[0].title, 'فروشگاه')
+
+    def test_str_prefers_english_without_touching_descriptors(self):
+        self.assertEqual(str(Hero(title_en='', title_fa='سلام')), 'سلام')
+        self.assertEqual(str(TeamMember(name_en='Sara', name_fa='سارا')), 'Sara')
+
+class TranslationTransferTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.items = [
+            PortfolioItem.objects.create(title_en=f'Item {i}', title_fa=f'نمونه {i}', url='https://example.com')
+            for i in range(30)
+        ]
+
+    def path(self, name):
+        return os.path.join(self.tmp, name)
+
+    def test_round_trip_in_bounded_queries(self):
+        previous = 'Item'
+        for format in ('jsonl', 'csv'):
+            path = self.path(f'all.{format}')
+            call_command('export_translations', '--format', format, '--output', path, stderr=StringIO())
+            with open(path, encoding='utf-8') as file:
+                content = file.read().replace(previous, f'Piece {format}')
+            previous = f'Piece {format}'
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(content)
+
+            with CaptureQueriesContext(connection) as queries:
+                call_command('import_translations', path, '--batch-size', '10', stdout=StringIO())
+            # Existence checks, then one executemany per batch of ten; not one query per row.
+            self.assertLess(len(queries), 20)
+            self.items[5].refresh_from_db()
+            self.assertEqual(self.items[5].title_en, f'Piece {format} 5')
+            self.assertEqual(self.items[5].title_fa, 'نمونه 5')
+
+    def test_po_imports_the_target_language(self):
+        path = self.path('fa.po')
+        call_command('export_translations', '--format', 'po', '--output', path, stderr=StringIO())
+        with open(path, encoding='utf-8') as file:
+            content = file.read()
+        self.assertIn('msgctxt "portfolio.portfolioitem:%d:title"\nmsgid "Item 0"\nmsgstr "نمونه 0"' % self.items[0].pk, content)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content.replace('msgstr "نمونه 0"', 'msgstr ""\n"خط اول\\n"\n"خط دوم"'))
+
+        call_command('import_translations', path, '--language', 'fa', '--allow-missing', stdout=StringIO())
+        self.items[0].refresh_from_db()
+        self.assertEqual(self.items[0].title_fa, 'خط اول\nخط دوم')
+        self.assertEqual(self.items[0].title_en, 'Item 0')
+
+    def test_csv_round_trip_keeps_untranslated_fields_null(self):
+        item = PortfolioItem.objects.create(title_en=None, title_fa='فقط فارسی', description_en='Line one\nLine two')
+        path = self.path('all.csv')
+        call_command('export_translations', '--format', 'csv', '--output', path, stderr=StringIO())
+        call_command('import_translations', path, stdout=StringIO())
+        item.refresh_from_db()
+        self.assertIsNone(item.title_en)
+        self.assertEqual(item.description_en, 'Line one\nLine two')
+        with translation_override('en'):
+            self.assertEqual(item.title, 'فقط فارسی')
+
+    def test_csv_errors_count_multiline_cells(self):
+        path = self.path('broken.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['model', 'id', 'field', 'en', 'fa'])
+            writer.writerow(['portfolio.portfolioitem', self.items[0].pk, 'description', 'One\nTwo\nThree', 'یک'])
+            writer.writerow(['portfolio.nothing', 1, 'title', 'x', 'y'])
+
+        stderr = StringIO()
+        with self.assertRaisesMessage(CommandError, 'nothing was imported'):
+            call_command('import_translations', path, stdout=StringIO(), stderr=stderr)
+        self.assertIn("line 5: unknown model 'portfolio.nothing'", stderr.getvalue())
+
+    def test_missing_languages_reject_the_whole_file(self):
+        path = self.path('broken.jsonl')
+        rows = [
+            {'model': 'portfolio.portfolioitem', 'id': self.items[0].pk, 'field': 'title', 'en': 'New', 'fa': 'جدید'},
+            {'model': 'portfolio.portfolioitem', 'id': self.items[1].pk, 'field': 'title', 'en': 'Only English'},
+            {'model': 'portfolio.portfolioitem', 'id': 0, 'field': 'title', 'en': 'Gone', 'fa': 'رفته'},
+        ]
+        with open(path, 'w', encoding='utf-8') as file:
+            file.writelines(json.dumps(row) + '\n' for row in rows)
+
+        stderr = StringIO()
+        with self.assertRaisesMessage(CommandError, 'nothing was imported'):
+            call_command('import_translations', path, stdout=StringIO(), stderr=stderr)
+        self.assertIn('is missing fa', stderr.getvalue())
+        self.assertIn('portfolio.portfolioitem:0 does not exist', stderr.getvalue())
+        self.items[0].refresh_from_db()
+        self.assertEqual(self.items[0].title_en, 'Item 0')
+
+    def test_malformed_rows_are_reported_by_line(self):
+        path = self.path('malformed.jsonl')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('[]\n"x"\n')
+            file.write(json.dumps({'model': ['portfolio.portfolioitem'], 'id': 1, 'field': 'title'}) + '\n')
+            file.write(json.dumps({'model': 'portfolio.portfolioitem', 'id': self.items[0].pk, 'field': 'title', 'en': 'New', 'fa': 5}) + '\n')
+
+        stderr = StringIO()
+        with self.assertRaisesMessage(CommandError, 'nothing was imported'):
+            call_command('import_translations', path, stdout=StringIO(), stderr=stderr)
+        self.assertIn('line 1: expected an object, got list', stderr.getvalue())
+        self.assertIn('line 2: expected an object, got str', stderr.getvalue())
+        self.assertIn("line 3: unknown model ['portfolio.portfolioitem']", stderr.getvalue())
+        self.assertIn(f'line 4: portfolio.portfolioitem:{self.items[0].pk}:title [fa] is not a string', stderr.getvalue())
+
+
+class SeedDataTests(MediaRootMixin, TestCase):
+    def test_scale_generates_a_reproducible_dataset(self):
+        with CaptureQueriesContext(connection) as queries:
+            call_command('seed_data', '--scale', '120', '--seed', '7', '--batch-size', '50', stdout=StringIO())
+        sizes = seeding.sizes(120)
+        self.assertEqual(PortfolioItem.objects.count(), 120)
+        self.assertEqual(Technology.objects.count(), sizes['technologies'])
+        self.assertEqual(TeamMember.objects.count(), sizes['team_members'])
+        self.assertEqual(ContactMessage.objects.count(), sizes['contact_messages'])
+        # Batched inserts, not a query per row.
+        self.assertLess(len(queries), 150)
+        self.assertEqual(
+            TechnologyFacet.objects.filter(item_count__gt=0).count(),
+            Technology.objects.filter(portfolioitem__is_active=True).distinct().count(),
+        )
+
+        first = list(PortfolioItem.objects.order_by('order').values_list('title_en', 'title_fa', 'is_active'))
+        seeding.generate(120, seed=7)
+        self.assertEqual(list(PortfolioItem.objects.order_by('order').values_list('title_en', 'title_fa', 'is_active')), first)
+        seeding.generate(120, seed=8)
+        self.assertNotEqual(list(PortfolioItem.objects.order_by('order').values_list('title_en', 'title_fa', 'is_active')), first)
+
+    def test_real_contact_messages_are_kept(self):
+        real = ContactMessage.objects.create(name='Visitor', email='visitor@example.com', subject='Hi', message='Hello')
+        seeding.generate(10, seed=1)
+        seeding.generate(10, seed=2)
+        self.assertTrue(ContactMessage.objects.filter(pk=real.pk).exists())
+        self.assertEqual(ContactMessage.objects.count(), seeding.sizes(10)['contact_messages'] + 1)
+
+    def test_placeholder_media(self):
+        seeding.generate(10, seed=1, media=True)
+        item = PortfolioItem.objects.exclude(image='').first()
+        self.assertTrue(os.path.exists(item.image.path))
+        offline = PortfolioItem.objects.filter(portfolio_type='offline').first()
+        self.assertTrue(zipfile.is_zipfile(offline.offline_file.path))
+
+
+class BenchmarkSuiteTests(TestCase):
+    def test_every_case_is_measured(self):
+        results = benchmarks.run([40], rounds=2, warmup=1)
+        self.assertEqual([result['case'] for result in results], list(benchmarks.CASES))
+        for result in results:
+            self.assertEqual(result['unexpected_statuses'], 0, result['case'])
+            self.assertLessEqual(result['min_ms'], result['p50_ms'])
+            self.assertLessEqual(result['p50_ms'], result['max_ms'])
+            self.assertGreater(result['peak_memory_kib'], 0)
+        by_case = {result['case']: result for result in results}
+        self.assertEqual(by_case['portfolio_online']['queries'], 1)
+
+    def test_compare_flags_slower_medians_and_extra_queries(self):
+        baseline = [
+            {'size': 10, 'case': 'index_en', 'p50_ms': 2.0, 'queries': 3},
+            {'size': 10, 'case': 'sitemap', 'p50_ms': 1.0, 'queries': 0},
+        ]
+        current = [
+            {'size': 10, 'case': 'index_en', 'p50_ms': 2.2, 'queries': 4},
+            {'size': 10, 'case': 'sitemap', 'p50_ms': 1.5, 'queries': 0},
+            {'size': 1000, 'case': 'sitemap', 'p50_ms': 9.0, 'queries': 0},
+        ]
+        regressions = benchmarks.compare(baseline, current, threshold=0.2)
+        self.assertEqual(
+            [(regression['case'], regression['metric']) for regression in regressions],
+            [('index_en', 'queries'), ('sitemap', 'p50_ms')],
+        )
+
+
+@override_settings(PORTFOLIO_GRID_PAGE_SIZE=2)
+class TechnologyFacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.django = Technology.objects.create(name='Django', order=0)
+        self.vue = Technology.objects.create(name='Vue', order=1)
+        self.items = [
+            PortfolioItem.objects.create(title_en=f'Item {i}', url='https://example.com', order=i) for i in range(4)
+        ]
+        for item in self.items:
+            item.technologies.add(self.django)
+        self.items[1].technologies.add(self.vue)
+        self.items[3].technologies.add(self.vue)
+        with translation_override('en'):
+            self.url = reverse('portfolio:items')
+
+    def facet(self, technology):
+        return TechnologyFacet.objects.get(technology=technology)
+
+    def titles(self, response):
+        return re.findall(r'portfolio-title">([^<]+)<', response.json()['html'])
+
+    def test_signals_keep_facets_current(self):
+        self.assertEqual(self.facet(self.vue).items, [[1, self.items[1].pk], [3, self.items[3].pk]])
+
+        self.items[1].technologies.remove(self.vue)
+        self.assertEqual(self.facet(self.vue).item_count, 1)
+        self.vue.portfolioitem_set.add(self.items[0])
+        self.assertEqual(self.facet(self.vue).item_count, 2)
+
+        self.items[0].is_active = False
+        self.items[0].save()
+        self.assertEqual(self.facet(self.vue).item_count, 1)
+        self.items[3].technologies.clear()
+        self.assertEqual(self.facet(self.vue).item_count, 0)
+        self.items[2].delete()
+        self.assertEqual(self.facet(self.django).items, [[1, self.items[1].pk]])
+
+    def test_filter_returns_matching_items_and_facet_counts(self):
+        cache.clear()
+        page_cache.get_content_version()
+        # Facets, items and their technologies; no GROUP BY over the m2m table.
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {'technology': [self.django.pk, self.vue.pk]})
+        self.assertEqual(len(ctx.captured_queries), 3)
+        self.assertFalse(any('GROUP BY' in query['sql'] for query in ctx.captured_queries))
+        self.assertEqual(self.titles(response), ['Item 1', 'Item 3'])
+        self.assertIsNone(response.json()['next'])
+        self.assertEqual(
+            response.json()['facets'],
+            [{'id': self.django.pk, 'name': 'Django', 'count': 2}, {'id': self.vue.pk, 'name': 'Vue', 'count': 2}],
+        )
+
+        response = self.client.get(self.url, {'technology': self.django.pk})
+        self.assertEqual(self.titles(response), ['Item 0', 'Item 1'])
+        response = self.client.get(response.json()['next'])
+        self.assertEqual(self.titles(response), ['Item 2', 'Item 3'])
+
+        response = self.client.get(self.url, {'technology': [self.vue.pk, 0], 'match': 'any'})
+        self.assertEqual(self.titles(response), ['Item 1', 'Item 3'])
+        self.assertEqual(self.client.get(self.url, {'technology': 'vue'}).status_code, 400)
+
+    def test_homepage_lists_filters(self):
+        with translation_override('en'):
+            response = self.client.get(reverse('portfolio:index'))
+        self.assertContains(response, f'data-technology="{self.vue.pk}"')
+        self.assertEqual([facet.item_count for facet in response.context['technology_facets']], [4, 2])
+
+@override_settings(PORTFOLIO_GRID_PAGE_SIZE=3)
+class PortfolioPagingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        technology = Technology.objects.create(name='Django')
+        # Equal orders make sure the id tie-break neither skips nor repeats items.
+        cls.items = [
+            PortfolioItem.objects.create(title_en=f'Item {i}', url='https://example.com', order=i // 2)
+            for i in range(8)
+        ]
+        for item in cls.items:
+            item.technologies.add(technology)
+        PortfolioItem.objects.create(title_en='Hidden', url='https://example.com', is_active=False)
+        with translation_override('en'):
+            cls.url = reverse('portfolio:items')
+
+    def setUp(self):
+        cache.clear()
+        page_cache.get_content_version()
+
+    def test_pages_cover_every_active_item_once(self):
+        seen = []
+        url = f'{self.url}?cursor={pagination.encode_cursor(self.items[2])}'
+        while url:
+            # Facets, the page and its technologies.
+            with self.assertNumQueries(3):
+                response = self.client.get(url)
+            page = response.json()
+            seen += re.findall(r'portfolio-title">([^<]+)<', page['html'])
+            self.assertIn('Django', page['html'])
+            url = page['next']
+        self.assertEqual(seen, [f'Item {i}' for i in range(3, 8)])
+
+    def test_invalid_cursor_is_rejected(self):
+        self.assertEqual(self.client.get(self.url, {'cursor': 'abc'}).status_code, 400)
+
+    def test_unchanged_page_is_not_modified(self):
+        response = self.client.get(self.url)
+        response = self.client.get(self.url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_deep_page_reads_from_the_index(self):
+        plan = pagination.page_queryset('40.900').explain()
+        self.assertIn('USING INDEX portfolio_item_active', plan)
+        self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan)
+
+
+@override_settings(PORTFOLIO_CONTACT_INGESTION='direct')
+class HomepageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Hero.objects.create(title_en='Welcome', title_fa='خوش آمدید')
+        with translation_override('en'):
+            self.url = reverse('portfolio:index')
+            self.contact_url = reverse('portfolio:contact')
+
+    def test_cache_hit_runs_no_queries(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Welcome')
+
+    def test_content_change_invalidates_page(self):
+        self.client.get(self.url)
+        Service.objects.create(title_en='Brand Strategy', icon_svg='<svg></svg>')
+        self.assertContains(self.client.get(self.url), 'Brand Strategy')
+
+        item = PortfolioItem.objects.create(title_en='Shop', url='https://example.com')
+        self.client.get(self.url)
+        item.technologies.add(Technology.objects.create(name='Django'))
+        self.assertContains(self.client.get(self.url), 'Django')
+
+    def test_pages_are_cached_per_language(self):
+        with translation_override('fa'):
+            fa_url = reverse('portfolio:index')
+        self.assertContains(self.client.get(self.url), 'lang="en"')
+        self.assertContains(self.client.get(fa_url), 'lang="fa"')
+        self.assertContains(self.client.get(self.url), 'lang="en"')
+
+    def test_cached_page_carries_a_valid_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        client.get(self.url)
+        response = client.get(self.url)
+        self.assertNotContains(response, CSRF_PLACEHOLDER)
+
+        token = response.content.decode().split('name="csrfmiddlewaretoken" value="')[1].split('"')[0]
+        response = client.post(self.contact_url, {
+            'name': 'Sara', 'email': 'sara@example.com', 'subject': 'Hi', 'message': 'Hello',
+            'csrfmiddlewaretoken': token,
+        })
+        self.assertEqual(response.status_code, 302)
+
+    def test_change_in_another_worker_is_seen_after_the_version_ttl(self):
+        first = self.client.get(self.url)
+        # Another worker with its own LocMemCache saved content: only the database knows.
+        Hero.objects.update(title_en='Hello again')
+        ContentVersion.objects.update(version=F('version') + 1)
+
+        self.assertContains(self.client.get(self.url), 'Welcome')
+        later = time.time() + settings.PORTFOLIO_CONTENT_VERSION_TTL + 1
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            response = self.client.get(self.url, headers={'If-None-Match': first['ETag']})
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, 'Hello again')
+
+    def test_query_strings_share_one_cache_entry(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url + '?x=1')
+        self.assertContains(response, f'<link rel="canonical" href="http://testserver{self.url}">')
+        self.assertNotContains(response, '?x=1')
+
+    def test_flash_message_is_rendered_and_not_cached(self):
+        self.client.get(self.url)
+        response = self.client.post(self.contact_url, {'name': ''}, follow=True)
+        self.assertContains(response, 'Please fill in all fields.')
+        self.assertNotContains(self.client.get(self.url), 'Please fill in all fields.')
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        with translation_override('en'):
+            self.url = reverse('portfolio:index')
+
+    def test_homepage_answers_304_for_matching_validators(self):
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        self.assertFalse(etag.startswith('W/'))
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_content_change_produces_new_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        Hero.objects.create(title_en='Changed')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+
+class SitemapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        sitemap_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, sitemap_dir, ignore_errors=True)
+        sitemap_override = override_settings(PORTFOLIO_SITEMAP_DIR=sitemap_dir, PORTFOLIO_SITE_URL='https://example.com')
+        sitemap_override.enable()
+        self.addCleanup(sitemap_override.disable)
+        self.items = [
+            PortfolioItem.objects.create(title_en=f'Item {i}', url='https://example.com', order=i) for i in range(3)
+        ]
+
+    def test_sitemap_answers_304(self):
+        response = self.client.get('/sitemap.xml')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get('/sitemap.xml', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_index_lists_sections_with_lastmod(self):
+        content = b''.join(self.client.get('/sitemap.xml').streaming_content).decode()
+        self.assertIn('<loc>https://example.com/sitemap-portfolio.xml</loc>', content)
+        self.assertIn(f'<lastmod>{self.items[-1].updated_at.isoformat()}</lastmod>', content)
+
+    def test_section_is_precompressed_with_language_alternates(self):
+        response = self.client.get('/sitemap-portfolio.xml', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        content = gzip.decompress(b''.join(response.streaming_content)).decode()
+        pk = self.items[0].pk
+        self.assertIn(f'<loc>https://example.com/fa/portfolio/{pk}/</loc>', content)
+        self.assertIn(f'hreflang="en" href="https://example.com/en/portfolio/{pk}/"', content)
+        self.assertEqual(content.count('<url>'), 6)
+        self.assertEqual(self.client.get('/sitemap-missing.xml').status_code, 404)
+
+    def test_reverses_once_per_language(self):
+        with mock.patch('portfolio.sitemaps.reverse', wraps=reverse) as reverse_mock:
+            sitemaps.ensure_current()
+        # One call per language for each section, however many items there are.
+        self.assertEqual(reverse_mock.call_count, 2 * len(settings.LANGUAGES))
+
+    def test_only_affected_sections_are_rebuilt(self):
+        sitemaps.ensure_current()
+        with self.captureOnCommitCallbacks(execute=True):
+            Technology.objects.create(name='Django')
+        self.assertEqual(sitemaps.ensure_current(), ['static'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.items[0].is_active = False
+            self.items[0].save()
+        self.assertEqual(sitemaps.ensure_current(), ['static', 'portfolio'])
+        content = self.client.get('/sitemap-portfolio.xml')
+        self.assertEqual(b''.join(content.streaming_content).decode().count('<url>'), 4)
+        self.assertEqual(sitemaps.ensure_current(), [])
+
+class ImageOptimizationQueueTests(MediaRootMixin, TestCase):
+    def test_save_queues_job_and_keeps_original(self):
+        item = PortfolioItem.objects.create(url='https://example.com', image=make_image((2400, 1200)))
+        job = ImageOptimizationJob.objects.get()
+        self.assertEqual(job.status, ImageOptimizationJob.STATUS_PENDING)
+        self.assertEqual(job.source_name, item.image.name)
+        with Image.open(item.image.path) as img:
+            self.assertEqual(img.size, (2400, 1200))
+
+    def test_worker_swaps_in_optimized_image(self):
+        item = PortfolioItem.objects.create(url='https://example.com', image=make_image((2400, 1200), 'PNG', name='shot.png'))
+        original = item.image.name
+
+        call_command('process_image_jobs', '--once', stdout=StringIO())
+
+        item.refresh_from_db()
+        self.assertNotEqual(item.image.name, original)
+        self.assertTrue(item.image.name.endswith('.jpg'))
+        self.assertFalse(item.image.storage.exists(original))
+        with Image.open(item.image.path) as img:
+            self.assertEqual(img.size, (1920, 960))
+        self.assertEqual(ImageOptimizationJob.objects.get().status, ImageOptimizationJob.STATUS_DONE)
+
+    def test_reupload_supersedes_queued_job(self):
+        item = PortfolioItem.objects.create(url='https://example.com', image=make_image())
+        item.image = make_image(name='second.jpg')
+        item.save()
+        current = item.image.name
+
+        call_command('process_image_jobs', '--once', stdout=StringIO())
+
+        item.refresh_from_db()
+        first, second = ImageOptimizationJob.objects.all()
+        self.assertEqual(first.error, 'Superseded')
+        self.assertEqual(second.error, '')
+        self.assertNotEqual(item.image.name, current)
+
+
+class ResponsiveVariantTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_worker_records_variant_manifest(self):
+        item = PortfolioItem.objects.create(url='https://example.com', image=make_image((1000, 500)))
+        call_command('process_image_jobs', '--once', stdout=StringIO())
+
+        item.refresh_from_db()
+        manifest = item.image_variants
+        self.assertEqual(manifest['source'], item.image.name)
+        self.assertEqual(set(manifest['formats']), set(variant_formats()))
+        webp = manifest['formats']['webp']
+        self.assertEqual([entry['width'] for entry in webp], [320, 640, 960])
+        with Image.open(item.image.storage.path(webp[0]['name'])) as img:
+            self.assertEqual(img.size, (320, 160))
+
+    def test_templates_emit_variants(self):
+        PortfolioItem.objects.create(url='https://example.com', image=make_image((1000, 500)))
+        TeamMember.objects.create(name='Sara', photo=make_image((800, 800)))
+        call_command('process_image_jobs', '--once', stdout=StringIO())
+
+        with translation_override('en'):
+            response = self.client.get(reverse('portfolio:index'))
+        self.assertContains(response, 'data-bg-srcset-webp="/media/portfolio/variants/')
+        self.assertContains(response, '<source type="image/webp" srcset="/media/team/variants/')
+        self.assertContains(response, 'sizes="(max-width: 768px) 250px, 320px"')
+
+    def test_stale_manifest_is_ignored(self):
+        item = PortfolioItem.objects.create(url='https://example.com', image=make_image((1000, 500)))
+        call_command('process_image_jobs', '--once', stdout=StringIO())
+        item.refresh_from_db()
+        item.image = make_image(name='replacement.jpg')
+        item.save()
+
+        with translation_override('en'):
+            response = self.client.get(reverse('portfolio:index'))
+        self.assertContains(response, f'data-bg="{item.image.url}"')
+        self.assertNotContains(response, 'data-bg-srcset')
+
+
+class SharedOptimizerTests(MediaRootMixin, TestCase):
+    def test_team_photo_is_cropped_to_square_avatar(self):
+        member = TeamMember.objects.create(name='Sara', photo=make_image((3000, 2000)))
+        call_command('process_image_jobs', '--once', stdout=StringIO())
+
+        member.refresh_from_db()
+        with Image.open(member.photo.path) as img:
+            self.assertEqual(img.size, (640, 640))
+        self.assertEqual([entry['width'] for entry in member.photo_variants['formats']['webp']], [320])
+
+    def test_backfill_command_optimizes_existing_images(self):
+        item = PortfolioItem.objects.create(url='https://example.com', image=make_image((2400, 1200)))
+        member = TeamMember.objects.create(name='Sara', photo=make_image((900, 900)))
+        ImageOptimizationJob.objects.all().delete()
+
+        output = StringIO()
+        call_command('optimize_images', '--workers', '2', stdout=output)
+        self.assertIn('Optimized 2 image(s)', output.getvalue())
+
+        item.refresh_from_db()
+        member.refresh_from_db()
+        self.assertEqual(item.image_variants['source'], item.image.name)
+        with Image.open(item.image.path) as img:
+            self.assertEqual(img.size, (1920, 960))
+        with Image.open(member.photo.path) as img:
+            self.assertEqual(img.size, (640, 640))
+
+        output = StringIO()
+        call_command('optimize_images', stdout=output)
+        self.assertIn('already optimized', output.getvalue())
+
+    def test_shared_source_is_kept_until_unused(self):
+        seeding.generate(2, seed=0, media=True)
+        first = PortfolioItem.objects.order_by('order').first()
+        shared = PortfolioItem.objects.create(url='https://example.com', image=first.image.name)
+        source = first.image.path
+
+        swap_image(first, 'image', first.image.name, *process_image('portfolio.PortfolioItem', 'image', first.image.name))
+        self.assertTrue(os.path.exists(source))
+        shared.refresh_from_db()
+        swap_image(shared, 'image', shared.image.name, *process_image('portfolio.PortfolioItem', 'image', shared.image.name))
+        self.assertFalse(os.path.exists(source))
+
+    def test_missing_file_is_reported_as_missing(self):
+        PortfolioItem.objects.create(url='https://example.com', image='portfolio/gone.jpg')
+        output = StringIO()
+        call_command('optimize_images', '--workers', '1', stdout=output)
+        self.assertIn('Missing file portfolio/gone.jpg', output.getvalue())
+        self.assertNotIn('undecodable', output.getvalue())
+
+
+MEASURE_OPTIMIZER_RSS = """
+import sys
+import django
+django.setup()
+from django.core.files.storage import FileSystemStorage
+from portfolio.images import DEFAULT_SPEC, optimize_image
+
+
+def status_kb(field):
+    with open('/proc/self/status') as status:
+        return next(int(line.split()[1]) for line in status if line.startswith(field + ':'))
+
+
+storage = FileSystemStorage(location=sys.argv[1])
+# Reset the peak (VmHWM) so it only covers the optimization below.
+with open('/proc/self/clear_refs', 'w') as clear_refs:
+    clear_refs.write('5')
+before = status_kb('VmRSS')
+assert optimize_image(storage, 'huge.jpg', DEFAULT_SPEC)
+print(status_kb('VmHWM') - before)
+"""
+
+
+class BoundedImageDecodingTests(MediaRootMixin, TestCase):
+    @unittest.skipUnless(os.path.exists('/proc/self/clear_refs'), 'Needs Linux peak RSS accounting')
+    def test_peak_rss_stays_below_full_decode_size(self):
+        media_root = settings.MEDIA_ROOT
+        Image.new('RGB', (6000, 4000), color='navy').save(os.path.join(media_root, 'huge.jpg'), quality=90)
+
+        result = subprocess.run(
+            [sys.executable, '-c', MEASURE_OPTIMIZER_RSS, media_root],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'skypardaz.settings'},
+        )
+        peak_growth_kb = int(result.stdout.strip().splitlines()[-1])
+        # Pillow keeps RGB as 4 bytes per pixel, so a full decode alone would
+        # need ~92 MiB; decoding at half scale and resizing stays near 50 MiB.
+        self.assertLess(peak_growth_kb, 64 * 1024)
+
+    @override_settings(PORTFOLIO_MAX_IMAGE_PIXELS=1_000_000)
+    def test_admin_rejects_images_over_pixel_limit(self):
+        from .forms import PixelLimitedImageField
+
+        with self.assertRaisesMessage(ValidationError, 'at most 1 megapixels'):
+            PixelLimitedImageField().clean(make_image((2000, 1000)))
+        self.assertIsNotNone(PixelLimitedImageField().clean(make_image((1000, 1000))))
+
+    @override_settings(PORTFOLIO_MAX_IMAGE_PIXELS=1_000_000)
+    def test_worker_skips_images_over_pixel_limit(self):
+        item = PortfolioItem.objects.create(url='https://example.com', image=make_image((2000, 1000)))
+        call_command('process_image_jobs', '--once', stdout=StringIO())
+
+        self.assertIn('pixel limit', ImageOptimizationJob.objects.get().error)
+        item.refresh_from_db()
+        self.assertEqual(item.image_variants, {})
+
+
+def make_zip(files, name='site.zip', compression=zipfile.ZIP_DEFLATED):
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression) as archive:
+        for path, content in files.items():
+            archive.writestr(path, content)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='application/zip')
+
+
+class OfflineSiteTests(MediaRootMixin, TestCase):
+    def create_item(self, files):
+        return PortfolioItem.objects.create(portfolio_type='offline', offline_file=make_zip(files))
+
+    def site_url(self, item, path=''):
+        with translation_override('en'):
+            if path:
+                return reverse('portfolio:site_file', args=[item.pk, path])
+            return reverse('portfolio:site', args=[item.pk])
+
+    def test_archive_is_extracted_once_and_served(self):
+        item = self.create_item({
+            'shop/index.html': '<link href="css/app.css">',
+            'shop/css/app.css': 'body { color: red; }',
+        })
+        with translation_override('en'):
+            response = self.client.get(reverse('portfolio:view', args=[item.pk]))
+        self.assertRedirects(response, self.site_url(item), fetch_redirect_response=False)
+
+        response = self.client.get(self.site_url(item))
+        self.assertEqual(b''.join(response.streaming_content), b'<link href="css/app.css">')
+        self.assertEqual(response['Content-Type'], 'text/html')
+        self.assertIn('max-age=86400', response['Cache-Control'])
+        self.assertIn('sandbox', response['Content-Security-Policy'])
+
+        item.refresh_from_db()
+        self.assertEqual(len(item.offline_site_digest), 64)
+        with mock.patch('portfolio.offline.archive_digest') as digest:
+            response = self.client.get(self.site_url(item, 'css/app.css'))
+        digest.assert_not_called()
+        self.assertEqual(response['Content-Type'], 'text/css')
+
+        response = self.client.get(self.site_url(item, 'css/app.css'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_path_traversal_is_rejected(self):
+        item = self.create_item({'index.html': 'ok'})
+        self.assertEqual(self.client.get(self.site_url(item, '../../settings.py')).status_code, 404)
+
+    def test_zip_slip_archive_is_not_extracted(self):
+        item = self.create_item({'index.html': 'ok', '../../evil.html': 'pwned'})
+        with self.assertLogs('portfolio.views', 'WARNING'):
+            self.assertEqual(self.client.get(self.site_url(item)).status_code, 404)
+        self.assertFalse(os.path.exists(os.path.join(settings.MEDIA_ROOT, 'portfolio', 'evil.html')))
+
+    @override_settings(PORTFOLIO_SITE_MAX_RATIO=10)
+    def test_zip_bomb_archive_is_not_extracted(self):
+        item = self.create_item({'index.html': 'ok', 'zeros.bin': b'\0' * 1024 * 1024})
+        with self.assertLogs('portfolio.views', 'WARNING'):
+            self.assertEqual(self.client.get(self.site_url(item)).status_code, 404)
+        # The failure is remembered: the archive is not read or logged again.
+        with translation_override('en'), self.assertNoLogs('portfolio.views', 'WARNING'), \
+                mock.patch('portfolio.offline.archive_digest') as digest:
+            response = self.client.get(reverse('portfolio:view', args=[item.pk]))
+        digest.assert_not_called()
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="site.zip"')
+
+    def test_file_and_directory_with_one_name_is_rejected(self):
+        item = self.create_item({'index.html': 'ok', 'a': 'file', 'a/b.html': 'nested'})
+        with self.assertLogs('portfolio.views', 'WARNING'):
+            self.assertEqual(self.client.get(self.site_url(item)).status_code, 404)
+        item.refresh_from_db()
+        self.assertEqual(item.offline_site_digest, offline.NOT_A_SITE)
+
+    def test_archive_without_index_is_downloaded_without_extracting(self):
+        item = self.create_item({'notes.txt': 'no website here'})
+        with translation_override('en'):
+            response = self.client.get(reverse('portfolio:view', args=[item.pk]))
+            self.assertEqual(response['Content-Disposition'], 'attachment; filename="site.zip"')
+            self.assertFalse(os.path.exists(os.path.join(settings.MEDIA_ROOT, offline.SITES_DIR)))
+            with mock.patch('portfolio.offline.archive_digest') as digest:
+                self.client.get(reverse('portfolio:view', args=[item.pk]))
+            digest.assert_not_called()
+        self.assertEqual(self.client.get(self.site_url(item)).status_code, 404)
+
+    def test_new_upload_is_checked_again(self):
+        item = self.create_item({'notes.txt': 'no website here'})
+        self.assertIsNone(offline.ensure_site(item))
+        item.offline_file = make_zip({'index.html': 'ok'})
+        item.save()
+        self.assertEqual(len(offline.ensure_site(item)), 64)
+
+
+class FileServingBackendTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.item = PortfolioItem.objects.create(
+            portfolio_type='offline', offline_file=make_zip({'notes.txt': 'no website here'}, name='archive.zip'),
+        )
+        with translation_override('en'):
+            self.url = reverse('portfolio:view', args=[self.item.pk])
+
+    def test_django_backend_streams_the_file(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="archive.zip"')
+
+    @override_settings(PORTFOLIO_FILE_SERVING='x-accel-redirect', PORTFOLIO_X_ACCEL_REDIRECT_PREFIX='/internal/')
+    def test_x_accel_redirect_returns_headers_only(self):
+        response = self.client.get(self.url)
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['X-Accel-Redirect'], f'/internal/{self.item.offline_file.name}')
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="archive.zip"')
+
+    @override_settings(PORTFOLIO_FILE_SERVING='x-sendfile')
+    def test_x_sendfile_returns_headers_only(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['X-Sendfile'], os.path.realpath(self.item.offline_file.path))
+
+
+@override_settings(PORTFOLIO_OFFLINE_MODE='download')
+class RangeRequestTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.item = PortfolioItem.objects.create(
+            portfolio_type='offline', offline_file=SimpleUploadedFile('big.zip', bytes(range(256)) * 4),
+        )
+        with translation_override('en'):
+            self.url = reverse('portfolio:view', args=[self.item.pk])
+        self.data = bytes(range(256)) * 4
+
+    def get(self, **headers):
+        response = self.client.get(self.url, **headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_full_download_advertises_ranges_and_validators(self):
+        response, body = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.data)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+    def test_single_range(self):
+        response, body = self.get(HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, self.data[10:20])
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1024')
+        self.assertEqual(response['Content-Length'], '10')
+
+        response, body = self.get(HTTP_RANGE='bytes=-4')
+        self.assertEqual(body, self.data[-4:])
+        response, body = self.get(HTTP_RANGE='bytes=1000-')
+        self.assertEqual(response['Content-Range'], 'bytes 1000-1023/1024')
+
+    def test_multiple_ranges(self):
+        response, body = self.get(HTTP_RANGE='bytes=0-1, 100-101, 1-3')
+        self.assertEqual(response.status_code, 206)
+        self.assertTrue(response['Content-Type'].startswith('multipart/byteranges; boundary='))
+        self.assertEqual(int(response['Content-Length']), len(body))
+        self.assertIn(b'Content-Range: bytes 0-3/1024\r\n\r\n' + self.data[0:4], body)
+        self.assertIn(b'Content-Range: bytes 100-101/1024\r\n\r\n' + self.data[100:102], body)
+
+    def test_unsatisfiable_range(self):
+        response, _ = self.get(HTTP_RANGE='bytes=5000-6000')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_if_range_resumes_only_unchanged_files(self):
+        etag = self.get()[0]['ETag']
+        response, body = self.get(HTTP_RANGE='bytes=512-', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, self.data[512:])
+
+        response, body = self.get(HTTP_RANGE='bytes=512-', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.data)
+
+    def test_if_none_match_returns_304(self):
+        etag = self.get()[0]['ETag']
+        response, _ = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_range_file_keeps_fileno_for_sendfile(self):
+        from .serving import RangeFile
+
+        with tempfile.TemporaryFile() as file:
+            file.write(self.data)
+            file.seek(10)
+            wrapped = RangeFile(file, 5)
+            self.assertEqual(wrapped.fileno(), file.fileno())
+            self.assertEqual(wrapped.read(), self.data[10:15])
+            self.assertEqual(wrapped.read(), b'')
+
+
+class ContactSpoolTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        spool = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool, ignore_errors=True)
+        spool_override = override_settings(
+            PORTFOLIO_CONTACT_INGESTION='spool',
+            PORTFOLIO_CONTACT_SPOOL_DIR=spool,
+            PORTFOLIO_CONTACT_FLUSH_INTERVAL=0,
+            PORTFOLIO_CONTACT_BATCH_SIZE=2,
+            PORTFOLIO_CONTACT_RATE_LIMITS={},
+        )
+        spool_override.enable()
+        self.addCleanup(spool_override.disable)
+        self.spool = spool
+        with translation_override('en'):
+            self.url = reverse('portfolio:contact')
+
+    def post(self, index):
+        return self.client.post(self.url, {
+            'name': f'Visitor {index}', 'email': 'visitor@example.com',
+            'subject': 'Hello', 'message': f'Message {index}',
+        }, follow=True)
+
+    def test_submissions_are_spooled_then_bulk_inserted(self):
+        # Only the indexed duplicate lookup touches the database.
+        with self.assertNumQueries(5):
+            for index in range(5):
+                self.client.post(self.url, {
+                    'name': f'Visitor {index}', 'email': 'visitor@example.com',
+                    'subject': 'Hello', 'message': f'Message {index}',
+                })
+        self.assertEqual(ContactMessage.objects.count(), 0)
+
+        # Five rows in batches of two: three INSERTs.
+        with self.assertNumQueries(3):
+            self.assertEqual(contact_spool.flush(), 5)
+        self.assertEqual(
+            sorted(ContactMessage.objects.values_list('message', flat=True)),
+            [f'Message {index}' for index in range(5)],
+        )
+        self.assertEqual(sorted(os.listdir(self.spool)), ['append.lock', 'flush.lock'])
+
+    def test_success_message_is_shown(self):
+        self.assertContains(self.post(1), 'Your message has been sent successfully!')
+
+    def test_replayed_batch_does_not_duplicate(self):
+        self.post(1)
+        contact_spool._rotate()
+        batch = next(name for name in os.listdir(self.spool) if name.startswith(contact_spool.BATCH_PREFIX))
+        shutil.copy(os.path.join(self.spool, batch), os.path.join(self.spool, 'batch-0-copy.jsonl'))
+
+        self.assertEqual(contact_spool.flush(), 2)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+    def test_torn_line_is_skipped(self):
+        self.post(1)
+        with open(os.path.join(self.spool, contact_spool.PENDING_NAME), 'a') as file:
+            file.write('{"submission_id": "abc", "na')
+        with self.assertLogs('portfolio.contact_spool', 'WARNING'):
+            contact_spool.flush()
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+    def test_drain_command(self):
+        self.post(1)
+        self.post(2)
+        out = StringIO()
+        call_command('drain_contact_spool', stdout=out)
+        self.assertIn('Stored 2', out.getvalue())
+        self.assertEqual(ContactMessage.objects.count(), 2)
+        self.assertIsNotNone(ContactMessage.objects.first().submission_id)
+
+    def test_spool_failure_is_logged_and_reported(self):
+        with mock.patch.object(contact_spool, 'append', side_effect=OSError('disk full')):
+            with self.assertLogs('portfolio.views', 'ERROR'):
+                response = self.post(1)
+        self.assertContains(response, 'An error occurred. Please try again.')
+
+
+@override_settings(
+    PORTFOLIO_CONTACT_INGESTION='direct',
+    PORTFOLIO_CONTACT_RATE_LIMITS={'ip': '3/m', 'email': '2/h'},
+)
+class ContactRateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        with translation_override('en'):
+            self.url = reverse('portfolio:contact')
+
+    def post(self, email='visitor@example.com', message='Hello', ip='10.0.0.1'):
+        return self.client.post(self.url, {
+            'name': 'Visitor', 'email': email, 'subject': 'Project', 'message': message,
+        }, REMOTE_ADDR=ip, follow=True)
+
+    def test_parse_rate(self):
+        self.assertEqual(ratelimit.parse_rate('5/m'), (5, 60))
+        self.assertEqual(ratelimit.parse_rate('20/12h'), (20, 12 * 60 * 60))
+        with self.assertRaises(ValueError):
+            ratelimit.parse_rate('5 per minute')
+
+    def test_email_bucket(self):
+        self.post(message='One')
+        self.post(message='Two')
+        response = self.post(message='Three', ip='10.0.0.2')
+        self.assertContains(response, 'Too many messages. Please try again later.')
+        self.assertEqual(ContactMessage.objects.count(), 2)
+
+    def test_ip_bucket_refills(self):
+        with mock.patch('portfolio.ratelimit.time.time', return_value=1000.0):
+            for index in range(3):
+                self.post(email=f'visitor{index}@example.com')
+            self.assertContains(self.post(email='other@example.com'), 'Too many messages.')
+        # One token comes back every 20 seconds.
+        with mock.patch('portfolio.ratelimit.time.time', return_value=1020.0):
+            self.assertContains(self.post(email='other@example.com'), 'sent successfully')
+        self.assertEqual(ContactMessage.objects.count(), 4)
+
+    def test_near_identical_resend_is_dropped(self):
+        self.post(message='Hello   there')
+        response = self.post(email='VISITOR@example.com', message='hello there ')
+        self.assertContains(response, 'Your message has been sent successfully!')
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+    def test_retry_after_failed_save_is_stored(self):
+        with mock.patch.object(ContactMessage.objects, 'create', side_effect=DatabaseError('locked')):
+            with self.assertLogs('portfolio.views', 'ERROR'):
+                self.assertContains(self.post(), 'An error occurred. Please try again.')
+        self.assertContains(self.post(), 'Your message has been sent successfully!')
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+    def test_duplicate_found_by_index_after_cache_eviction(self):
+        self.post(message='Hello')
+        cache.clear()
+        self.post(message='Hello', ip='10.0.0.2')
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+        plan = ContactMessage.objects.filter(content_hash='0' * 64).explain()
+        self.assertIn('USING INDEX', plan)
+
+
+def reload_urlconf():
+    import portfolio.urls
+    import skypardaz.urls
+
+    importlib.reload(portfolio.urls)
+    importlib.reload(skypardaz.urls)
+    clear_url_caches()
+
+
+@override_settings(PORTFOLIO_CONTACT_INGESTION='direct', PORTFOLIO_OFFLINE_MODE='download')
+class AsyncViewTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        async_override = override_settings(PORTFOLIO_ASYNC_VIEWS=True)
+        async_override.enable()
+        reload_urlconf()
+        self.addCleanup(reload_urlconf)
+        self.addCleanup(async_override.disable)
+
+        Hero.objects.create(title_en='Welcome', title_fa='خوش آمدید')
+        self.item = PortfolioItem.objects.create(
+            portfolio_type='offline', offline_file=SimpleUploadedFile('big.zip', b'0123456789' * 10),
+        )
+        with translation_override('en'):
+            self.url = reverse('portfolio:index')
+            self.contact_url = reverse('portfolio:contact')
+            self.view_url = reverse('portfolio:view', args=[self.item.pk])
+
+    def test_async_views_are_routed(self):
+        with translation_override('en'):
+            self.assertIs(resolve(self.url).func, views.index_async)
+            self.assertIs(resolve(self.contact_url).func, views.contact_async)
+            self.assertIs(resolve(self.view_url).func, views.portfolio_view_async)
+
+    async def test_index_is_cached_and_revalidated(self):
+        response = await self.async_client.get(self.url)
+        self.assertContains(response, 'Welcome')
+        self.assertNotContains(response, CSRF_PLACEHOLDER)
+
+        response = await self.async_client.get(self.url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_contact(self):
+        response = await self.async_client.get(self.contact_url)
+        self.assertEqual(response.status_code, 405)
+
+        response = await self.async_client.post(self.contact_url, {
+            'name': 'Sara', 'email': 'sara@example.com', 'subject': 'Hi', 'message': 'Hello',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(await ContactMessage.objects.acount(), 1)
+
+    async def test_contact_retry_after_failed_save_is_stored(self):
+        data = {'name': 'Sara', 'email': 'sara@example.com', 'subject': 'Hi', 'message': 'Hello'}
+        with mock.patch.object(ContactMessage.objects, 'acreate', side_effect=DatabaseError('locked')):
+            with self.assertLogs('portfolio.views', 'ERROR'):
+                await self.async_client.post(self.contact_url, data)
+        await self.async_client.post(self.contact_url, data)
+        self.assertEqual(await ContactMessage.objects.acount(), 1)
+
+    async def test_offline_download_streams_asynchronously(self):
+        response = await self.async_client.get(self.view_url, headers={'Range': 'bytes=5-14'})
+        self.assertEqual(response.status_code, 206)
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(body, b'5678901234')
+
+
+class SQLiteTuningTests(TestCase):
+    def test_pragmas_applied_to_new_connections(self):
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = connection.copy()
+            wrapper.settings_dict = {**connection.settings_dict, 'NAME': os.path.join(directory, 'tuned.sqlite3')}
+            try:
+                with wrapper.cursor() as cursor:
+                    cursor.execute('PRAGMA journal_mode')
+                    self.assertEqual(cursor.fetchone()[0], 'wal')
+                    cursor.execute('PRAGMA busy_timeout')
+                    self.assertEqual(cursor.fetchone()[0], settings.PORTFOLIO_SQLITE_PRAGMAS['busy_timeout'])
+                    cursor.execute('PRAGMA synchronous')
+                    self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            finally:
+                wrapper.close()
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_sqlite', '--seconds', '0.2', '--readers', '2', '--rows', '10', '--json', stdout=out)
+        results = {result['profile']: result for result in json.loads(out.getvalue())}
+        self.assertEqual(set(results), set(settings.SQLITE_PROFILES))
+        self.assertGreater(results['production']['reads_per_second'], 0)
+
+
+class QueryPlanTests(TestCase):
+    def assertUsesIndex(self, queryset, index):
+        plan = queryset.explain()
+        self.assertIn(f'USING INDEX {index}', plan)
+        # The index already yields rows in the requested order.
+        self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan)
+
+    def test_active_content_uses_partial_indexes(self):
+        self.assertUsesIndex(About.objects.filter(is_active=True), 'portfolio_about_active')
+        self.assertUsesIndex(TeamMember.objects.filter(is_active=True), 'portfolio_team_active')
+        self.assertUsesIndex(Service.objects.filter(is_active=True), 'portfolio_service_active')
+        self.assertUsesIndex(Technology.objects.filter(is_active=True), 'portfolio_tech_active')
+        self.assertUsesIndex(PortfolioItem.objects.filter(is_active=True), 'portfolio_item_active')
+        self.assertUsesIndex(SiteSetting.objects.filter(is_active=True), 'portfolio_setting_active')
+
+    def test_contact_messages_use_indexes(self):
+        self.assertUsesIndex(ContactMessage.objects.all(), 'portfolio_message_created')
+        self.assertUsesIndex(ContactMessage.objects.filter(is_read=False), 'portfolio_message_unread')
+
+
+class SiteSettingsCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        page_cache.invalidate_site_settings()
+        self.addCleanup(page_cache.invalidate_site_settings)
+        self.factory = RequestFactory()
+
+    def render(self, template):
+        return Template(template).render(RequestContext(self.factory.get('/')))
+
+    def test_unused_lookup_runs_no_query(self):
+        with self.assertNumQueries(0):
+            self.render('{{ 1 }}')
+
+    def test_title_is_cached_across_renders(self):
+        SiteSetting.objects.create(site_title_en='Studio')
+        page_cache.get_content_version()
+        with translation_override('en'), self.assertNumQueries(1):
+            self.assertEqual(self.render('{{ site_title }}'), 'Studio')
+            self.assertEqual(self.render('{{ site_title }}'), 'Studio')
+
+    def test_fallback_title_when_none_active(self):
+        with translation_override('en'):
+            self.assertEqual(self.render('{{ site_title }}'), 'SkyPardaz - Creative Studio')
+            self.assertEqual(self.render('{% if site_settings %}set{% endif %}'), '')
+
+    def test_admin_save_refreshes(self):
+        setting = SiteSetting.objects.create(site_title_en='Studio')
+        with translation_override('en'):
+            self.render('{{ site_title }}')
+            setting.site_title_en = 'Renamed'
+            setting.save()
+            self.assertEqual(self.render('{{ site_title }}'), 'Renamed')
+
+    def test_change_in_another_worker_is_seen_after_the_version_ttl(self):
+        setting = SiteSetting.objects.create(site_title_en='Studio')
+        with translation_override('en'):
+            self.render('{{ site_title }}')
+            # Another worker with its own LocMemCache saved it: only the database knows.
+            SiteSetting.objects.filter(pk=setting.pk).update(site_title_en='Renamed')
+            ContentVersion.objects.update(version=F('version') + 1)
+
+            self.assertEqual(self.render('{{ site_title }}'), 'Studio')
+            later = time.time() + settings.PORTFOLIO_CONTENT_VERSION_TTL + 1
+            with mock.patch('django.core.cache.backends.locmem.time.time', return_value=later):
+                self.assertEqual(self.render('{{ site_title }}'), 'Renamed')
+
+    def test_shared_copy_is_kept_per_version(self):
+        SiteSetting.objects.create(site_title_en='Studio')
+        version, _ = page_cache.get_content_version()
+        page_cache.get_site_settings()
+        self.assertEqual(cache.get(page_cache.SITE_SETTINGS_KEY.format(version=version))[0].site_title_en, 'Studio')
+        page_cache.bump_content_version()
+        self.assertIsNone(cache.get(page_cache.SITE_SETTINGS_KEY.format(version=version + 1)))
+
+GOOGLE_FONTS_CSS = """
+/* arabic */
+@font-face {
+  font-family: 'Vazirmatn';
+  font-style: normal;
+  font-weight: 400;
+  font-display: swap;
+  src: url(https://fonts.gstatic.com/s/vazirmatn/v13/arabic.woff2) format('woff2');
+  unicode-range: U+0600-06FF;
+}
+/* latin */
+@font-face {
+  font-family: 'Inter';
+  font-style: normal;
+  font-weight: 400;
+  font-display: swap;
+  src: url(https://fonts.gstatic.com/s/inter/v13/latin.woff2) format('woff2');
+  unicode-range: U+0000-00FF;
+}
+/* cyrillic */
+@font-face {
+  font-family: 'Inter';
+  font-style: normal;
+  font-weight: 400;
+  font-display: swap;
+  src: url(https://fonts.gstatic.com/s/inter/v13/cyrillic.woff2) format('woff2');
+  unicode-range: U+0400-045F;
+}
+"""
+
+
+class AssetBundleTests(TestCase):
+    def setUp(self):
+        static_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_dir, ignore_errors=True)
+        static_override = override_settings(STATICFILES_DIRS=[static_dir])
+        static_override.enable()
+        self.addCleanup(static_override.disable)
+        cache.clear()
+        Hero.objects.create(title_en='Welcome', title_fa='خوش آمدید')
+        with translation_override('en'):
+            self.url = reverse('portfolio:index')
+
+    def test_minify_css_keeps_strings_and_descendant_pseudo_classes(self):
+        css = "/* note */ a :hover ,\n b > c { content: ' a  b ' ;  color:  red ; }"
+        self.assertEqual(assets.minify_css(css), "a :hover,b>c{content:' a  b ';color:red}")
+
+    def test_critical_css_keeps_above_the_fold_rules(self):
+        css = """
+            :root { --blue: #00f; }
+            .nav { color: var(--blue); animation: fadeIn 1s; }
+            .nav-link:hover, .footer { color: red; }
+            .footer { margin: 0; }
+            body.dark-mode .nav { color: white; }
+            @media (max-width: 480px) { .nav { padding: 0; } .footer { padding: 0; } }
+            @keyframes fadeIn { from { opacity: 0; } to { opacity: 1; } }
+            @keyframes unused { to { opacity: 0; } }
+            @font-face { font-family: X; src: url(x.woff2); }
+        """
+        html = '<nav class="nav"><a class="nav-link"></a></nav><section id="about"><footer class="footer">'
+        critical = assets.extract_critical_css(css, html)
+        self.assertEqual(critical, (
+            ':root{--blue:#00f}.nav{color:var(--blue);animation:fadeIn 1s}.nav-link:hover,.footer{color:red}'
+            'body.dark-mode .nav{color:white}@media (max-width:480px){.nav{padding:0}}'
+            '@keyframes fadeIn{from{opacity:0}to{opacity:1}}'
+        ))
+
+    def test_fetch_fonts_keeps_needed_subsets_locally(self):
+        fetched = []
+
+        def fetch(url):
+            fetched.append(url)
+            return GOOGLE_FONTS_CSS.encode() if 'googleapis' in url else b'woff2'
+
+        css, preload = assets.fetch_fonts('fa', fetch=fetch)
+        self.assertNotIn('cyrillic', ' '.join(fetched))
+        self.assertNotIn('gstatic', css)
+        self.assertEqual(css.count('@font-face'), 2)
+        self.assertEqual(len(preload), 1)
+        self.assertTrue(preload[0].startswith('portfolio/build/fonts/vazirmatn-arabic-'))
+        self.assertTrue(os.path.exists(os.path.join(assets.build_dir(), 'fonts', preload[0].rsplit('/', 1)[1])))
+
+    def test_missing_manifest_entry_raises_with_the_configured_storage(self):
+        storages = {**settings.STORAGES, 'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'}}
+        static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_root)
+        with override_settings(STORAGES=storages, STATIC_ROOT=static_root):
+            with self.assertRaises(ValueError):
+                staticfiles_storage.url('portfolio/css/styles.css')
+
+    def test_homepage_uses_source_files_without_a_build(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, 'portfolio/css/styles.css')
+        self.assertContains(response, 'fonts.googleapis.com')
+
+    def test_homepage_uses_built_bundle(self):
+        call_command('build_assets', stdout=StringIO())
+        with open(os.path.join(assets.build_dir(), 'site-en.css')) as file:
+            self.assertNotIn('/*', file.read())
+
+        response = self.client.get(self.url)
+        self.assertContains(response, 'portfolio/build/site-en.css')
+        self.assertContains(response, "<style>*{margin:0")
+        self.assertNotContains(response, 'portfolio/css/styles.css')
+        # Fonts stay on Google until they are fetched with --fetch-fonts.
+        self.assertContains(response, 'fonts.googleapis.com')
+
+        with override_settings(DEBUG=True):
+            cache.clear()
+            self.assertContains(self.client.get(self.url), 'portfolio/css/styles.css')
+
+    def test_homepage_defers_motion_libraries(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, '<script id="motion-config" type="application/json">')
+        self.assertNotContains(response, '<script src="https://cdnjs.cloudflare.com')
+
+        with override_settings(PORTFOLIO_MOTION_LOADING='eager'):
+            cache.clear()
+            response = self.client.get(self.url)
+        self.assertNotContains(response, 'motion-config')
+        self.assertContains(response, '<script src="https://cdnjs.cloudflare.com/ajax/libs/three.js/r128/three.min.js">')
+
+    def test_fetch_scripts_self_hosts_motion_libraries(self):
+        fetch = mock.Mock(return_value=b'/* lib */')
+        fetch_scripts = assets.fetch_scripts
+        with mock.patch.object(assets, 'fetch_scripts', lambda: fetch_scripts(fetch=fetch)):
+            call_command('build_assets', '--fetch-scripts', stdout=StringIO())
+        self.assertEqual(fetch.call_count, 4)
+        manifest = assets.load_manifest()
+        self.assertEqual(manifest['vendor']['gsap'][0], 'portfolio/build/vendor/gsap-3.12.2.min.js')
+
+        response = self.client.get(self.url)
+        config = json.loads(response.content.decode().split('"motion-config" type="application/json">')[1].split('</script>')[0])
+        self.assertEqual(config['three'], ['/static/portfolio/build/vendor/three-r128.min.js'])
+        self.assertEqual(len(config['gsap']), 3)
@@ -0,0 +1,255 @@
+"""
+Bulk export and import of translated content.
+
+Rows are ``{'model', 'id', 'field', <lang>: value, ...}``, one per object
+and translated field, in any of three formats:
+
+* ``jsonl``: one JSON object per line.
+* ``csv``: a ``model,id,field,<lang>...`` header, then one row per line.
+* ``po``: gettext-style entries for one target language, with
+  ``msgctxt "<model>:<id>:<field>"``, the source language as ``msgid`` and
+  the target as ``msgstr``, for translators' tools.
+
+Imports are validated completely before anything is written, then applied
+in one transaction as one parameterized UPDATE per set of columns, sent in
+``executemany`` chunks. ``bulk_update`` would build a CASE expression per
+row and field, which costs seconds of Python time per few thousand rows.
+"""
+import csv
+import json
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from modeltranslation.translator import translator
+from modeltranslation.utils import build_localized_fieldname
+
+from . import sitemaps
+from .cache import bump_content_version, invalidate_site_settings
+
+FORMATS = ('jsonl', 'csv', 'po')
+CHUNK_SIZE = 500
+
+
+class TranslationImportError(Exception):
+    """Raised with every problem found in an import file."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(f'{len(errors)} problem(s) in the import file')
+
+
+def languages():
+    return list(settings.MODELTRANSLATION_LANGUAGES)
+
+
+def translated_models():
+    """Return ``{'portfolio.hero': (Hero, fields)}`` for models with translated fields."""
+    models = {}
+    for model in apps.get_app_config('portfolio').get_models():
+        if model in translator.get_registered_models(abstract=False):
+            fields = tuple(sorted(translator.get_options_for_model(model).fields))
+            if fields:
+                models[model._meta.label_lower] = (model, fields)
+    return models
+
+
+def export_rows(chunk_size=2000):
+    """Yield one row per object and translated field, streaming each table."""
+    for label, (model, fields) in translated_models().items():
+        columns = [build_localized_fieldname(field, lang) for field in fields for lang in languages()]
+        for values in model.objects.order_by('pk').values_list('pk', *columns).iterator(chunk_size=chunk_size):
+            pk, values = values[0], iter(values[1:])
+            for field in fields:
+                row = {'model': label, 'id': pk, 'field': field}
+                row.update((lang, next(values)) for lang in languages())
+                yield row
+
+
+def _po_quote(value):
+    """Quote ``value`` as a PO string, one quoted line per source line."""
+    # JSON string escapes (\\, \", \n, \t) are the ones gettext uses.
+    parts = (value or '').split('\n')
+    lines = [part + '\n' for part in parts[:-1]] + ([parts[-1]] if parts[-1] else [])
+    quoted = [json.dumps(line, ensure_ascii=False) for line in lines]
+    if len(quoted) <= 1:
+        return quoted[0] if quoted else '""'
+    return '\n'.join(['""', *quoted])
+
+
+def write_rows(rows, file, format, language=None):
+    """Write ``rows`` to ``file`` as ``format``; ``po`` targets ``language``."""
+    langs = languages()
+    if format == 'jsonl':
+        for row in rows:
+            file.write(json.dumps(row, ensure_ascii=False) + '\n')
+    elif format == 'csv':
+        writer = csv.DictWriter(file, fieldnames=['model', 'id', 'field', *langs])
+        writer.writeheader()
+        writer.writerows(rows)
+    elif format == 'po':
+        source = next(lang for lang in langs if lang != language)
+        file.write(f'# Source language: {source}\n# Target language: {language}\n\n')
+        for row in rows:
+            file.write(
+                f'msgctxt "{row["model"]}:{row["id"]}:{row["field"]}"\n'
+                f'msgid {_po_quote(row[source])}\n'
+                f'msgstr {_po_quote(row[language])}\n\n'
+            )
+    else:
+        raise ValueError(f'Unknown format {format!r}')
+
+
+def _read_po(file):
+    entry = {}
+    key = None
+    for line in file:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('"'):
+            # Continuation of the previous keyword's string.
+            entry[key] += json.loads(line)
+            continue
+        key, _, value = line.partition(' ')
+        if key == 'msgctxt' and 'msgctxt' in entry:
+            yield entry
+            entry = {}
+        entry[key] = json.loads(value)
+    if entry:
+        yield entry
+
+
+def read_rows(file, format, language=None):
+    """Yield ``(line, row)`` from ``file``; po rows carry ``language`` if translated."""
+    if format == 'jsonl':
+        for number, line in enumerate(file, 1):
+            if line.strip():
+                try:
+                    yield number, json.loads(line)
+                except json.JSONDecodeError as exc:
+                    yield number, {'_error': f'invalid JSON ({exc.msg})'}
+    elif format == 'csv':
+        reader = csv.DictReader(file)
+        for row in reader:
+            # line_num counts physical lines, so cells holding newlines do not
+            # shift the numbers; it is the last line of the row.
+            yield reader.line_num, {
+                # Export writes NULL as an empty cell: it is untranslated, not
+                # an empty translation, which would stop the language fallback.
+                key: value or None for key, value in row.items() if value is not None
+            }
+    elif format == 'po':
+        for number, entry in enumerate(_read_po(file), 1):
+            model, _, rest = entry.get('msgctxt', '').partition(':')
+            pk, _, field = rest.partition(':')
+            row = {'model': model, 'id': pk, 'field': field}
+            # An empty msgstr is an untranslated entry, not an empty translation.
+            if entry.get('msgstr'):
+                row[language] = entry['msgstr']
+            yield number, row
+    else:
+        raise ValueError(f'Unknown format {format!r}')
+
+
+def validate(rows, languages_required, allow_missing=False):
+    """
+    Check ``(line, row)`` pairs and group the updates per model.
+
+    Returns ``{label: {pk: {localized_field: value}}}``. Each row needs a
+    value, possibly empty, for every language in ``languages_required``;
+    with ``allow_missing`` absent ones are skipped instead. Rows naming
+    an unknown model, field or object, lines that are not objects, and
+    values that are not strings or too long for their column are errors too. Every problem is collected and raised together as
+    ``TranslationImportError``, so nothing is written from a bad file.
+    """
+    models = translated_models()
+    updates = defaultdict(lambda: defaultdict(dict))
+    errors = []
+    for line, row in rows:
+        if not isinstance(row, dict):
+            errors.append(f'line {line}: expected an object, got {type(row).__name__}')
+            continue
+        if '_error' in row:
+            errors.append(f'line {line}: {row["_error"]}')
+            continue
+        label, field = row.get('model'), row.get('field')
+        if not isinstance(label, str) or label not in models:
+            errors.append(f'line {line}: unknown model {label!r}')
+            continue
+        model, fields = models[label]
+        if field not in fields:
+            errors.append(f'line {line}: {label} has no translated field {field!r}')
+            continue
+        try:
+            pk = int(row.get('id'))
+        except (TypeError, ValueError):
+            errors.append(f'line {line}: invalid id {row.get("id")!r}')
+            continue
+        missing = [lang for lang in languages_required if lang not in row]
+        if missing and not allow_missing:
+            errors.append(f'line {line}: {label}:{pk}:{field} is missing {", ".join(missing)}')
+            continue
+        for lang in languages_required:
+            if lang in missing:
+                continue
+            if not isinstance(row[lang], (str, type(None))):
+                errors.append(f'line {line}: {label}:{pk}:{field} [{lang}] is not a string')
+                continue
+            name = build_localized_fieldname(field, lang)
+            max_length = model._meta.get_field(name).max_length
+            if max_length and row[lang] and len(row[lang]) > max_length:
+                errors.append(f'line {line}: {label}:{pk}:{field} [{lang}] is longer than {max_length} characters')
+                continue
+            updates[label][pk][name] = row[lang]
+
+    for label, objects in updates.items():
+        model = models[label][0]
+        existing = set()
+        pks = list(objects)
+        for start in range(0, len(pks), CHUNK_SIZE):
+            existing.update(model.objects.filter(pk__in=pks[start:start + CHUNK_SIZE]).values_list('pk', flat=True))
+        errors.extend(f'{label}:{pk} does not exist' for pk in pks if pk not in existing)
+
+    if errors:
+        raise TranslationImportError(errors)
+    return updates
+
+
+def apply(updates, chunk_size=CHUNK_SIZE):
+    """Write validated ``updates`` in one transaction; return the number of objects changed."""
+    models = translated_models()
+    now = timezone.now()
+    changed = 0
+    with transaction.atomic():
+        for label, objects in updates.items():
+            model = models[label][0]
+            # Raw UPDATEs skip save(), so auto_now stamps are set here.
+            stamps = [field for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+            stamp_values = [field.get_db_prep_save(now, connection) for field in stamps]
+            by_columns = defaultdict(list)
+            for pk, values in objects.items():
+                by_columns[tuple(sorted(values))].append(pk)
+            for names, pks in by_columns.items():
+                columns = [model._meta.get_field(name).column for name in names] + [field.column for field in stamps]
+                sql = 'UPDATE {} SET {} WHERE {} = %s'.format(
+                    connection.ops.quote_name(model._meta.db_table),
+                    ', '.join(f'{connection.ops.quote_name(column)} = %s' for column in columns),
+                    connection.ops.quote_name(model._meta.pk.column),
+                )
+                with connection.cursor() as cursor:
+                    for start in range(0, len(pks), chunk_size):
+                        cursor.executemany(sql, [
+                            [objects[pk][name] for name in names] + stamp_values + [pk]
+                            for pk in pks[start:start + chunk_size]
+                        ])
+                changed += len(pks)
+        # Nothing here sends signals; do what the content signals would.
+        bump_content_version()
+        if 'portfolio.sitesetting' in updates:
+            invalidate_site_settings()
+        sections = ('static', 'portfolio') if 'portfolio.portfolioitem' in updates else ('static',)
+        transaction.on_commit(lambda: sitemaps.mark_stale(*sections))
+    return changed
@@ -1,11 +1,20 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
 app_name = 'portfolio'
 
+# ASGI deployments can route the public views to their native async versions.
+if getattr(settings, 'PORTFOLIO_ASYNC_VIEWS', False):
+    index, contact, portfolio_view = views.index_async, views.contact_async, views.portfolio_view_async
+else:
+    index, contact, portfolio_view = views.index, views.contact, views.portfolio_view
+
 urlpatterns = [
-    path('', views.index, name='index'),
-    path('contact/', views.contact, name='contact'),
-    path('portfolio/<int:portfolio_id>/', views.portfolio_view, name='view'),
+    path('', index, name='index'),
+    path('contact/', contact, name='contact'),
+    path('portfolio/items/', views.portfolio_items, name='items'),
+    path('portfolio/<int:portfolio_id>/', portfolio_view, name='view'),
+    path('portfolio/<int:portfolio_id>/site/', views.portfolio_site, name='site'),
+    path('portfolio/<int:portfolio_id>/site/<path:path>', views.portfolio_site, name='site_file'),
 ]
-
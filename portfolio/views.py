@@ -1,35 +1,47 @@
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.views.decorators.http import require_http_methods
-from django.http import FileResponse, Http404
+from django.views.decorators.http import condition, require_GET, require_http_methods
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseBadRequest, HttpResponseNotAllowed, JsonResponse
+from django.template.loader import render_to_string
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
 from django.utils import translation
 from django.utils.translation import gettext_lazy as _
 import os
-from .models import Hero, About, TeamSection, TeamMember, Service, PortfolioItem, ContactInfo, ContactMessage
+from . import cache as page_cache
+from . import contact_spool, facets, offline, pagination, ratelimit, serving, sitemaps
+from .models import PortfolioItem, ContactMessage
+from .context_processors import apreload_site_settings
+from .localization import localize
+from .snapshot import abuild_homepage_snapshot, build_homepage_snapshot
+
+logger = logging.getLogger(__name__)
 
 
+@condition(etag_func=page_cache.homepage_etag, last_modified_func=page_cache.homepage_last_modified)
 def index(request):
     """Main portfolio page"""
-    # Get active content (modeltranslation handles language automatically)
-    heroes = Hero.objects.filter(is_active=True)
-    about_items = About.objects.filter(is_active=True)
-    team_section = TeamSection.objects.filter(is_active=True).first()
-    team_members = TeamMember.objects.filter(is_active=True)
-    services = Service.objects.filter(is_active=True)
-    portfolio_items = PortfolioItem.objects.filter(is_active=True)
-    contact_info = ContactInfo.objects.filter(is_active=True)
-    
-    context = {
-        'heroes': heroes,
-        'about_items': about_items,
-        'team_section': team_section,
-        'team_members': team_members,
-        'services': services,
-        'portfolio_items': portfolio_items,
-        'contact_info': contact_info,
-    }
-    
-    return render(request, 'portfolio/index.html', context)
+    if not page_cache.is_cacheable(request):
+        return render(request, 'portfolio/index.html', build_homepage_snapshot())
+
+    content = page_cache.get_cached_homepage(request)
+    if content is None:
+        # Get active content (modeltranslation handles language automatically)
+        context = build_homepage_snapshot()
+        context['csrf_token'] = page_cache.CSRF_PLACEHOLDER
+        content = render_to_string('portfolio/index.html', context, request=request)
+        page_cache.set_cached_homepage(request, content)
+
+    response = HttpResponse(page_cache.personalize(request, content))
+    # Browsers keep the page but revalidate it; the CSRF token keeps it out of shared caches.
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
 
 
 @require_http_methods(["POST"])
@@ -42,15 +54,32 @@ def contact(request):
         message = request.POST.get('message', '').strip()
         
         if name and email and subject and message:
+            if not ratelimit.allow_contact(request, email):
+                messages.error(request, _('Too many messages. Please try again later.'))
+                return redirect('portfolio:index')
+
+            digest = ratelimit.content_hash(email, subject, message)
+            if ratelimit.is_duplicate(digest):
+                # Resends (double clicks, bots replaying) are acknowledged but not stored again
+                messages.success(request, _('Your message has been sent successfully!'))
+                return redirect('portfolio:index')
+
             try:
-                ContactMessage.objects.create(
-                    name=name,
-                    email=email,
-                    subject=subject,
-                    message=message
-                )
+                if getattr(settings, 'PORTFOLIO_CONTACT_INGESTION', 'spool') == 'spool':
+                    # Keep bursts off SQLite's single write lock; the flusher batches them
+                    contact_spool.append(name, email, subject, message, content_hash=digest)
+                else:
+                    ContactMessage.objects.create(
+                        name=name,
+                        email=email,
+                        subject=subject,
+                        message=message,
+                        content_hash=digest
+                    )
                 messages.success(request, _('Your message has been sent successfully!'))
-            except Exception as e:
+            except Exception:
+                logger.exception('Storing a contact message failed')
+                ratelimit.forget_submission(digest)
                 messages.error(request, _('An error occurred. Please try again.'))
         else:
             messages.error(request, _('Please fill in all fields.'))
@@ -69,17 +98,232 @@ def portfolio_view(request, portfolio_id):
         # Redirect to the URL for online portfolios
         return redirect(portfolio_item.url)
     
-    # For offline portfolios, serve the file
+    file_path = _resolve_offline(portfolio_item)
+    if file_path is None:
+        return redirect('portfolio:site', portfolio_id=portfolio_item.id)
+
+    # Return the file for download; an offload backend lets the proxy send it
+    return serving.serve_file(request, file_path, as_attachment=True, filename=os.path.basename(file_path))
+
+
+def _resolve_offline(portfolio_item):
+    """Return the offline file to download, or None when it should be browsed as a site."""
     if not portfolio_item.offline_file:
         raise Http404(_("Portfolio file not found"))
-    
+
     file_path = portfolio_item.offline_file.path
     if not os.path.exists(file_path):
         raise Http404(_("Portfolio file not found"))
-    
-    # Return the file for download
-    return FileResponse(
-        open(file_path, 'rb'),
-        as_attachment=True,
-        filename=os.path.basename(file_path)
-    )
\ No newline at end of file
+
+    # Let visitors browse archives that contain a website
+    if getattr(settings, 'PORTFOLIO_OFFLINE_MODE', 'site') == 'site':
+        try:
+            digest = offline.ensure_site(portfolio_item)
+        except offline.ArchiveError:
+            logger.warning('Offline portfolio %s cannot be extracted', portfolio_item.pk, exc_info=True)
+        else:
+            if digest and os.path.isfile(os.path.join(offline.site_root(digest), 'index.html')):
+                return None
+    return file_path
+
+
+def _add_site_headers(response):
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'PORTFOLIO_SITE_CACHE_MAX_AGE', 60 * 60 * 24))
+    # Uploaded sites run in an opaque origin so their scripts cannot reach
+    # this site's cookies or make same-origin requests.
+    response.headers['Content-Security-Policy'] = 'sandbox allow-scripts allow-forms allow-popups allow-modals'
+    return response
+
+
+def portfolio_site(request, portfolio_id, path=''):
+    """Serve one file of an extracted offline portfolio"""
+    portfolio_item = get_object_or_404(PortfolioItem, id=portfolio_id, is_active=True, portfolio_type='offline')
+    if not portfolio_item.offline_file or not os.path.exists(portfolio_item.offline_file.path):
+        raise Http404(_("Portfolio file not found"))
+
+    try:
+        digest = offline.ensure_site(portfolio_item)
+    except offline.ArchiveError:
+        logger.warning('Offline portfolio %s cannot be extracted', portfolio_item.pk, exc_info=True)
+        raise Http404(_("Portfolio file not found"))
+    if digest is None:
+        raise Http404(_("Portfolio file not found"))
+
+    if not path or path.endswith('/'):
+        path += 'index.html'
+    try:
+        file_path = safe_join(offline.site_root(digest), path)
+    except SuspiciousFileOperation:
+        raise Http404(_("Portfolio file not found"))
+    if not os.path.isfile(file_path):
+        raise Http404(_("Portfolio file not found"))
+
+    # The directory is content-addressed, so the digest identifies every file in it.
+    return _add_site_headers(serving.serve_file(request, file_path, etag=f'"{digest}"'))
+
+
+@require_GET
+@condition(etag_func=page_cache.content_etag, last_modified_func=page_cache.content_last_modified)
+def portfolio_items(request):
+    """
+    A page of the portfolio grid, as rendered HTML and the following page's URL.
+
+    ``technology`` (repeatable) narrows the items to those using all of the
+    given technologies, or any of them with ``match=any``. Every response
+    lists each technology with its number of matching items.
+    """
+    match = request.GET.get('match', 'all')
+    try:
+        technology_ids = [int(pk) for pk in request.GET.getlist('technology')]
+    except ValueError:
+        return HttpResponseBadRequest(_("Invalid technology"))
+    if match not in facets.MATCH_MODES:
+        return HttpResponseBadRequest(_("Invalid match mode"))
+
+    active_facets = list(facets.active_facets())
+    cursor = request.GET.get('cursor')
+    try:
+        if technology_ids:
+            matched = facets.select(active_facets, technology_ids, match)
+            items, next_cursor = facets.filtered_page(matched, cursor)
+            counts = facets.counts(active_facets, matched)
+        else:
+            items, next_cursor = pagination.portfolio_page(cursor)
+            counts = facets.counts(active_facets)
+    except pagination.InvalidCursor:
+        return HttpResponseBadRequest(_("Invalid cursor"))
+
+    next_url = None
+    if next_cursor:
+        query = request.GET.copy()
+        query['cursor'] = next_cursor
+        next_url = f'{request.path}?{query.urlencode()}'
+    response = JsonResponse({
+        'html': render_to_string(
+            'portfolio/_portfolio_items.html', {'portfolio_items': localize(items)}, request=request
+        ),
+        'next': next_url,
+        'facets': [
+            {'id': facet.technology_id, 'name': facet.technology.name, 'count': counts[facet.technology_id]}
+            for facet in active_facets
+        ],
+    })
+    # No CSRF token or messages here, so shared caches may keep it until content changes.
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+@require_GET
+def sitemap(request, name=sitemaps.INDEX_NAME):
+    """Serve a generated sitemap file, rewriting stale sections first"""
+    sitemaps.ensure_current()
+    path, encoding = sitemaps.find(name, request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    if path is None:
+        raise Http404(_("Sitemap not found"))
+
+    stat_result = os.stat(path)
+    # Each encoding is its own file, so the ETag differs between them.
+    etag = serving.stat_etag(stat_result)
+    last_modified = int(stat_result.st_mtime)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = FileResponse(open(path, 'rb'), content_type='application/xml; charset=utf-8', filename=name)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.headers['ETag'] = etag
+    response.headers['Last-Modified'] = http_date(last_modified)
+    patch_vary_headers(response, ['Accept-Encoding'])
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'PORTFOLIO_SITEMAP_MAX_AGE', 60 * 60))
+    return response
+
+
+# Native async versions of the public views, routed instead of the sync ones
+# when PORTFOLIO_ASYNC_VIEWS is set for ASGI deployments. Queries use the
+# async ORM; template rendering and file access, which Django only offers
+# synchronously, run in worker threads.
+
+async def index_async(request):
+    """Main portfolio page"""
+    version, updated_at = await page_cache.aget_content_version()
+    cacheable = request.method in ('GET', 'HEAD') and (
+        not page_cache.may_have_messages(request) or await sync_to_async(page_cache.is_cacheable)(request)
+    )
+    if not cacheable:
+        await apreload_site_settings(request)
+        context = await abuild_homepage_snapshot()
+        return await sync_to_async(render)(request, 'portfolio/index.html', context)
+
+    etag = page_cache.homepage_etag_for(version)
+    last_modified = int(updated_at.timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        content = await page_cache.aget_cached_homepage(request, version)
+        if content is None:
+            await apreload_site_settings(request)
+            context = await abuild_homepage_snapshot()
+            context['csrf_token'] = page_cache.CSRF_PLACEHOLDER
+            content = await sync_to_async(render_to_string)('portfolio/index.html', context, request=request)
+            await page_cache.aset_cached_homepage(request, version, content)
+
+        response = HttpResponse(page_cache.personalize(request, content))
+        patch_cache_control(response, private=True, no_cache=True)
+
+    response.headers.setdefault('ETag', etag)
+    response.headers.setdefault('Last-Modified', http_date(last_modified))
+    return response
+
+
+async def contact_async(request):
+    """Handle contact form submission"""
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+
+    name = request.POST.get('name', '').strip()
+    email = request.POST.get('email', '').strip()
+    subject = request.POST.get('subject', '').strip()
+    message = request.POST.get('message', '').strip()
+
+    if not (name and email and subject and message):
+        messages.error(request, _('Please fill in all fields.'))
+        return redirect('portfolio:index')
+
+    if not await ratelimit.aallow_contact(request, email):
+        messages.error(request, _('Too many messages. Please try again later.'))
+        return redirect('portfolio:index')
+
+    digest = ratelimit.content_hash(email, subject, message)
+    if await ratelimit.ais_duplicate(digest):
+        messages.success(request, _('Your message has been sent successfully!'))
+        return redirect('portfolio:index')
+
+    try:
+        if getattr(settings, 'PORTFOLIO_CONTACT_INGESTION', 'spool') == 'spool':
+            await sync_to_async(contact_spool.append, thread_sensitive=False)(
+                name, email, subject, message, content_hash=digest
+            )
+        else:
+            await ContactMessage.objects.acreate(
+                name=name, email=email, subject=subject, message=message, content_hash=digest
+            )
+        messages.success(request, _('Your message has been sent successfully!'))
+    except Exception:
+        logger.exception('Storing a contact message failed')
+        await ratelimit.aforget_submission(digest)
+        messages.error(request, _('An error occurred. Please try again.'))
+    return redirect('portfolio:index')
+
+
+async def portfolio_view_async(request, portfolio_id):
+    """View for displaying offline portfolio"""
+    portfolio_item = await PortfolioItem.objects.filter(id=portfolio_id, is_active=True).afirst()
+    if portfolio_item is None:
+        raise Http404
+
+    if portfolio_item.portfolio_type == 'online':
+        return redirect(portfolio_item.url)
+
+    file_path = await sync_to_async(_resolve_offline)(portfolio_item)
+    if file_path is None:
+        return redirect('portfolio:site', portfolio_id=portfolio_item.id)
+
+    return await serving.aserve_file(request, file_path, as_attachment=True, filename=os.path.basename(file_path))
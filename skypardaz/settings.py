@@ -77,6 +77,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'skypardaz.wsgi.application'
 
+# Route the public views to their async versions; enable when serving
+# skypardaz.asgi.application with an ASGI server such as uvicorn or daphne.
+PORTFOLIO_ASYNC_VIEWS = config('PORTFOLIO_ASYNC_VIEWS', default=False, cast=bool)
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -85,9 +89,57 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse connections across requests, checking them before reuse
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
     }
 }
 
+# Pragmas applied to each new SQLite connection (see portfolio/db.py). The
+# production profile switches to WAL so reads no longer wait on writes;
+# set SQLITE_PROFILE=default to keep SQLite's own settings.
+SQLITE_PROFILES = {
+    'default': {},
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'mmap_size': 128 * 1024 * 1024,
+        'cache_size': -20000,  # KiB
+        'temp_store': 'MEMORY',
+    },
+}
+PORTFOLIO_SQLITE_PRAGMAS = SQLITE_PROFILES[config('SQLITE_PROFILE', default='production')]
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The default LocMemCache is per process. With several workers, use a shared
+# backend (file, database or memcached/redis) so content changes, site settings
+# and rate limits are seen by all of them; otherwise other workers only notice
+# a change after PORTFOLIO_CONTENT_VERSION_TTL.
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='skypardaz'),
+    }
+}
+
+# Seconds a rendered homepage is kept; content changes invalidate it earlier.
+PORTFOLIO_PAGE_CACHE_TIMEOUT = config('PORTFOLIO_PAGE_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+# Seconds each cached content version stamp is trusted before it is read from
+# the database again; bounds how long a worker without a shared cache serves
+# pages and 304s for content that has changed.
+PORTFOLIO_CONTENT_VERSION_TTL = config('PORTFOLIO_CONTENT_VERSION_TTL', default=5, cast=int)
+# Portfolio items on the homepage; script.js loads the rest page by page.
+PORTFOLIO_GRID_PAGE_SIZE = config('PORTFOLIO_GRID_PAGE_SIZE', default=12, cast=int)
+
+# Public address used in the generated sitemaps, and where they are written.
+PORTFOLIO_SITE_URL = config('PORTFOLIO_SITE_URL', default='https://skypardaz.ir')
+PORTFOLIO_SITEMAP_DIR = Path(config('PORTFOLIO_SITEMAP_DIR', default=str(BASE_DIR / 'sitemaps')))
+PORTFOLIO_SITEMAP_MAX_AGE = config('PORTFOLIO_SITEMAP_MAX_AGE', default=60 * 60, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -149,10 +201,63 @@ MODELTRANSLATION_FALLBACK_LANGUAGES = ('en', 'fa')
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / "static"]
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# STATICFILES_STORAGE is ignored from Django 5.1, so storages are set here.
+# collectstatic fingerprints files and writes gzip (and, with the Brotli
+# package installed, brotli) variants for WhiteNoise to serve. Run
+# `manage.py build_assets` first to include the bundled CSS and fonts. A
+# static file missing from the manifest raises rather than getting an
+# uncached URL, so collectstatic must run before serving with DEBUG off.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+# 'deferred' lets script.js load three.js and GSAP only when they will be
+# used; 'eager' restores the blocking script tags.
+PORTFOLIO_MOTION_LOADING = config('PORTFOLIO_MOTION_LOADING', default='deferred')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = Path(config('MEDIA_ROOT', default=str(BASE_DIR / 'media')))
 
+# Uploaded images above this many pixels are rejected before decoding.
+PORTFOLIO_MAX_IMAGE_PIXELS = config('PORTFOLIO_MAX_IMAGE_PIXELS', default=50_000_000, cast=int)
+# Encoded images larger than this many bytes are spooled to a temp file.
+PORTFOLIO_IMAGE_SPOOL_SIZE = config('PORTFOLIO_IMAGE_SPOOL_SIZE', default=2 * 1024 * 1024, cast=int)
+
+# Offline portfolios: 'site' unpacks the ZIP once and lets visitors browse it,
+# 'download' sends the archive itself.
+PORTFOLIO_OFFLINE_MODE = config('PORTFOLIO_OFFLINE_MODE', default='site')
+PORTFOLIO_SITE_MAX_FILES = config('PORTFOLIO_SITE_MAX_FILES', default=5000, cast=int)
+PORTFOLIO_SITE_MAX_BYTES = config('PORTFOLIO_SITE_MAX_BYTES', default=500 * 1024 * 1024, cast=int)
+PORTFOLIO_SITE_MAX_RATIO = config('PORTFOLIO_SITE_MAX_RATIO', default=100, cast=int)
+PORTFOLIO_SITE_CACHE_MAX_AGE = config('PORTFOLIO_SITE_CACHE_MAX_AGE', default=60 * 60 * 24, cast=int)
+
+# How offline portfolio files are sent: 'django' streams them from the worker,
+# 'x-accel-redirect' hands them to nginx and 'x-sendfile' to Apache/lighttpd.
+# For nginx, map the prefix to MEDIA_ROOT in an internal location:
+#     location /protected-media/ { internal; alias /path/to/media/; }
+PORTFOLIO_FILE_SERVING = config('PORTFOLIO_FILE_SERVING', default='django')
+PORTFOLIO_X_ACCEL_REDIRECT_PREFIX = config('PORTFOLIO_X_ACCEL_REDIRECT_PREFIX', default='/protected-media/')
+
+# Contact submissions are appended to a spool file and written to the database
+# in batches ('spool'), or saved inside the request ('direct'). Run
+# `manage.py drain_contact_spool` after stopping workers, or from cron when
+# PORTFOLIO_CONTACT_FLUSH_INTERVAL is 0 and no background flusher runs.
+PORTFOLIO_CONTACT_INGESTION = config('PORTFOLIO_CONTACT_INGESTION', default='spool')
+PORTFOLIO_CONTACT_SPOOL_DIR = Path(config('PORTFOLIO_CONTACT_SPOOL_DIR', default=str(BASE_DIR / 'spool' / 'contact')))
+PORTFOLIO_CONTACT_FLUSH_INTERVAL = config('PORTFOLIO_CONTACT_FLUSH_INTERVAL', default=2.0, cast=float)
+PORTFOLIO_CONTACT_BATCH_SIZE = config('PORTFOLIO_CONTACT_BATCH_SIZE', default=500, cast=int)
+
+# Token buckets for contact submissions, as "count/period" (s, m, h or d with an
+# optional multiplier, e.g. "5/10m"), kept in the PORTFOLIO_RATE_LIMIT_CACHE alias.
+PORTFOLIO_CONTACT_RATE_LIMITS = {
+    'ip': config('PORTFOLIO_CONTACT_RATE_LIMIT_IP', default='5/10m'),
+    'email': config('PORTFOLIO_CONTACT_RATE_LIMIT_EMAIL', default='3/h'),
+}
+PORTFOLIO_RATE_LIMIT_CACHE = config('PORTFOLIO_RATE_LIMIT_CACHE', default='default')
+# Only enable behind a proxy that overwrites X-Forwarded-For.
+PORTFOLIO_TRUST_X_FORWARDED_FOR = config('PORTFOLIO_TRUST_X_FORWARDED_FOR', default=False, cast=bool)
+# Identical messages resent within this many seconds are dropped.
+PORTFOLIO_CONTACT_DUPLICATE_WINDOW = config('PORTFOLIO_CONTACT_DUPLICATE_WINDOW', default=60 * 60 * 24, cast=int)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 